@@ -1,16 +1,29 @@
 import streamlit as st
-import pandas as pd
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+import streamlit.components.v1 as components
+import json
 from datetime import datetime
+from assets import BRANDING_CSS, INDUSTRIES, STAGES, countdown_html
+from leaderboard import UNKNOWN_TRACK, LeaderboardAggregator, LiveFeed
+from metrics import METRICS, configure_logging
+# pandas, gspread and the storage backends are imported where they are first needed, so
+# screens that never touch the data (login, registration closed) don't pay for loading them
 
 # --- CONFIGURATION ---
 SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
 SHEET_NAME = "Verdix_DB"
+QUEUE_PATH = "verdix_queue.db"
+SQLITE_PATH = "verdix.db"
+REGISTRATION_DEADLINE = datetime(2026, 3, 15, 23, 59)
+LIVE_REFRESH_SECONDS = 10
+FEEDBACK_PAGE_SIZE = 25
 
 # --- AUTHENTICATION ---
 @st.cache_resource
-def get_database():
+def open_spreadsheet():
+    # One authorized client and spreadsheet handle per process, shared by every session
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
     # Load credentials from Streamlit Secrets
     if "gcp_service_account" not in st.secrets:
         st.error("Secrets not found! Please add your JSON key to Streamlit Secrets.")
@@ -26,92 +39,411 @@ def get_database():
     client = gspread.authorize(creds)
     return client.open(SHEET_NAME)
 
+# --- STORAGE BACKEND ---
+def sheets_guard():
+    # Token buckets sized to the [metrics] quotas; [circuit_breaker] tunes when Sheets is paused
+    settings = dict(st.secrets["circuit_breaker"]) if "circuit_breaker" in st.secrets else {}
+    from resilience import SheetsGuard
+    return SheetsGuard(
+        reads_per_minute=METRICS.quota["read"],
+        writes_per_minute=METRICS.quota["write"],
+        failure_threshold=settings.get("failure_threshold", 3),
+        reset_timeout=settings.get("reset_seconds", 30),
+    )
+
+@st.cache_resource
+def get_database():
+    # [storage] backend = "sheets" (default) or "sqlite" for a local embedded store
+    settings = dict(st.secrets["storage"]) if "storage" in st.secrets else {}
+    from storage import SheetsStorage, SQLiteStorage
+
+    if settings.get("backend", "sheets") == "sqlite":
+        # Optionally mirror every local write to the Verdix_DB spreadsheet for organizers
+        mirror = open_spreadsheet() if settings.get("sync_to_sheets") else None
+        return SQLiteStorage(settings.get("path", SQLITE_PATH), tracks=settings.get("tracks", []), mirror=mirror, guard=sheets_guard())
+
+    # Optional per-sheet TTL overrides, e.g. [cache_ttl] Scores = 5
+    ttl = dict(st.secrets["cache_ttl"]) if "cache_ttl" in st.secrets else {}
+    # Submissions are journaled locally and flushed to Sheets in the background
+    queue_path = st.secrets["write_queue"].get("path", QUEUE_PATH) if "write_queue" in st.secrets else QUEUE_PATH
+    # With several replicas, [shared_cache] path = a directory they all mount lets one refresh for all
+    shared = None
+    if "shared_cache" in st.secrets and st.secrets["shared_cache"].get("path"):
+        from sharedcache import SharedSnapshotStore
+        shared_settings = dict(st.secrets["shared_cache"])
+        shared = SharedSnapshotStore(
+            shared_settings["path"],
+            lease_seconds=shared_settings.get("lease_seconds", 30),
+            wait_seconds=shared_settings.get("wait_seconds", 10),
+        )
+    # [snapshots] path = a local directory: parsed sheets are saved there as Arrow files every
+    # interval_seconds, and a restarted server starts from them instead of cold downloads
+    snapshots = None
+    snapshot_settings = dict(st.secrets["snapshots"]) if "snapshots" in st.secrets else {}
+    if snapshot_settings.get("path"):
+        from snapshots import ColumnarSnapshots
+        snapshots = ColumnarSnapshots(snapshot_settings["path"])
+    db = SheetsStorage(
+        open_spreadsheet(), ttl, queue_path, shared, sheets_guard(),
+        snapshots=snapshots, snapshot_interval=snapshot_settings.get("interval_seconds", 60),
+    )
+    if db.snapshot_writer is not None:
+        # Rankings go along with the sheets, for post-event analysis
+        db.snapshot_writer.derived["leaderboard"] = get_leaderboard().ranking
+    return db
+
+def load(*names):
+    # Each screen asks only for the sheets it renders, fetched together in one round trip.
+    # The first one to run also starts the database, which replays queued writes after a restart.
+    # If Sheets is failing the last good snapshot is served read-only; we only stop when there is none.
+    try:
+        db = get_database()
+        db.prefetch(names)
+    except Exception as e:
+        st.error(f"Connection Error: {e}")
+        st.stop()
+    degraded_banner(db)
+    return db
+
+def degraded_banner(db):
+    if db.degraded:
+        since = datetime.fromtimestamp(db.degraded["since"]).strftime("%H:%M:%S")
+        st.warning(f"⚠️ Google Sheets is not responding (since {since}). Showing the last loaded data; new submissions are saved and will sync automatically.")
+
+def registration_deadline():
+    # Reusable for another event via [event] registration_deadline = "YYYY-MM-DD HH:MM"
+    if "event" in st.secrets and "registration_deadline" in st.secrets["event"]:
+        return datetime.strptime(st.secrets["event"]["registration_deadline"], "%Y-%m-%d %H:%M")
+    return REGISTRATION_DEADLINE
+
+# --- LEADERBOARD STATE ---
+@st.cache_resource
+def get_leaderboard():
+    # Shared by every admin session and re-ranked only when Scores or Teams changed.
+    # [leaderboard] normalization = "zscore" | "median" evens out harsh and generous judges;
+    # trim = 0.1 drops the top and bottom 10% of each team's scores before averaging
+    settings = dict(st.secrets["leaderboard"]) if "leaderboard" in st.secrets else {}
+    return LeaderboardAggregator(settings.get("normalization", "none"), float(settings.get("trim", 0.0)))
+
+# --- INSTRUMENTATION ---
+@st.cache_resource
+def setup_metrics():
+    # [metrics] log = true streams JSON events to stderr; log_file = "..." writes them to a file instead
+    settings = dict(st.secrets["metrics"]) if "metrics" in st.secrets else {}
+    if settings.get("log_file") or settings.get("log"):
+        configure_logging(settings.get("log_file"))
+    for kind in ("read", "write"):
+        if f"{kind}_quota" in settings:
+            METRICS.quota[kind] = int(settings[f"{kind}_quota"])
+    return METRICS
+
+def performance_panel(db):
+    # Organizer-only view of how hard the app is leaning on Google Sheets
+    import pandas as pd
+    snapshot = METRICS.snapshot()
+    reruns, quota = snapshot["reruns"], snapshot["quota"]
+    queue = getattr(db, "queue", None)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Rerun p50 / p95", f"{reruns['p50_ms'] or 0:.0f} / {reruns['p95_ms'] or 0:.0f} ms")
+    col2.metric("Sheets calls / rerun", reruns["sheets_calls_per_rerun"])
+    col3.metric("Read quota left (1 min)", f"{quota['read']['headroom']} / {quota['read']['limit']}")
+    col4.metric("Write quota left (1 min)", f"{quota['write']['headroom']} / {quota['write']['limit']}")
+
+    if db.guard is not None:
+        guard = db.guard.status()
+        st.caption(f"Sheets circuit: **{guard['circuit']}** · tokens left: {guard['read_tokens']} read / {guard['write_tokens']} write" + (f" — last error: {guard['last_error']}" if guard["last_error"] else ""))
+    if queue is not None:
+        status = queue.status()
+        st.caption(f"Write queue: **{status['pending']}** row(s) waiting" + (f" — last error: {status['last_error']}" if status["last_error"] else ""))
+    writer = getattr(db, "snapshot_writer", None)
+    if writer is not None:
+        st.caption(f"Snapshots: every {writer.interval}s to `{writer.snapshots.path}`" + (f" — last error: {writer.last_error}" if writer.last_error else ""))
+
+    if snapshot["cache"]:
+        st.markdown("**Cache hit rate**")
+        st.dataframe(pd.DataFrame.from_dict(snapshot["cache"], orient="index"), use_container_width=True)
+    if snapshot["calls"]:
+        st.markdown("**Sheets calls by worksheet and operation**")
+        st.dataframe(pd.DataFrame(snapshot["calls"]), use_container_width=True, hide_index=True)
+    else:
+        st.info("No Sheets calls recorded since the server started.")
+
+    st.download_button(
+        "⬇️ Export Metrics (JSON)",
+        data=json.dumps(snapshot, indent=2),
+        file_name="verdix_metrics.json",
+        mime="application/json",
+    )
+
+    cache = getattr(db, "cache", None)
+    if cache is not None:
+        st.markdown("**Maintenance**")
+        if st.button("🧹 Archive Superseded Registrations", help="Move every Teams row except the latest per team to the Teams_Archive tab. Safe while teams are still registering."):
+            from compact import ARCHIVE_SHEET, compact_teams
+            kept, archived = compact_teams(cache.sh, guard=db.guard)
+            cache.invalidate("Teams")
+            st.success(f"✅ Archived {archived} superseded row(s) to '{ARCHIVE_SHEET}'; {kept} registration(s) remain in Teams.")
+
+# --- BULK IMPORT ---
+def bulk_import_panel(db):
+    # Partner spreadsheets come in as CSV; accepted rows are queued together and appended in chunks
+    import pandas as pd
+    from bulkimport import import_teams, import_tracks, parse_tracks, plan_team_import
+
+    st.markdown("Upload registrations as CSV in the Teams column layout (Col A–N, header row optional) and, if needed, new track names (one per line).")
+    tracks_file = st.file_uploader("Tracks CSV (Config)", type="csv", key="import_tracks")
+    teams_file = st.file_uploader("Teams CSV", type="csv", key="import_teams")
+    if tracks_file is None and teams_file is None:
+        return
+
+    new_tracks = parse_tracks(tracks_file.getvalue()) if tracks_file is not None else []
+    rows, problems = [], []
+    if teams_file is not None:
+        rows, problems = plan_team_import(teams_file.getvalue(), db.list_tracks() + new_tracks, db.team_names())
+    st.info(f"Ready to import **{len(rows)}** team(s) and up to **{len(new_tracks)}** track(s); **{len(problems)}** row(s) will be skipped.")
+    if problems:
+        st.dataframe(pd.DataFrame(problems), use_container_width=True, hide_index=True)
+
+    if st.button("📥 Import", type="primary", disabled=not rows and not new_tracks):
+        added = import_tracks(db, new_tracks)
+        imported = import_teams(db, rows)
+        st.success(f"✅ Queued {imported} registration(s) and {len(added)} new track(s); they are written to Google Sheets in batches.")
+
+def feedback_reports_panel(db):
+    # One file per team, streamed straight into a zip; built only when asked for
+    from reports import export_reports
+
+    st.markdown("Download every scored team's report (rank in track, per-criterion breakdown and all judges' comments) to send out after the event.")
+    fmt = st.radio("Report format", ["csv", "html"], format_func=str.upper, horizontal=True, key="reports_format")
+    if st.button("📤 Build Team Reports", key="reports_build"):
+        with st.spinner("Building reports..."):
+            data, count = export_reports(db, get_leaderboard(), fmt)
+        if not count:
+            st.info("No scores have been submitted yet.")
+            return
+        st.download_button(
+            f"⬇️ Download {count} Report(s)",
+            data,
+            file_name=f"verdix_feedback_{fmt}_{datetime.now():%Y%m%d_%H%M}.zip",
+            mime="application/zip",
+            on_click="ignore",
+            type="primary",
+        )
+
+# --- LIVE LEADERBOARD ---
+def live_refresh_seconds():
+    # [live_leaderboard] refresh_seconds: how often open dashboards update, which is also the
+    # most often the whole server checks Scores for changes, however many dashboards are open
+    if "live_leaderboard" in st.secrets:
+        return st.secrets["live_leaderboard"].get("refresh_seconds", LIVE_REFRESH_SECONDS)
+    return LIVE_REFRESH_SECONDS
+
+@st.cache_resource
+def get_live_feed():
+    return LiveFeed(get_leaderboard(), live_refresh_seconds())
+
+@METRICS.fragment("live_leaderboard")
+def live_leaderboard(db, tracks):
+    # Runs as a fragment: reruns on its own and only re-ranks when the Scores change marker moved
+    aggregator = get_leaderboard()
+    df_scores = get_live_feed().refresh(db)
+
+    if df_scores.empty:
+        st.info("📊 No scores have been submitted yet. Waiting for judges...")
+    else:
+
+        with st.container(border=True):
+            st.markdown("<div style='background-color: #262730; color: white; padding: 10px; border-radius: 5px; text-align: center; font-weight: bold; font-size: 1.1rem; margin-bottom: 15px;'>Filter Results</div>", unsafe_allow_html=True)
+            selected_view = st.selectbox("🏆 View Leaderboard For:", ["All Tracks"] + tracks)
+
+        if aggregator.has_team_column:
+            leaderboard = aggregator.ranking(None if selected_view == "All Tracks" else selected_view)
+
+            if leaderboard.empty:
+                st.warning(f"No scores available for {selected_view} yet.")
+            else:
+                leaderboard.index = leaderboard.index + 1 
+                leaderboard = leaderboard.rename(columns={
+                    'Team Name': 'Startup / Team',
+                    'Average_Score': 'Avg. Score (Out of 70)',
+                    'Judges_Count': '# of Judges'
+                })
+
+                st.markdown("<br>", unsafe_allow_html=True)
+                with st.container(border=True):
+                    st.markdown(f"<div style='background-color: #BF1A1A; color: #FFFFFF; padding: 10px; border-radius: 5px; text-align: center; font-weight: bold; font-size: 1.2rem; margin-bottom: 15px;'>Top Rankings: {selected_view}</div>", unsafe_allow_html=True)
+
+                    if len(leaderboard) >= 1:
+                        st.success(f"🥇 **1st Place:** {leaderboard.iloc[0]['Startup / Team']} — **{leaderboard.iloc[0]['Avg. Score (Out of 70)']} pts**")
+                    if len(leaderboard) >= 2:
+                        st.info(f"🥈 **2nd Place:** {leaderboard.iloc[1]['Startup / Team']} — **{leaderboard.iloc[1]['Avg. Score (Out of 70)']} pts**")
+                    if len(leaderboard) >= 3:
+                        st.warning(f"🥉 **3rd Place:** {leaderboard.iloc[2]['Startup / Team']} — **{leaderboard.iloc[2]['Avg. Score (Out of 70)']} pts**")
+
+                    st.markdown("<br>", unsafe_allow_html=True)
+                    st.dataframe(leaderboard, use_container_width=True)
+                    if aggregator.normalization != "none" or aggregator.trim:
+                        st.caption(f"Scores normalized per judge ({aggregator.normalization}), {aggregator.trim:.0%} trimmed from each end; ties go to the higher per-criterion totals in rubric order.")
+
+                    feedback = st.expander("🔍 View Detailed Feedback & Individual Scores", key="feedback_expander", on_change="rerun")
+                    # Comments are only downloaded once someone actually opens the feedback table
+                    if feedback.open:
+                        with feedback:
+                            feedback_table(db, aggregator, tracks)
+        else:
+            st.error("⚠️ Column 'Team Name' is missing from your Scores sheet. Please fix Row 1 in Google Sheets.")
+
+def feedback_table(db, aggregator, tracks):
+    # One page of score rows, filtered and ordered on the server from the shared index;
+    # only that page is sent to the browser and only its comments are fetched
+    import pandas as pd
+    index = aggregator.feedback
+    st.markdown("Use this raw data to see exactly who scored what, and read the judges' individual feedback.")
+
+    col_judge, col_team, col_track = st.columns(3)
+    judge = col_judge.selectbox("Judge", ["All Judges"] + index.values("Judge Name"), key="feedback_judge")
+    team = col_team.selectbox("Team", ["All Teams"] + index.values("Team Name"), key="feedback_team")
+    track = col_track.selectbox("Track", ["All Tracks"] + tracks + [UNKNOWN_TRACK], key="feedback_track")
+    frame, positions = index.query(
+        judge=None if judge == "All Judges" else judge,
+        team=None if team == "All Teams" else team,
+        track=None if track == "All Tracks" else track,
+        track_of=aggregator.track_of,
+        default_track=UNKNOWN_TRACK,
+    )
+    if not len(positions):
+        st.info("No scores match these filters.")
+        return
+
+    pages = (len(positions) - 1) // FEEDBACK_PAGE_SIZE + 1
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key="feedback_page")
+    shown = positions[(page - 1) * FEEDBACK_PAGE_SIZE:page * FEEDBACK_PAGE_SIZE]
+    st.caption(f"Showing {(page - 1) * FEEDBACK_PAGE_SIZE + 1}–{(page - 1) * FEEDBACK_PAGE_SIZE + len(shown)} of {len(positions)} scores, newest first.")
+
+    desired_cols = ['Timestamp', 'Judge Name', 'Team Name', 'Track', 'Total Score', 'Feedback / Comments']
+    rows = frame.iloc[shown]
+    rows = rows.assign(**{
+        'Total Score': pd.Series(aggregator.row_totals[shown], index=rows.index, dtype=float),
+        'Track': [aggregator.track_of.get(t, UNKNOWN_TRACK) for t in rows['Team Name']] if 'Team Name' in rows else UNKNOWN_TRACK,
+    })
+    try:
+        rows['Feedback / Comments'] = db.text("Scores", "Feedback / Comments", shown.tolist())
+    except Exception:
+        st.warning("⚠️ Judges' comments couldn't be loaded right now; showing scores only.")
+    safe_cols = [col for col in desired_cols if col in rows.columns]
+    if safe_cols:
+        st.dataframe(rows[safe_cols], use_container_width=True, hide_index=True)
+    else:
+        st.error("⚠️ Database header mismatch. Please check Row 1 of your Scores Google Sheet.")
+
+
+@st.fragment
+@METRICS.fragment("registration")
+def registration_form(db, tracks, deadline):
+    """The registration form; typing in it reruns only this fragment, not the whole page."""
+    submission_type = st.radio(
+        "Submission Type", 
+        ["🆕 New Registration", "🔄 Update Existing Registration"], 
+        horizontal=True,
+        help="If you are updating, make sure to use your exact Team Name so we can replace your old entry."
+    )
+
+    with st.container(border=True):
+        st.markdown("<div style='background-color: #262730; color: white; padding: 10px; border-radius: 5px; text-align: center; font-weight: bold; font-size: 1.1rem; margin-bottom: 15px;'>Team & Academic Details</div>", unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            team_name = st.text_input("Startup / Team Name *")
+            track = st.selectbox("Which Track are you competing in? *", tracks)
+            team_leaders = st.text_area("Team Leaders (Names) *", placeholder="E.g., Alice (CEO), Bob (CTO)")
+            student_id = st.text_input("Student ID / IC No *", placeholder="E.g., 12345678 or 010203-14-5555")
+        with col2:
+            university = st.text_input("University / Institution *", placeholder="E.g., Sunway University")
+            faculty = st.text_input("Faculty / School *", placeholder="E.g., School of Science and Technology")
+            programme = st.text_input("Academic Programme *", placeholder="E.g., BSc Computer Science")
+
+    with st.container(border=True):
+        st.markdown("<div style='background-color: #262730; color: white; padding: 10px; border-radius: 5px; text-align: center; font-weight: bold; font-size: 1.1rem; margin-bottom: 15px;'>Venture Profile</div>", unsafe_allow_html=True)
+
+        selected_industries = st.multiselect("Industry / Tags (Select up to 3) *", list(INDUSTRIES.keys()))
+        if selected_industries:
+            for ind in selected_industries:
+                st.caption(f"🔹 **{ind}**: {INDUSTRIES[ind]}")
+
+        st.markdown("<br>", unsafe_allow_html=True)
+
+        stage = st.selectbox("Stage of Startup *", [""] + list(STAGES.keys()))
+        if stage:
+            st.info(STAGES[stage])
+
+        value_prop = st.text_area(
+            "Value Proposition (The 'Elevator Pitch') *", 
+            placeholder="What problem are you solving, and how?",
+            height=150
+        )
+
+    with st.container(border=True):
+        st.markdown("<div style='background-color: #262730; color: white; padding: 10px; border-radius: 5px; text-align: center; font-weight: bold; font-size: 1.1rem; margin-bottom: 15px;'>Media & Links</div>", unsafe_allow_html=True)
+
+        st.info("💡 **Security Check:** Please ensure all Google Drive or Canva links are set to 'Anyone with the link can view' before submitting.")
+
+        video_link = st.text_input("Pitch Video Link (Optional)", placeholder="YouTube or Vimeo URL")
+        deck_link = st.text_input("Pitch Deck / Logo Link *", placeholder="Google Drive, Canva, or Dropbox URL")
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    _, center_col, _ = st.columns([1, 2, 1])
+    with center_col:
+        submitted = st.button("🚀 Submit Registration", type="primary", use_container_width=True)
+
+    if submitted:
+        from storage import HEADERS, missing_fields
+
+        industry_string = ", ".join(selected_industries)
+        timestamp = str(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        row = [
+            timestamp,         # Col A
+            submission_type,   # Col B
+            team_name,         # Col C
+            track,             # Col D
+            team_leaders,      # Col E
+            student_id,        # Col F 
+            university,        # Col G
+            faculty,           # Col H
+            programme,         # Col I
+            industry_string,   # Col J
+            stage,             # Col K
+            value_prop,        # Col L
+            video_link,        # Col M
+            deck_link          # Col N
+        ]
+        # Same rules the admin bulk import applies to every CSV row
+        missing = missing_fields(dict(zip(HEADERS["Teams"], row)))
+
+        if missing:
+            missing_str = ", ".join(missing)
+            st.error(f"⚠️ Please fill in the missing fields: **{missing_str}**")
+        elif datetime.now() > deadline:
+            # The page-level deadline check doesn't run again on a fragment-only rerun
+            st.error("🚨 Registration is officially closed.")
+        else:
+            db.append_registration(row)
+
+            if "Update" in submission_type:
+                st.success(f"✅ {team_name}'s profile has been securely updated in the Verdix system.")
+            else:
+                st.success(f"✅ {team_name} successfully registered.")
+                st.info("Your investor profile has been securely logged. The judging panel will review your materials shortly.")
+
+
 # --- MAIN APP ---
 def main():
     st.set_page_config(page_title="Verdix", layout="centered")
+    setup_metrics()
     
     # --- UX & VERDIX CUSTOM BRANDING ---
-    hide_st_style = """
-            <style>
-            #MainMenu {visibility: hidden;}
-            footer {visibility: hidden;}
-            header {visibility: hidden;}
-
-            /* --- 1. PRIMARY SUBMIT BUTTONS --- */
-            .stButton > button[kind="primary"] {
-                background-color: #BF1A1A !important;
-                border: 2px solid #BF1A1A !important;
-                border-radius: 6px !important;
-                transition: all 0.3s ease !important;
-            }
-            /* BRUTE-FORCE TEXT TO WHITE */
-            .stButton > button[kind="primary"] * {
-                color: #FFFFFF !important; 
-                font-weight: bold !important;
-            }
-            .stButton > button[kind="primary"]:hover {
-                background-color: #000000 !important; 
-                border: 2px solid #BF1A1A !important;
-                transform: scale(1.02);
-                box-shadow: 0 4px 15px rgba(191, 26, 26, 0.4) !important;
-            }
-            .stButton > button[kind="primary"]:hover * {
-                color: #BF1A1A !important; /* Text turns red on hover */
-            }
-
-            /* --- 2. SECONDARY BUTTONS (Log Out) --- */
-            .stButton > button[kind="secondary"] {
-                background-color: #1A1A1A !important;
-                border: 1px solid #BF1A1A !important;
-                border-radius: 6px !important;
-                transition: all 0.3s ease !important;
-            }
-            .stButton > button[kind="secondary"] * {
-                color: #FFFFFF !important;
-                font-weight: bold !important;
-            }
-            .stButton > button[kind="secondary"]:hover {
-                background-color: #BF1A1A !important;
-                border: 1px solid #BF1A1A !important;
-                box-shadow: 0 4px 10px rgba(191, 26, 26, 0.3) !important;
-            }
-
-            /* --- 3. SIDEBAR NAVIGATION BARS --- */
-            [data-testid="stSidebar"] [data-testid="stRadio"] div[role="radiogroup"] label > div:first-child {
-                display: none !important;
-            }
-            
-            [data-testid="stSidebar"] [data-testid="stRadio"] div[role="radiogroup"] label {
-                background-color: #1A1A1A !important; 
-                padding: 12px 15px !important;
-                border-radius: 6px !important;
-                margin-bottom: 8px !important;
-                cursor: pointer !important;
-                transition: all 0.3s ease !important;
-                border: 1px solid #333333 !important;
-            }
-            
-            /* BRUTE-FORCE SIDEBAR TEXT TO WHITE */
-            [data-testid="stSidebar"] [data-testid="stRadio"] div[role="radiogroup"] label * {
-                color: #FFFFFF !important;
-                font-weight: 600 !important;
-            }
-            
-            [data-testid="stSidebar"] [data-testid="stRadio"] div[role="radiogroup"] label:hover {
-                background-color: #BF1A1A !important;
-                border-color: #BF1A1A !important;
-                transform: translateX(4px); 
-                box-shadow: 0 4px 10px rgba(191, 26, 26, 0.3) !important;
-            }
-            
-            [data-testid="stSidebar"] [data-testid="stRadio"] div[role="radiogroup"] label:has(input:checked) {
-                background-color: #BF1A1A !important;
-                border-color: #BF1A1A !important;
-                box-shadow: 0 4px 10px rgba(191, 26, 26, 0.4) !important;
-            }
-            </style>
-            """
-    st.markdown(hide_st_style, unsafe_allow_html=True)
+    st.markdown(BRANDING_CSS, unsafe_allow_html=True)
     # ----------------------------------
 
     st.sidebar.image("Verdix.png", use_container_width=True)
@@ -121,22 +453,9 @@ def main():
     st.write("Verdix is a streamlined scoring platform designed to bring professional, VC-style evaluation to fast-paced pitch competitions, accelerators, and student venture showcases.")
     st.divider() 
 
-    # Connect to Google Sheet
-    try:
-        sh = get_database()
-        ws_teams = sh.worksheet("Teams")
-        ws_scores = sh.worksheet("Scores")
-        ws_config = sh.worksheet("Config")
-    except Exception as e:
-        st.error(f"Connection Error: {e}")
-        st.stop()
-
     # Sidebar Navigation
     menu = st.sidebar.radio("Navigation", ["Student Registration", "Judge Portal", "Leaderboard"])
-
-    # Fetch tracks globally (Uses Track Name to prevent KeyErrors)
-    config_data = ws_config.get_all_records()
-    tracks = [str(row["Track Name"]) for row in config_data if row.get("Track Name")]
+    METRICS.annotate(mode=menu)
 
     # ---------------------------
     # MODE 1: STUDENT REGISTRATION
@@ -147,197 +466,18 @@ def main():
         st.markdown("<p style='text-align: center; color: #555555; font-size: 1.1rem;'>Build a compelling, investor-ready profile to unlock access to the pitching platform. Share your vision, traction, team, and growth strategy in a format designed to match VC expectations.</p>", unsafe_allow_html=True)
         st.markdown("<br>", unsafe_allow_html=True)
         
-        from datetime import datetime
-        deadline = datetime(2026, 3, 15, 23, 59) 
+        deadline = registration_deadline()
         now = datetime.now()
         
         if now > deadline:
             st.error("🚨 Registration is officially closed.")
         else:
-            import streamlit.components.v1 as components
-            live_clock_html = """
-            <!DOCTYPE html>
-            <html>
-            <head>
-            <style>
-                body { margin: 0; font-family: sans-serif; background-color: transparent; display: flex; justify-content: center; }
-                .container { display: flex; justify-content: center; gap: 15px; margin-top: 10px; margin-bottom: 20px;}
-                .block { background-color: #262730; padding: 15px 25px; border-radius: 8px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
-                .num { font-size: 2.5rem; font-family: 'Courier New', monospace; font-weight: bold; color: #BF1A1A; line-height: 1; }
-                .label { font-size: 0.75rem; color: #E0E0E0; text-transform: uppercase; letter-spacing: 1px; margin-top: 5px; }
-                .colon { font-size: 2.5rem; font-weight: bold; color: #262730; display: flex; align-items: center; padding-bottom: 15px; }
-            </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="block"><div class="num" id="days">00</div><div class="label">Days</div></div>
-                    <div class="colon">:</div>
-                    <div class="block"><div class="num" id="hours">00</div><div class="label">Hours</div></div>
-                    <div class="colon">:</div>
-                    <div class="block"><div class="num" id="minutes">00</div><div class="label">Mins</div></div>
-                    <div class="colon">:</div>
-                    <div class="block"><div class="num" id="seconds">00</div><div class="label">Secs</div></div>
-                </div>
-                <script>
-                    var deadline = new Date("Mar 15, 2026 23:59:00").getTime();
-                    var x = setInterval(function() {
-                        var now = new Date().getTime();
-                        var t = deadline - now;
-                        if (t >= 0) {
-                            document.getElementById("days").innerHTML = Math.floor(t / (1000 * 60 * 60 * 24)).toString().padStart(2, '0');
-                            document.getElementById("hours").innerHTML = Math.floor((t % (1000 * 60 * 60 * 24)) / (1000 * 60 * 60)).toString().padStart(2, '0');
-                            document.getElementById("minutes").innerHTML = Math.floor((t % (1000 * 60 * 60)) / (1000 * 60)).toString().padStart(2, '0');
-                            document.getElementById("seconds").innerHTML = Math.floor((t % (1000 * 60)) / 1000).toString().padStart(2, '0');
-                        } else {
-                            clearInterval(x);
-                            document.querySelector('.container').innerHTML = "<div style='color: red; font-size: 1.5rem; font-weight: bold;'>TIME IS UP!</div>";
-                        }
-                    }, 1000);
-                </script>
-            </body>
-            </html>
-            """
-            components.html(live_clock_html, height=120)
-
-            industry_dict = {
-                "Agentic AI": "Autonomous agents and multi-step AI orchestration systems.",
-                "GenAI & LLMs": "Creative tools, text generation, and model infrastructure.",
-                "SaaS (Enterprise)": "Cloud software and B2B digital transformation.",
-                "Cybersecurity": "Data privacy, threat detection, and zero-trust systems.",
-                "Deep Tech": "Quantum computing, advanced materials, and semiconductors.",
-                "Web3 & Blockchain": "DeFi, digital assets, and decentralized infra.",
-                "CloudTech & DevOps": "Server management, scaling tools, and developer platforms.",
-                "HealthTech": "Telemedicine, digital diagnostics, and patient management.",
-                "BioTech": "Drug discovery, genomics, and lab-grown alternatives.",
-                "MedTech": "Medical hardware, robotics for surgery, and wearable devices.",
-                "FemTech": "Women’s health, reproductive tech, and menopause support.",
-                "Longevity & Aging": "Tech for elder care and life-extension science.",
-                "Wellness & Mental Health": "Mindfulness apps and AI-assisted therapy.",
-                "ClimateTech": "Carbon capture, ESG reporting, and circular economy tools.",
-                "CleanTech": "Renewable energy (Solar, Wind, Fusion) and grid storage.",
-                "AgTech": "Precision farming, vertical agriculture, and soil health.",
-                "FoodTech": "Synthetic proteins, food waste reduction, and nutrition AI.",
-                "Mobility & EV": "Electric vehicles, charging networks, and battery tech.",
-                "Logistics & Supply Chain": "Autonomous shipping and last-mile delivery.",
-                "SpaceTech": "Orbital logistics, satellite data, and space exploration.",
-                "PropTech & Construction": "Smart buildings and digital real estate management.",
-                "FinTech": "Payments, neobanks, and automated wealth management.",
-                "InsurTech": "Digital underwriting and risk assessment platforms.",
-                "EdTech": "Gamified learning, AI tutoring, and LMS platforms.",
-                "GovTech": "Citizen services and public sector efficiency software.",
-                "DefenseTech": "National security tech, drones, and tactical software.",
-                "Retail & E-commerce": "D2C infrastructure and omnichannel retail.",
-                "Creator Economy": "Monetization tools and influencer marketing platforms.",
-                "Gaming & Metaverse": "VR/AR, eSports, and interactive entertainment.",
-                "AdTech & MarTech": "AI-driven marketing and customer acquisition."
-            }
-
-            stage_dict = {
-                "1. Concept & Ideation (Pre-Product)": "**VC Focus:** Founder brilliance, market size, and the 'Why Now?' factor.\n\n**Description:** The team has identified a major problem and a theoretical solution. There is no working software or hardware yet. (Deliverable: Pitch deck and market research).",
-                "2. Prototype / Alpha (Proof of Concept)": "**VC Focus:** Technical feasibility and early design thinking.\n\n**Description:** A 'low-fidelity' version of the product exists. It proves the core technology or service is possible. (Deliverable: Demo or clickable wireframes).",
-                "3. MVP & Pilot (Early Traction)": "**VC Focus:** User engagement, retention, and initial feedback loops.\n\n**Description:** The Minimum Viable Product is live and in the hands of actual users. The team is currently testing for 'Product-Market Fit.' (Deliverable: Usage data or LOIs).",
-                "4. Scaling & Revenue (Growth Stage)": "**VC Focus:** Revenue growth, Customer Acquisition Cost (CAC), and Lifetime Value (LTV).\n\n**Description:** The product is being sold. The startup has a repeatable process for acquiring customers. (Deliverable: Financial statements and growth charts)."
-            }
-            
-            submission_type = st.radio(
-                "Submission Type", 
-                ["🆕 New Registration", "🔄 Update Existing Registration"], 
-                horizontal=True,
-                help="If you are updating, make sure to use your exact Team Name so we can replace your old entry."
-            )
+            db = load("Config")
+            tracks = db.list_tracks()
 
-            with st.container(border=True):
-                st.markdown("<div style='background-color: #262730; color: white; padding: 10px; border-radius: 5px; text-align: center; font-weight: bold; font-size: 1.1rem; margin-bottom: 15px;'>Team & Academic Details</div>", unsafe_allow_html=True)
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    team_name = st.text_input("Startup / Team Name *")
-                    track = st.selectbox("Which Track are you competing in? *", tracks)
-                    team_leaders = st.text_area("Team Leaders (Names) *", placeholder="E.g., Alice (CEO), Bob (CTO)")
-                    student_id = st.text_input("Student ID / IC No *", placeholder="E.g., 12345678 or 010203-14-5555")
-                with col2:
-                    university = st.text_input("University / Institution *", placeholder="E.g., Sunway University")
-                    faculty = st.text_input("Faculty / School *", placeholder="E.g., School of Science and Technology")
-                    programme = st.text_input("Academic Programme *", placeholder="E.g., BSc Computer Science")
+            components.html(countdown_html(deadline), height=120)
 
-            with st.container(border=True):
-                st.markdown("<div style='background-color: #262730; color: white; padding: 10px; border-radius: 5px; text-align: center; font-weight: bold; font-size: 1.1rem; margin-bottom: 15px;'>Venture Profile</div>", unsafe_allow_html=True)
-                
-                selected_industries = st.multiselect("Industry / Tags (Select up to 3) *", list(industry_dict.keys()))
-                if selected_industries:
-                    for ind in selected_industries:
-                        st.caption(f"🔹 **{ind}**: {industry_dict[ind]}")
-                
-                st.markdown("<br>", unsafe_allow_html=True)
-                
-                stage = st.selectbox("Stage of Startup *", [""] + list(stage_dict.keys()))
-                if stage:
-                    st.info(stage_dict[stage])
-                
-                value_prop = st.text_area(
-                    "Value Proposition (The 'Elevator Pitch') *", 
-                    placeholder="What problem are you solving, and how?",
-                    height=150
-                )
-            
-            with st.container(border=True):
-                st.markdown("<div style='background-color: #262730; color: white; padding: 10px; border-radius: 5px; text-align: center; font-weight: bold; font-size: 1.1rem; margin-bottom: 15px;'>Media & Links</div>", unsafe_allow_html=True)
-                
-                st.info("💡 **Security Check:** Please ensure all Google Drive or Canva links are set to 'Anyone with the link can view' before submitting.")
-                
-                video_link = st.text_input("Pitch Video Link (Optional)", placeholder="YouTube or Vimeo URL")
-                deck_link = st.text_input("Pitch Deck / Logo Link *", placeholder="Google Drive, Canva, or Dropbox URL")
-            
-            st.markdown("<br>", unsafe_allow_html=True)
-            
-            _, center_col, _ = st.columns([1, 2, 1])
-            with center_col:
-                submitted = st.button("🚀 Submit Registration", type="primary", use_container_width=True)
-            
-            if submitted:
-                missing_fields = []
-                
-                if not team_name: missing_fields.append("Startup / Team Name")
-                if not track: missing_fields.append("Track")
-                if not team_leaders: missing_fields.append("Team Leaders")
-                if not student_id: missing_fields.append("Student ID / IC No")
-                if not university: missing_fields.append("University / Institution")
-                if not faculty: missing_fields.append("Faculty / School")
-                if not programme: missing_fields.append("Academic Programme")
-                if not selected_industries: missing_fields.append("Industry / Tags")
-                if not stage: missing_fields.append("Stage of Startup")
-                if not value_prop: missing_fields.append("Value Proposition")
-                if not deck_link: missing_fields.append("Pitch Deck / Logo Link")
-                
-                if missing_fields:
-                    missing_str = ", ".join(missing_fields)
-                    st.error(f"⚠️ Please fill in the missing fields: **{missing_str}**")
-                else:
-                    industry_string = ", ".join(selected_industries)
-                    timestamp = str(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-                    
-                    ws_teams.append_row([
-                        timestamp,         # Col A
-                        submission_type,   # Col B
-                        team_name,         # Col C
-                        track,             # Col D
-                        team_leaders,      # Col E
-                        student_id,        # Col F 
-                        university,        # Col G
-                        faculty,           # Col H
-                        programme,         # Col I
-                        industry_string,   # Col J
-                        stage,             # Col K
-                        value_prop,        # Col L
-                        video_link,        # Col M
-                        deck_link          # Col N
-                    ])
-                    
-                    if "Update" in submission_type:
-                        st.success(f"✅ {team_name}'s profile has been securely updated in the Verdix system.")
-                    else:
-                        st.success(f"✅ {team_name} successfully registered.")
-                        st.info("Your investor profile has been securely logged. The judging panel will review your materials shortly.")
+            registration_form(db, tracks, deadline)
 
     # ---------------------------
     # MODE 2: JUDGE PORTAL
@@ -383,34 +523,68 @@ def main():
                     st.rerun()
             
             st.markdown("<br>", unsafe_allow_html=True)
+
+            # Scores too, for this judge's progress; all three come back in one batch-get
+            db = load("Config", "Teams", "Scores")
+            tracks = db.list_tracks()
+            judge_name = st.session_state.current_judge_name
+            
+            last_scored = st.session_state.pop("judge_last_scored", None)
+            if last_scored:
+                st.success(f"🎉 Evaluation securely logged for {last_scored}! You may now select another startup.")
             
             with st.container(border=True):
                 st.markdown("<div style='background-color: #262730; color: white; padding: 10px; border-radius: 5px; text-align: center; font-weight: bold; font-size: 1.1rem; margin-bottom: 15px;'>Startup Selection</div>", unsafe_allow_html=True)
                 
                 selected_track = st.selectbox("📌 Select Track", tracks)
                 
-                teams_data = ws_teams.get_all_records()
-                if not teams_data:
+                registrations = db.registrations()
+                team_list = []
+                if not len(registrations):
                     st.warning("⚠️ No teams have registered yet.")
                 else:
-                    df_teams = pd.DataFrame(teams_data)
-                    
-                    if 'Track' not in df_teams.columns:
+                    if not registrations.has_track_column:
                         st.info("Waiting for the first team to register to build the database format.")
                     else:
-                        track_teams = df_teams[df_teams['Track'] == selected_track]
+                        team_list = registrations.roster(selected_track)
                         
-                        if track_teams.empty:
+                        if not team_list:
                             st.info(f"No teams found in the {selected_track} track yet.")
                         else:
-                            team_list = track_teams['Team Name'].tolist()
-                            selected_team = st.selectbox("🚀 Select Startup to Evaluate", team_list)
+                            scored, remaining = db.judge_progress().progress(judge_name, team_list)
+                            st.progress(len(scored) / len(team_list), text=f"Scored **{len(scored)}** of {len(team_list)} teams in {selected_track} · {len(remaining)} remaining")
+                            if not remaining:
+                                st.success(f"🎉 You've scored every team in {selected_track}. You can still revise any of your scores below.")
+                            
+                            # Open on the first team this judge hasn't scored; after a submission, move to the next one
+                            team_key = f"judge_team::{selected_track}"
+                            next_team = st.session_state.pop("judge_next_team", None)
+                            if next_team in team_list:
+                                st.session_state[team_key] = next_team
+                            elif st.session_state.get(team_key) not in team_list:
+                                st.session_state[team_key] = remaining[0] if remaining else team_list[0]
+                            done = set(scored)
+                            selected_team = st.selectbox(
+                                "🚀 Select Startup to Evaluate",
+                                team_list,
+                                format_func=lambda team: f"✅ {team}" if team in done else team,
+                                key=team_key,
+                            )
                             
-                            team_info = track_teams[track_teams['Team Name'] == selected_team].iloc[-1] 
+                            team_info = registrations.latest(selected_team)
+                            # Free text isn't part of the cached snapshot: fetch the pitches of the whole
+                            # track in one read, so moving on to the next team needs no Sheets call
+                            try:
+                                pitches = dict(zip(team_list, db.text("Teams", "Value Proposition", [registrations.positions[t] for t in team_list])))
+                            except Exception:
+                                # Sheets is down and these pitches were never cached; the rest of the profile still shows
+                                pitches = {}
+                                degraded_banner(db)
+                            value_prop = pitches.get(selected_team, "")
                             
                             st.markdown("<br>", unsafe_allow_html=True)
                             with st.expander(f"📄 View {selected_team}'s Investor Profile", expanded=True):
-                                st.markdown(f"**💡 Value Proposition:** {team_info.get('Value Proposition', 'N/A')}")
+                                st.markdown(f"**💡 Value Proposition:** {value_prop or 'N/A'}")
                                 st.markdown(f"**🏷️ Industry / Tags:** {team_info.get('Industry / Tags', 'N/A')}")
                                 st.markdown(f"**📈 Current Stage:** {team_info.get('Stage of Startup', 'N/A')}")
                                 st.markdown("---")
@@ -427,7 +601,7 @@ def main():
                                 with col_link2:
                                     if video_link: st.markdown(f"[🎥 Open Pitch Video]({video_link})")
                             
-            if 'track_teams' in locals() and not track_teams.empty:
+            if team_list:
                 st.markdown("<br>", unsafe_allow_html=True)
                 with st.container(border=True):
                     st.markdown("<div style='background-color: #262730; color: white; padding: 10px; border-radius: 5px; text-align: center; font-weight: bold; font-size: 1.1rem; margin-bottom: 15px;'>Evaluation Rubric</div>", unsafe_allow_html=True)
@@ -451,11 +625,16 @@ def main():
                         
                         if submit_score:
                             timestamp = str(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-                            ws_scores.append_row([
+                            db.upsert_score([
                                 timestamp, st.session_state.current_judge_name, selected_team, 
                                 score_1, score_2, score_3, score_4, score_5, score_6, score_7, comments
                             ])
-                            st.success(f"🎉 Evaluation securely logged for {selected_team}! You may now select another startup.")
+                            # Jump to the next unscored team; the message is shown after the rerun
+                            upcoming = [team for team in remaining if team != selected_team]
+                            if upcoming:
+                                st.session_state.judge_next_team = upcoming[0]
+                            st.session_state.judge_last_scored = selected_team
+                            st.rerun()
 
     # ---------------------------
     # MODE 3: LEADERBOARD
@@ -496,99 +675,24 @@ def main():
 
             st.markdown("<br>", unsafe_allow_html=True)
 
-            scores_data = ws_scores.get_all_records()
-            teams_data = ws_teams.get_all_records()
-
-            if not scores_data:
-                st.info("📊 No scores have been submitted yet. Waiting for judges...")
-            else:
-                df_scores = pd.DataFrame(scores_data)
-                df_teams = pd.DataFrame(teams_data)
-
-                track_dict = {}
-                if not df_teams.empty and 'Team Name' in df_teams.columns and 'Track' in df_teams.columns:
-                    track_dict = df_teams.drop_duplicates(subset=['Team Name'], keep='last').set_index('Team Name')['Track'].to_dict()
-
-                score_cols = [
-                    '1. Problem-Solution Fit', '2. Competitor & Market Analysis',
-                    '3. Go-to-Market (GTM) Strategy', '4. Innovation / Differentiation',
-                    '5. Prototype / MVP Readiness', '6. Revenue Model / Financials',
-                    '7. Storytelling & Pitch Delivery'
-                ]
-
-                for col in score_cols:
-                    if col in df_scores.columns:
-                        df_scores[col] = pd.to_numeric(df_scores[col], errors='coerce').fillna(0)
-                
-                available_score_cols = [col for col in score_cols if col in df_scores.columns]
-                df_scores['Total Score'] = df_scores[available_score_cols].sum(axis=1)
-
-                if not track_dict:
-                    df_scores['Track'] = "Unknown Track"
-                else:
-                    if 'Team Name' in df_scores.columns:
-                        df_scores['Track'] = df_scores['Team Name'].map(track_dict).fillna("Unknown Track")
-                    else:
-                        df_scores['Track'] = "Unknown Track"
-
-                with st.container(border=True):
-                    st.markdown("<div style='background-color: #262730; color: white; padding: 10px; border-radius: 5px; text-align: center; font-weight: bold; font-size: 1.1rem; margin-bottom: 15px;'>Filter Results</div>", unsafe_allow_html=True)
-                    selected_view = st.selectbox("🏆 View Leaderboard For:", ["All Tracks"] + tracks)
-
-                if 'Team Name' in df_scores.columns:
-                    leaderboard = df_scores.groupby(['Team Name', 'Track']).agg(
-                        Average_Score=('Total Score', 'mean'),
-                        Judges_Count=('Judge Name', 'nunique') if 'Judge Name' in df_scores.columns else ('Total Score', 'count')
-                    ).reset_index()
+            db = load("Config", "Teams", "Scores")
+            tracks = db.list_tracks()
 
-                    leaderboard['Average_Score'] = leaderboard['Average_Score'].round(2)
+            # Projector dashboards refresh themselves; switching it off freezes the current view
+            live = st.toggle("🔴 Live Updates", value=True, help=f"Refresh rankings every {live_refresh_seconds()}s while new scores come in.")
+            st.fragment(run_every=live_refresh_seconds() if live else None)(live_leaderboard)(db, tracks)
 
-                    if selected_view != "All Tracks":
-                        leaderboard = leaderboard[leaderboard['Track'] == selected_view]
-
-                    leaderboard = leaderboard.sort_values(by='Average_Score', ascending=False).reset_index(drop=True)
-
-                    if leaderboard.empty:
-                        st.warning(f"No scores available for {selected_view} yet.")
-                    else:
-                        leaderboard.index = leaderboard.index + 1 
-                        leaderboard = leaderboard.rename(columns={
-                            'Team Name': 'Startup / Team',
-                            'Average_Score': 'Avg. Score (Out of 70)',
-                            'Judges_Count': '# of Judges'
-                        })
-
-                        st.markdown("<br>", unsafe_allow_html=True)
-                        with st.container(border=True):
-                            st.markdown(f"<div style='background-color: #BF1A1A; color: #FFFFFF; padding: 10px; border-radius: 5px; text-align: center; font-weight: bold; font-size: 1.2rem; margin-bottom: 15px;'>Top Rankings: {selected_view}</div>", unsafe_allow_html=True)
-
-                            if len(leaderboard) >= 1:
-                                st.success(f"🥇 **1st Place:** {leaderboard.iloc[0]['Startup / Team']} — **{leaderboard.iloc[0]['Avg. Score (Out of 70)']} pts**")
-                            if len(leaderboard) >= 2:
-                                st.info(f"🥈 **2nd Place:** {leaderboard.iloc[1]['Startup / Team']} — **{leaderboard.iloc[1]['Avg. Score (Out of 70)']} pts**")
-                            if len(leaderboard) >= 3:
-                                st.warning(f"🥉 **3rd Place:** {leaderboard.iloc[2]['Startup / Team']} — **{leaderboard.iloc[2]['Avg. Score (Out of 70)']} pts**")
+            st.markdown("<br>", unsafe_allow_html=True)
+            with st.expander("📥 Bulk Import Teams & Tracks"):
+                bulk_import_panel(db)
 
-                            st.markdown("<br>", unsafe_allow_html=True)
-                            st.dataframe(leaderboard, use_container_width=True)
+            with st.expander("📤 Export Team Feedback Reports"):
+                feedback_reports_panel(db)
 
-                            with st.expander("🔍 View Detailed Feedback & Individual Scores"):
-                                st.markdown("Use this raw data to see exactly who scored what, and read the judges' individual feedback.")
-                                
-                                desired_cols = ['Timestamp', 'Judge Name', 'Team Name', 'Track', 'Total Score', 'Feedback / Comments']
-                                safe_cols = [col for col in desired_cols if col in df_scores.columns]
-                                
-                                if safe_cols:
-                                    if 'Timestamp' in safe_cols:
-                                        raw_display = df_scores[safe_cols].sort_values(by='Timestamp', ascending=False)
-                                    else:
-                                        raw_display = df_scores[safe_cols]
-                                    
-                                    st.dataframe(raw_display, use_container_width=True)
-                                else:
-                                    st.error("⚠️ Database header mismatch. Please check Row 1 of your Scores Google Sheet.")
-                else:
-                    st.error("⚠️ Column 'Team Name' is missing from your Scores sheet. Please fix Row 1 in Google Sheets.")
+            with st.expander("📈 System Performance"):
+                performance_panel(db)
 
 if __name__ == "__main__":
-    main()
+    # Times the whole rerun, including the ones cut short by st.stop() / st.rerun()
+    with METRICS.rerun():
+        main()
@@ -0,0 +1,191 @@
+"""Static page content: the branding CSS, the registration countdown and the lookup tables.
+
+Streamlit re-executes app.py from the top on every rerun, so anything defined there is
+rebuilt each time. Kept in this module instead, it is built once per process (when first
+imported), minified so each rerun sends as few bytes as possible, and shared by every
+session.
+"""
+
+import functools
+import re
+
+
+def _minify(markup):
+    # Drop CSS comments, then every line break along with the indentation around it
+    markup = re.sub(r"/\*.*?\*/", "", markup, flags=re.S)
+    return re.sub(r"\s*\n\s*", "", markup).strip()
+
+
+# --- UX & VERDIX CUSTOM BRANDING ---
+BRANDING_CSS = _minify("""
+    <style>
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
+
+    /* --- 1. PRIMARY SUBMIT BUTTONS --- */
+    .stButton > button[kind="primary"] {
+        background-color: #BF1A1A !important;
+        border: 2px solid #BF1A1A !important;
+        border-radius: 6px !important;
+        transition: all 0.3s ease !important;
+    }
+    /* BRUTE-FORCE TEXT TO WHITE */
+    .stButton > button[kind="primary"] * {
+        color: #FFFFFF !important; 
+        font-weight: bold !important;
+    }
+    .stButton > button[kind="primary"]:hover {
+        background-color: #000000 !important; 
+        border: 2px solid #BF1A1A !important;
+        transform: scale(1.02);
+        box-shadow: 0 4px 15px rgba(191, 26, 26, 0.4) !important;
+    }
+    .stButton > button[kind="primary"]:hover * {
+        color: #BF1A1A !important; /* Text turns red on hover */
+    }
+
+    /* --- 2. SECONDARY BUTTONS (Log Out) --- */
+    .stButton > button[kind="secondary"] {
+        background-color: #1A1A1A !important;
+        border: 1px solid #BF1A1A !important;
+        border-radius: 6px !important;
+        transition: all 0.3s ease !important;
+    }
+    .stButton > button[kind="secondary"] * {
+        color: #FFFFFF !important;
+        font-weight: bold !important;
+    }
+    .stButton > button[kind="secondary"]:hover {
+        background-color: #BF1A1A !important;
+        border: 1px solid #BF1A1A !important;
+        box-shadow: 0 4px 10px rgba(191, 26, 26, 0.3) !important;
+    }
+
+    /* --- 3. SIDEBAR NAVIGATION BARS --- */
+    [data-testid="stSidebar"] [data-testid="stRadio"] div[role="radiogroup"] label > div:first-child {
+        display: none !important;
+    }
+    
+    [data-testid="stSidebar"] [data-testid="stRadio"] div[role="radiogroup"] label {
+        background-color: #1A1A1A !important; 
+        padding: 12px 15px !important;
+        border-radius: 6px !important;
+        margin-bottom: 8px !important;
+        cursor: pointer !important;
+        transition: all 0.3s ease !important;
+        border: 1px solid #333333 !important;
+    }
+    
+    /* BRUTE-FORCE SIDEBAR TEXT TO WHITE */
+    [data-testid="stSidebar"] [data-testid="stRadio"] div[role="radiogroup"] label * {
+        color: #FFFFFF !important;
+        font-weight: 600 !important;
+    }
+    
+    [data-testid="stSidebar"] [data-testid="stRadio"] div[role="radiogroup"] label:hover {
+        background-color: #BF1A1A !important;
+        border-color: #BF1A1A !important;
+        transform: translateX(4px); 
+        box-shadow: 0 4px 10px rgba(191, 26, 26, 0.3) !important;
+    }
+    
+    [data-testid="stSidebar"] [data-testid="stRadio"] div[role="radiogroup"] label:has(input:checked) {
+        background-color: #BF1A1A !important;
+        border-color: #BF1A1A !important;
+        box-shadow: 0 4px 10px rgba(191, 26, 26, 0.4) !important;
+    }
+    </style>
+    """)
+
+
+# --- REGISTRATION COUNTDOWN ---
+COUNTDOWN_HTML = _minify("""
+    <!DOCTYPE html>
+    <html>
+    <head>
+    <style>
+        body { margin: 0; font-family: sans-serif; background-color: transparent; display: flex; justify-content: center; }
+        .container { display: flex; justify-content: center; gap: 15px; margin-top: 10px; margin-bottom: 20px;}
+        .block { background-color: #262730; padding: 15px 25px; border-radius: 8px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
+        .num { font-size: 2.5rem; font-family: 'Courier New', monospace; font-weight: bold; color: #BF1A1A; line-height: 1; }
+        .label { font-size: 0.75rem; color: #E0E0E0; text-transform: uppercase; letter-spacing: 1px; margin-top: 5px; }
+        .colon { font-size: 2.5rem; font-weight: bold; color: #262730; display: flex; align-items: center; padding-bottom: 15px; }
+    </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="block"><div class="num" id="days">00</div><div class="label">Days</div></div>
+            <div class="colon">:</div>
+            <div class="block"><div class="num" id="hours">00</div><div class="label">Hours</div></div>
+            <div class="colon">:</div>
+            <div class="block"><div class="num" id="minutes">00</div><div class="label">Mins</div></div>
+            <div class="colon">:</div>
+            <div class="block"><div class="num" id="seconds">00</div><div class="label">Secs</div></div>
+        </div>
+        <script>
+            var deadline = new Date("{deadline}").getTime();
+            var x = setInterval(function() {
+                var now = new Date().getTime();
+                var t = deadline - now;
+                if (t >= 0) {
+                    document.getElementById("days").innerHTML = Math.floor(t / (1000 * 60 * 60 * 24)).toString().padStart(2, '0');
+                    document.getElementById("hours").innerHTML = Math.floor((t % (1000 * 60 * 60 * 24)) / (1000 * 60 * 60)).toString().padStart(2, '0');
+                    document.getElementById("minutes").innerHTML = Math.floor((t % (1000 * 60 * 60)) / (1000 * 60)).toString().padStart(2, '0');
+                    document.getElementById("seconds").innerHTML = Math.floor((t % (1000 * 60)) / 1000).toString().padStart(2, '0');
+                } else {
+                    clearInterval(x);
+                    document.querySelector('.container').innerHTML = "<div style='color: red; font-size: 1.5rem; font-weight: bold;'>TIME IS UP!</div>";
+                }
+            }, 1000);
+        </script>
+    </body>
+    </html>
+    """)
+
+
+@functools.lru_cache(maxsize=8)
+def countdown_html(deadline):
+    return COUNTDOWN_HTML.replace("{deadline}", deadline.strftime("%b %d, %Y %H:%M:%S"))
+
+
+# --- REGISTRATION LOOKUP TABLES ---
+INDUSTRIES = {
+    "Agentic AI": "Autonomous agents and multi-step AI orchestration systems.",
+    "GenAI & LLMs": "Creative tools, text generation, and model infrastructure.",
+    "SaaS (Enterprise)": "Cloud software and B2B digital transformation.",
+    "Cybersecurity": "Data privacy, threat detection, and zero-trust systems.",
+    "Deep Tech": "Quantum computing, advanced materials, and semiconductors.",
+    "Web3 & Blockchain": "DeFi, digital assets, and decentralized infra.",
+    "CloudTech & DevOps": "Server management, scaling tools, and developer platforms.",
+    "HealthTech": "Telemedicine, digital diagnostics, and patient management.",
+    "BioTech": "Drug discovery, genomics, and lab-grown alternatives.",
+    "MedTech": "Medical hardware, robotics for surgery, and wearable devices.",
+    "FemTech": "Women’s health, reproductive tech, and menopause support.",
+    "Longevity & Aging": "Tech for elder care and life-extension science.",
+    "Wellness & Mental Health": "Mindfulness apps and AI-assisted therapy.",
+    "ClimateTech": "Carbon capture, ESG reporting, and circular economy tools.",
+    "CleanTech": "Renewable energy (Solar, Wind, Fusion) and grid storage.",
+    "AgTech": "Precision farming, vertical agriculture, and soil health.",
+    "FoodTech": "Synthetic proteins, food waste reduction, and nutrition AI.",
+    "Mobility & EV": "Electric vehicles, charging networks, and battery tech.",
+    "Logistics & Supply Chain": "Autonomous shipping and last-mile delivery.",
+    "SpaceTech": "Orbital logistics, satellite data, and space exploration.",
+    "PropTech & Construction": "Smart buildings and digital real estate management.",
+    "FinTech": "Payments, neobanks, and automated wealth management.",
+    "InsurTech": "Digital underwriting and risk assessment platforms.",
+    "EdTech": "Gamified learning, AI tutoring, and LMS platforms.",
+    "GovTech": "Citizen services and public sector efficiency software.",
+    "DefenseTech": "National security tech, drones, and tactical software.",
+    "Retail & E-commerce": "D2C infrastructure and omnichannel retail.",
+    "Creator Economy": "Monetization tools and influencer marketing platforms.",
+    "Gaming & Metaverse": "VR/AR, eSports, and interactive entertainment.",
+    "AdTech & MarTech": "AI-driven marketing and customer acquisition."
+}
+
+STAGES = {
+    "1. Concept & Ideation (Pre-Product)": "**VC Focus:** Founder brilliance, market size, and the 'Why Now?' factor.\n\n**Description:** The team has identified a major problem and a theoretical solution. There is no working software or hardware yet. (Deliverable: Pitch deck and market research).",
+    "2. Prototype / Alpha (Proof of Concept)": "**VC Focus:** Technical feasibility and early design thinking.\n\n**Description:** A 'low-fidelity' version of the product exists. It proves the core technology or service is possible. (Deliverable: Demo or clickable wireframes).",
+    "3. MVP & Pilot (Early Traction)": "**VC Focus:** User engagement, retention, and initial feedback loops.\n\n**Description:** The Minimum Viable Product is live and in the hands of actual users. The team is currently testing for 'Product-Market Fit.' (Deliverable: Usage data or LOIs).",
+    "4. Scaling & Revenue (Growth Stage)": "**VC Focus:** Revenue growth, Customer Acquisition Cost (CAC), and Lifetime Value (LTV).\n\n**Description:** The product is being sold. The startup has a repeatable process for acquiring customers. (Deliverable: Financial statements and growth charts)."
+}
@@ -0,0 +1,473 @@
+"""Load test for the Streamlit app against an in-process fake of the Verdix_DB spreadsheet.
+
+Every gspread call the app makes is served from memory with configurable latency and
+429 rate, while Streamlit's AppTest drives the Student Registration, Judge Portal and
+Leaderboard flows with many simulated users at once. Run from this directory:
+
+    python benchmark.py --judges 50 --teams 300 --latency 0.3 --error-rate 0.02
+    python benchmark.py --json results.json   # also write the numbers for comparing runs
+    python benchmark.py --baseline results.json   # and compare a later run against them
+
+For each flow it reports per-rerun latency percentiles, Sheets calls per rerun and the
+size of the page each rerun sends to the browser (serialized element protos); peak
+memory is reported for the whole run, and ranking 50k scores is timed against a 100 ms
+budget (--ranking-scores). Reruns of different sessions are serialized (see
+_APPTEST_LOCK), so latencies are per-rerun service times with every session's data
+loaded, not queueing time.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import gspread
+from gspread.exceptions import APIError, WorksheetNotFound
+from gspread.utils import a1_range_to_grid_range
+from oauth2client.service_account import ServiceAccountCredentials
+
+from leaderboard import SCORE_COLS
+from metrics import WRITE_OPS
+from storage import HEADERS
+
+APP_DIR = Path(__file__).resolve().parent
+APP_PATH = APP_DIR / "app.py"
+TRACKS = ["FinTech", "HealthTech", "ClimateTech", "EdTech", "Agentic AI", "DeepTech"]
+
+
+# --- FAKE GOOGLE SHEETS ---
+class _QuotaResponse:
+    """Just enough of a requests.Response for gspread's APIError."""
+
+    status_code = 429
+    text = "Quota exceeded"
+
+    def json(self):
+        return {"error": {"code": 429, "message": "Quota exceeded for quota metric 'Read requests'", "status": "RESOURCE_EXHAUSTED"}}
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, title, rows, sheet_id):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self.rows = rows
+
+    def append_row(self, values, **kwargs):
+        self.spreadsheet._call(self.title, "append_row")
+        with self.spreadsheet.lock:
+            self.rows.append([str(v) for v in values])
+
+    def append_rows(self, values, **kwargs):
+        self.spreadsheet._call(self.title, "append_rows")
+        with self.spreadsheet.lock:
+            self.rows.extend([str(v) for v in row] for row in values)
+
+    def batch_update(self, data, **kwargs):
+        self.spreadsheet._call(self.title, "batch_update")
+        with self.spreadsheet.lock:
+            for update in data:
+                grid = a1_range_to_grid_range(update["range"])
+                for offset, values in enumerate(update["values"]):
+                    index = grid["startRowIndex"] + offset
+                    self.rows.extend([] for _ in range(index + 1 - len(self.rows)))
+                    self.rows[index] = [str(v) for v in values]
+
+    def get_all_values(self, **kwargs):
+        self.spreadsheet._call(self.title, "get_all_values")
+        with self.spreadsheet.lock:
+            width = max((len(row) for row in self.rows), default=0)
+            return [row + [""] * (width - len(row)) for row in self.rows]
+
+    def get_all_records(self, **kwargs):
+        values = self.get_all_values()
+        return [dict(zip(values[0], row)) for row in values[1:]] if values else []
+
+
+class FakeSpreadsheet:
+    """In-memory stand-in for the gspread Spreadsheet returned by ``client.open(SHEET_NAME)``."""
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.calls = Counter()
+        self.throttled = Counter()
+        self._random = random.Random(seed)
+        self._sheets = {}
+        for name, header in HEADERS.items():
+            self._sheets[name] = FakeWorksheet(self, name, [list(header)], len(self._sheets))
+
+    def _call(self, sheet, op):
+        with self.lock:
+            self.calls[(sheet, op)] += 1
+            throttled = self._random.random() < self.error_rate
+            delay = self.latency * self._random.uniform(0.8, 1.2)
+            if throttled:
+                self.throttled[(sheet, op)] += 1
+        if delay:
+            time.sleep(delay)
+        if throttled:
+            raise APIError(_QuotaResponse())
+
+    def worksheets(self, **kwargs):
+        self._call("*", "worksheets")
+        return list(self._sheets.values())
+
+    def worksheet(self, title):
+        self._call(title, "worksheet")
+        if title not in self._sheets:
+            raise WorksheetNotFound(title)
+        return self._sheets[title]
+
+    def _read(self, a1_range):
+        title, _, cells = a1_range.partition("!")
+        rows = self._sheets[title.strip("'").replace("''", "'")].rows
+        grid = a1_range_to_grid_range(cells) if cells else {}
+        values = [
+            row[grid.get("startColumnIndex", 0):grid.get("endColumnIndex")]
+            for row in rows[grid.get("startRowIndex", 0):grid.get("endRowIndex")]
+        ]
+        # Like the real API: no trailing empty cells or rows
+        values = [row[:max((i + 1 for i, v in enumerate(row) if v != ""), default=0)] for row in values]
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def add_worksheet(self, title, rows, cols, **kwargs):
+        self._call(title, "add_worksheet")
+        with self.lock:
+            self._sheets[title] = FakeWorksheet(self, title, [], len(self._sheets))
+            return self._sheets[title]
+
+    def batch_update(self, body):
+        # Only the requests compact.py sends: appendCells and deleteDimension on rows
+        self._call("*", "batch_update")
+        by_id = {ws.id: ws for ws in self._sheets.values()}
+        with self.lock:
+            for request in body["requests"]:
+                if "appendCells" in request:
+                    spec = request["appendCells"]
+                    by_id[spec["sheetId"]].rows.extend(
+                        [cell["userEnteredValue"]["stringValue"] for cell in row["values"]] for row in spec["rows"]
+                    )
+                elif "deleteDimension" in request:
+                    spec = request["deleteDimension"]["range"]
+                    del by_id[spec["sheetId"]].rows[spec["startIndex"]:spec["endIndex"]]
+        return {"replies": [{} for _ in body["requests"]]}
+
+    def values_batch_get(self, ranges, params=None, **kwargs):
+        self._call("*", "values_batch_get")
+        with self.lock:
+            value_ranges = []
+            for a1_range in ranges:
+                values = self._read(a1_range)
+                value_ranges.append({"range": a1_range, "values": values} if values else {"range": a1_range})
+        return {"valueRanges": value_ranges}
+
+    def seed(self, teams, judges, scores_per_team, rng):
+        self._sheets["Config"].rows.extend([track] for track in TRACKS)
+        for i in range(teams):
+            self._sheets["Teams"].rows.append(_registration_row(f"Team {i:04d}", TRACKS[i % len(TRACKS)], rng))
+        for i in range(teams):
+            for judge in rng.sample(range(judges), min(judges, scores_per_team)):
+                scores = [str(rng.randint(1, 10)) for _ in SCORE_COLS]
+                self._sheets["Scores"].rows.append(
+                    [_timestamp(rng), f"Judge {judge:03d}", f"Team {i:04d}", *scores, "Seeded feedback"]
+                )
+
+
+def _timestamp(rng):
+    return (datetime(2026, 3, 20, 9) + timedelta(seconds=rng.randint(0, 8 * 3600))).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _registration_row(team, track, rng):
+    return [
+        _timestamp(rng), "🆕 New Registration", team, track, "Alice (CEO), Bob (CTO)", "12345678",
+        "Sunway University", "School of Science and Technology", "BSc Computer Science", "FinTech",
+        "3. MVP & Pilot (Early Traction)", "We help students budget. " * 20, "", "https://example.com/deck",
+    ]
+
+
+def install_fake(spreadsheet):
+    """Route the app's gspread login to ``spreadsheet`` instead of Google."""
+
+    class _Client:
+        def open(self, name):
+            return spreadsheet
+
+    ServiceAccountCredentials.from_json_keyfile_dict = classmethod(lambda cls, keyfile_dict, scopes: None)
+    gspread.authorize = lambda credentials: _Client()
+
+
+# --- FLOWS ---
+# AppTest sets up process-global Streamlit runtime state for each run, so reruns from
+# different sessions cannot overlap. Sessions still interleave rerun by rerun, sharing the
+# app's caches, queue and indexes exactly as they would inside one server process.
+_APPTEST_LOCK = threading.Lock()
+
+
+class Session:
+    """One simulated browser tab, timing every rerun it triggers."""
+
+    def __init__(self, secrets, samples):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(str(APP_PATH), default_timeout=120)
+        for key, value in secrets.items():
+            self.at.secrets[key] = value
+        self.samples = samples
+        self.mode = None
+
+    def run(self, widget=None):
+        with _APPTEST_LOCK:
+            start = time.perf_counter()
+            if widget is None:
+                self.at.run()
+            else:
+                widget.run()
+            seconds = time.perf_counter() - start
+        self.samples.append({
+            "seconds": seconds,
+            "payload_bytes": _payload_bytes(self.at._tree),
+            "errors": len(self.at.exception) + sum("Connection Error" in str(e.value) for e in self.at.error),
+        })
+
+    def navigate(self, mode):
+        self.mode = mode
+        self.run(self.widget("radio", "Navigation").set_value(mode))
+
+    def widget(self, kind, label, retries=5):
+        # A failed Sheets read can cost the user the rendered page (and with it the sidebar
+        # selection); they would simply reload and click back to where they were
+        for _ in range(retries):
+            found = [w for w in getattr(self.at, kind) if w.label == label]
+            if found:
+                return found[0]
+            menu = [w for w in self.at.radio if w.label == "Navigation"]
+            if menu and self.mode and menu[0].value != self.mode:
+                self.run(menu[0].set_value(self.mode))
+            else:
+                self.run()
+        problems = [e.value for e in self.at.error] + [e.message for e in self.at.exception]
+        raise RuntimeError(f"{kind} {label!r} never rendered: {problems}")
+
+
+def _payload_bytes(node):
+    # What the browser receives for a rerun: every element and block proto on the page
+    proto = getattr(node, "proto", None)
+    size = len(proto.SerializeToString()) if proto is not None else 0
+    return size + sum(_payload_bytes(child) for child in getattr(node, "children", {}).values())
+
+
+def registration_flow(secrets, samples, team, rng):
+    session = Session(secrets, samples)
+    session.run()
+    session.widget("text_input", "Startup / Team Name *").input(team)
+    session.widget("selectbox", "Which Track are you competing in? *").select(rng.choice(TRACKS))
+    session.widget("text_area", "Team Leaders (Names) *").input("Alice (CEO), Bob (CTO)")
+    session.widget("text_input", "Student ID / IC No *").input("12345678")
+    session.widget("text_input", "University / Institution *").input("Sunway University")
+    session.widget("text_input", "Faculty / School *").input("School of Science and Technology")
+    session.widget("text_input", "Academic Programme *").input("BSc Computer Science")
+    session.widget("multiselect", "Industry / Tags (Select up to 3) *").select("FinTech")
+    session.widget("selectbox", "Stage of Startup *").select("3. MVP & Pilot (Early Traction)")
+    session.widget("text_area", "Value Proposition (The 'Elevator Pitch') *").input("We help students budget.")
+    session.widget("text_input", "Pitch Deck / Logo Link *").input("https://example.com/deck")
+    session.run(session.widget("button", "🚀 Submit Registration").click())
+
+
+def judge_flow(secrets, samples, judge, rounds, rng):
+    session = Session(secrets, samples)
+    session.run()
+    session.navigate("Judge Portal")
+    session.widget("text_input", "👨‍⚖️ Enter Your Full Name").input(judge)
+    session.widget("text_input", "🔑 Event Access Code").input("verdix2026")
+    session.run(session.widget("button", "Log In to Portal").click())
+    for _ in range(rounds):
+        session.run(session.widget("selectbox", "📌 Select Track").select(rng.choice(TRACKS)))
+        team_select = session.widget("selectbox", "🚀 Select Startup to Evaluate")
+        # Already-scored teams are listed as "✅ <name>"
+        session.run(team_select.select(rng.choice(team_select.options).removeprefix("✅ ")))
+        for slider in session.at.slider:
+            slider.set_value(rng.randint(1, 10))
+        session.run(session.widget("button", "✅ Submit Final Score").click())
+
+
+def leaderboard_flow(secrets, samples, rounds, rng):
+    session = Session(secrets, samples)
+    session.run()
+    session.navigate("Leaderboard")
+    session.widget("text_input", "🔑 Organizer Password").input("admin2026")
+    session.run(session.widget("button", "Unlock Leaderboard").click())
+    for _ in range(rounds):
+        session.run(session.widget("selectbox", "🏆 View Leaderboard For:").select(rng.choice(["All Tracks"] + TRACKS)))
+
+
+# Ranking all tracks should stay well inside one rerun's budget even at this size
+RANKING_BUDGET_MS = 100
+
+
+def ranking_timing(n_scores, rng, repeats=5):
+    """Best-of-``repeats`` milliseconds for the leaderboard to rank ``n_scores`` Scores rows."""
+    from leaderboard import LeaderboardAggregator
+    from storage import FREE_TEXT, typed_frame
+
+    n_teams, n_judges = max(1, n_scores // 50), 60
+    rows = [
+        [_timestamp(rng), f"Judge {rng.randrange(n_judges):03d}", f"Team {rng.randrange(n_teams):04d}",
+         *[str(rng.randint(1, 10)) for _ in SCORE_COLS], ""]
+        for _ in range(n_scores)
+    ]
+    frame = typed_frame(HEADERS["Scores"], rows, FREE_TEXT["Scores"])
+    aggregator = LeaderboardAggregator(normalization="zscore", trim=0.1)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        aggregator._rank(frame)
+        timings.append(time.perf_counter() - start)
+    return round(min(timings) * 1000, 1)
+
+
+# --- REPORTING ---
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(name, samples, calls_before, calls_after, elapsed):
+    seconds = [s["seconds"] for s in samples]
+    calls = calls_after - calls_before
+    reads = sum(n for (sheet, op), n in calls.items() if op not in WRITE_OPS)
+    writes = sum(calls.values()) - reads
+    return {
+        "flow": name,
+        "reruns": len(samples),
+        "wall_seconds": round(elapsed, 2),
+        "p50_ms": round(_percentile(seconds, 50) * 1000, 1),
+        "p90_ms": round(_percentile(seconds, 90) * 1000, 1),
+        "p99_ms": round(_percentile(seconds, 99) * 1000, 1),
+        "max_ms": round(max(seconds) * 1000, 1),
+        "mean_ms": round(statistics.fmean(seconds) * 1000, 1),
+        "payload_kb_per_rerun": round(statistics.fmean(s["payload_bytes"] for s in samples) / 1024, 1),
+        "sheets_reads_per_rerun": round(reads / len(samples), 3),
+        "sheets_writes_per_rerun": round(writes / len(samples), 3),
+        "errors": sum(s["errors"] for s in samples),
+        "calls": {f"{sheet}.{op}": n for (sheet, op), n in sorted(calls.items())},
+    }
+
+
+def print_report(results, peak_rss_mb, spreadsheet):
+    print(f"{'flow':<14}{'reruns':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'reads/rr':>10}{'writes/rr':>11}{'KB/rr':>8}{'errors':>8}")
+    for r in results:
+        print(
+            f"{r['flow']:<14}{r['reruns']:>8}{r['p50_ms']:>10}{r['p90_ms']:>10}{r['p99_ms']:>10}{r['max_ms']:>10}"
+            f"{r['sheets_reads_per_rerun']:>10}{r['sheets_writes_per_rerun']:>11}{r['payload_kb_per_rerun']:>8}{r['errors']:>8}"
+        )
+    print(f"\nPeak memory (RSS): {peak_rss_mb:.1f} MB")
+    print(f"Injected 429s: {sum(spreadsheet.throttled.values())}")
+
+
+def print_comparison(results, baseline):
+    """Per-flow change against a previous ``--json`` run (e.g. of the parent commit)."""
+    before = {r["flow"]: r for r in baseline["flows"]}
+    metrics = [("p50_ms", "p50 ms"), ("p90_ms", "p90 ms"), ("payload_kb_per_rerun", "KB/rr"), ("sheets_reads_per_rerun", "reads/rr")]
+    print(f"\nAgainst baseline ({baseline['args'].get('json') or 'previous run'}):")
+    print(f"{'flow':<14}" + "".join(f"{label:>24}" for _, label in metrics))
+    for r in results:
+        old = before.get(r["flow"])
+        if old is None:
+            continue
+        cells = []
+        for key, _ in metrics:
+            if key not in old or key not in r:
+                cells.append("n/a")
+                continue
+            change = f" ({(r[key] - old[key]) / old[key]:+.0%})" if old[key] else ""
+            cells.append(f"{old[key]} -> {r[key]}{change}")
+        print(f"{r['flow']:<14}" + "".join(f"{cell:>24}" for cell in cells))
+
+
+def _run_phase(name, jobs, workers, spreadsheet):
+    samples = []
+    calls_before = Counter(spreadsheet.calls)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(job, samples) for job in jobs]:
+            future.result()
+    return summarize(name, samples, calls_before, Counter(spreadsheet.calls), time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--judges", type=int, default=50, help="concurrent judge sessions")
+    parser.add_argument("--teams", type=int, default=300, help="teams seeded into the fake Teams sheet")
+    parser.add_argument("--registrations", type=int, default=20, help="concurrent registration sessions")
+    parser.add_argument("--admins", type=int, default=3, help="concurrent leaderboard sessions")
+    parser.add_argument("--rounds", type=int, default=3, help="teams scored per judge / views per admin")
+    parser.add_argument("--scores-per-team", type=int, default=5, help="scores seeded per team")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds added to every Sheets call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of Sheets calls failing with 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--baseline", help="a previous --json file to compare against")
+    parser.add_argument("--ranking-scores", type=int, default=50000, help="Scores rows for the ranking timing check (0 to skip)")
+    args = parser.parse_args(argv)
+
+    # AppTest resolves the sidebar logo against the working directory
+    os.chdir(next((d for d in (APP_DIR, APP_DIR.parent) if (d / "Verdix.png").exists()), APP_DIR))
+
+    rng = random.Random(args.seed)
+    spreadsheet = FakeSpreadsheet(args.latency, args.error_rate, args.seed)
+    spreadsheet.seed(args.teams, args.judges, args.scores_per_team, rng)
+    install_fake(spreadsheet)
+
+    workdir = tempfile.mkdtemp(prefix="verdix-bench-")
+    secrets = {
+        "gcp_service_account": {"private_key": "benchmark"},
+        "write_queue": {"path": os.path.join(workdir, "queue.db")},
+        "event": {"registration_deadline": (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d %H:%M")},
+    }
+
+    phases = [
+        ("registration", [
+            lambda samples, i=i: registration_flow(secrets, samples, f"Bench Team {i}", random.Random(i))
+            for i in range(args.registrations)
+        ], args.registrations),
+        ("judge_portal", [
+            lambda samples, i=i: judge_flow(secrets, samples, f"Bench Judge {i}", args.rounds, random.Random(i))
+            for i in range(args.judges)
+        ], args.judges),
+        ("leaderboard", [
+            lambda samples, i=i: leaderboard_flow(secrets, samples, args.rounds, random.Random(i))
+            for i in range(args.admins)
+        ], args.admins),
+    ]
+    results = [_run_phase(name, jobs, workers, spreadsheet) for name, jobs, workers in phases if jobs]
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    print_report(results, peak_rss_mb, spreadsheet)
+    ranking_ms = None
+    if args.ranking_scores:
+        ranking_ms = ranking_timing(args.ranking_scores, random.Random(args.seed))
+        verdict = "ok" if ranking_ms <= RANKING_BUDGET_MS else "OVER BUDGET"
+        print(f"Ranking {args.ranking_scores:,} scores (zscore, trim 0.1): {ranking_ms} ms (budget {RANKING_BUDGET_MS} ms, {verdict})")
+    if args.baseline:
+        with open(args.baseline) as f:
+            print_comparison(results, json.load(f))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "peak_rss_mb": round(peak_rss_mb, 1), "ranking_ms": ranking_ms, "flows": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Bulk import of team registrations and tracks from CSV files.
+
+Partner universities often send their registrations as a spreadsheet. Instead of typing
+each one into the Student Registration form (one Sheets append per team), an admin
+uploads it as CSV in the Teams column layout (Col A-N, the order the registration form
+writes). Every row is checked against the form's required fields and the known tracks,
+team names already registered (or repeated in the file) are skipped, and the accepted
+rows are queued in one go, so the write-behind queue appends them in ``append_rows``
+chunks: 500 teams take about ten Sheets calls instead of 500.
+"""
+
+import csv
+import io
+from datetime import datetime
+
+from storage import HEADERS, missing_fields
+
+NEW_REGISTRATION = "🆕 New Registration"
+
+
+def read_csv(data):
+    """``(line number, row)`` for each non-blank row of an uploaded CSV (bytes or text)."""
+    if isinstance(data, bytes):
+        # utf-8-sig drops the byte-order mark Excel puts in front of "CSV UTF-8" exports
+        data = data.decode("utf-8-sig")
+    reader = csv.reader(io.StringIO(data))
+    rows = ((reader.line_num, [cell.strip() for cell in row]) for row in reader)
+    return [(line, row) for line, row in rows if any(row)]
+
+
+def parse_tracks(data):
+    """Track names from a one-column CSV (an optional "Track Name" header is skipped)."""
+    tracks = []
+    for _, row in read_csv(data):
+        name = row[0]
+        if name and name != "Track Name" and name not in tracks:
+            tracks.append(name)
+    return tracks
+
+
+def plan_team_import(data, tracks, existing_names, now=None):
+    """Validate a Teams CSV; returns ``(rows, problems)``.
+
+    ``rows`` are ready to append in the Teams layout; ``problems`` has one
+    ``{"Line", "Team Name", "Problem"}`` record per row left out. A blank Timestamp or
+    Submission Type is filled in the way the registration form would.
+    """
+    header = HEADERS["Teams"]
+    timestamp = (now or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    known_tracks = set(tracks)
+    registered = {name.casefold() for name in existing_names}
+    seen = set(registered)
+    rows, problems = [], []
+
+    lines = read_csv(data)
+    # A header row copied from the Teams sheet is optional
+    start = 1 if lines and lines[0][1][:3] == header[:3] else 0
+    for line, values in lines[start:]:
+        team = values[2] if len(values) > 2 else ""
+        problem = None
+        if len(values) > len(header) and any(values[len(header):]):
+            problem = f"has {len(values)} columns; expected the {len(header)} Teams columns (A-N)"
+        else:
+            record = dict(zip(header, values))
+            missing = missing_fields(record)
+            if missing:
+                problem = f"missing {', '.join(missing)}"
+            elif record["Track"] not in known_tracks:
+                problem = f"unknown track '{record['Track']}'"
+            elif team.casefold() in seen:
+                problem = "team name already registered" if team.casefold() in registered else "duplicate team name in this file"
+        if problem:
+            problems.append({"Line": line, "Team Name": team, "Problem": problem})
+            continue
+        seen.add(team.casefold())
+        row = (values + [""] * len(header))[:len(header)]
+        row[0] = row[0] or timestamp
+        row[1] = row[1] or NEW_REGISTRATION
+        rows.append(row)
+    return rows, problems
+
+
+def import_tracks(db, names):
+    """Append the tracks Config doesn't have yet; returns the ones added."""
+    existing = set(db.list_tracks())
+    new = [name for name in names if name not in existing]
+    db.submit_many("Config", [[name] for name in new])
+    return new
+
+
+def import_teams(db, rows):
+    db.submit_many("Teams", rows)
+    return len(rows)
@@ -0,0 +1,122 @@
+"""Move superseded Teams registrations into an archive worksheet.
+
+Every "🔄 Update Existing Registration" appends a new row, so Teams keeps every older
+version of a team's profile. Only the newest row per Team Name is ever shown, so this
+moves the rest to an archive tab:
+
+    python compact.py                 # uses .streamlit/secrets.toml
+    python compact.py --dry-run       # only report what would move
+
+Safe to run during the event: the archive append and the row deletions are sent as one
+atomic spreadsheet batchUpdate, and rows appended after the read sit below every deleted
+row, so they are kept untouched. Running app servers notice the rewrite on their next
+refresh and reload Teams in full.
+"""
+
+import argparse
+import os
+import tomllib
+from contextlib import nullcontext
+
+from gspread.exceptions import WorksheetNotFound
+from gspread.utils import absolute_range_name
+
+ARCHIVE_SHEET = "Teams_Archive"
+
+
+def superseded_rows(header, rows):
+    """Indexes of rows that a later row for the same Team Name replaces."""
+    if "Team Name" not in header:
+        return []
+    team_idx = header.index("Team Name")
+    latest = {}
+    for i, row in enumerate(rows):
+        team = row[team_idx] if team_idx < len(row) else ""
+        if team:
+            latest[team] = i
+    keep = set(latest.values())
+    return [i for i, row in enumerate(rows) if i not in keep and team_idx < len(row) and row[team_idx]]
+
+
+def _runs(indexes):
+    # Consecutive indexes collapse into one (start, end) range to delete
+    runs = []
+    for i in indexes:
+        if runs and runs[-1][1] == i:
+            runs[-1][1] = i + 1
+        else:
+            runs.append([i, i + 1])
+    return runs
+
+
+def compact_teams(sh, archive=ARCHIVE_SHEET, dry_run=False, guard=None):
+    """Archive superseded Teams rows; returns ``(kept, archived)`` row counts."""
+    call = guard.call if guard is not None else lambda sheet, op: nullcontext()
+
+    with call("Teams", "values_batch_get"):
+        value_ranges = sh.values_batch_get([absolute_range_name("Teams")]).get("valueRanges", [])
+    values = value_ranges[0].get("values", []) if value_ranges else []
+    header, rows = (values[0], values[1:]) if values else ([], [])
+    superseded = superseded_rows(header, rows)
+    if dry_run or not superseded:
+        return len(rows) - len(superseded), len(superseded)
+
+    with call("Teams", "worksheet"):
+        worksheets = {ws.title: ws for ws in sh.worksheets()}
+    if "Teams" not in worksheets:
+        raise WorksheetNotFound("Teams")
+    teams = worksheets["Teams"]
+    archive_ws = worksheets.get(archive)
+    if archive_ws is None:
+        with call(archive, "add_worksheet"):
+            archive_ws = sh.add_worksheet(archive, rows=1, cols=len(header))
+        with call(archive, "append_rows"):
+            archive_ws.append_rows([header])
+
+    def cells(row):
+        return {"values": [{"userEnteredValue": {"stringValue": str(v)}} for v in row]}
+
+    requests = [{
+        "appendCells": {
+            "sheetId": archive_ws.id,
+            "rows": [cells(rows[i]) for i in superseded],
+            "fields": "userEnteredValue",
+        }
+    }]
+    # Bottom-up, so earlier deletions don't shift the rows of later ones; data row i is sheet row i + 1
+    for start, end in reversed(_runs(superseded)):
+        requests.append({
+            "deleteDimension": {
+                "range": {"sheetId": teams.id, "dimension": "ROWS", "startIndex": start + 1, "endIndex": end + 1}
+            }
+        })
+    with call("Teams", "batch_update"):
+        sh.batch_update({"requests": requests})
+    return len(rows) - len(superseded), len(superseded)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--secrets", default=os.path.join(".streamlit", "secrets.toml"), help="Streamlit secrets file with [gcp_service_account]")
+    parser.add_argument("--archive", default=ARCHIVE_SHEET, help="worksheet that receives the superseded rows")
+    parser.add_argument("--dry-run", action="store_true", help="only count what would be archived")
+    args = parser.parse_args(argv)
+
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
+    from app import SCOPE, SHEET_NAME
+
+    with open(args.secrets, "rb") as f:
+        creds_dict = dict(tomllib.load(f)["gcp_service_account"])
+    creds_dict["private_key"] = creds_dict["private_key"].replace("\\n", "\n")
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, SCOPE)
+    sh = gspread.authorize(creds).open(SHEET_NAME)
+
+    kept, archived = compact_teams(sh, args.archive, args.dry_run)
+    verb = "Would archive" if args.dry_run else "Archived"
+    print(f"{verb} {archived} superseded row(s) to '{args.archive}'; {kept} registration(s) stay in Teams.")
+
+
+if __name__ == "__main__":
+    main()
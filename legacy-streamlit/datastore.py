@@ -0,0 +1,521 @@
+import threading
+import time
+
+from gspread.exceptions import WorksheetNotFound
+from gspread.utils import absolute_range_name, rowcol_to_a1
+
+from metrics import METRICS
+from resilience import SheetsGuard
+
+# How long (in seconds) a worksheet read stays fresh before we go back to Google Sheets.
+# Config barely changes during an event; Scores is what organizers watch live.
+DEFAULT_TTL = {"Config": 300, "Teams": 60, "Scores": 15}
+
+# Sheets refreshed by fetching just the rows after the last one we have. Scores rows are also
+# overwritten in place when a judge re-scores a team, but only by our write-behind queue, which
+# applies those writes to the cached copy itself (see SheetCache.overwrite). Other replicas only
+# hear about them through the shared store, so several replicas need [shared_cache] configured.
+APPEND_ONLY = {"Teams", "Scores"}
+
+# While Sheets is failing, how long the last good snapshot is served before trying again
+DEGRADED_RETRY = 5
+
+
+def pad_row(row, width):
+    row = list(row[:width])
+    return row + [""] * (width - len(row))
+
+
+def column_letter(index):
+    # 0 -> "A", 11 -> "L"
+    return rowcol_to_a1(1, index + 1).rstrip("0123456789")
+
+
+class SheetCache:
+    """Process-wide read cache over the Verdix_DB worksheets.
+
+    One instance is shared by every Streamlit session, so 40 judges changing selectboxes
+    cost one read per sheet per TTL window instead of one per rerun. Rows still waiting in
+    the write-behind queue are overlaid on reads, and flushed writes mark the cached copy
+    stale, so a submitter always sees their own row. When a refresh fails (quota spike,
+    open circuit) the last good rows keep being served and ``degraded`` says since when.
+
+    Stale sheets are fetched together with a single ``values_batch_get`` (see
+    :meth:`prefetch`), so a page render costs one round trip however many sheets it reads.
+    Append-only sheets are refreshed by tailing: only rows past the last one we have are
+    downloaded. A full reload happens when the header changed or the last row we know
+    about no longer matches, i.e. someone edited or deleted rows by hand. Rows the write
+    queue overwrites in place are patched into the cached copy by :meth:`overwrite`.
+
+    With ``shared`` set, refreshes go through a :class:`sharedcache.SharedSnapshotStore` so
+    several server replicas share one copy of each sheet instead of each polling Sheets.
+    An in-place overwrite is announced through the store too, and makes the next refresh
+    of that sheet a full reload on every replica.
+
+    ``skip`` maps a sheet to ``(expected_header, columns, keys)``: those (long free-text)
+    columns are left out of every refresh, read as ``""``, and fetched on demand with
+    :meth:`cells`. The ``keys`` columns come along with every on-demand read, so a cell is
+    only used if its row still holds the record we cached at that position (rows shift
+    when ``compact.py`` archives registrations). A sheet whose header doesn't match the
+    expected layout is simply read in full.
+
+    With ``snapshots`` (a :class:`snapshots.ColumnarSnapshots`), a sheet seen for the first
+    time starts from its last saved snapshot, so after a restart the first refresh only has
+    to reconcile: appended Teams rows are tailed instead of downloading the whole sheet.
+    Sheets in ``upserted`` (Scores) may have been overwritten in place since the snapshot was
+    saved, so their first refresh is a full read.
+    """
+
+    def __init__(self, sh, ttl=None, shared=None, guard=None, skip=None, snapshots=None, upserted=()):
+        self.sh = sh
+        self.ttl = dict(DEFAULT_TTL)
+        self.ttl.update(ttl or {})
+        self._worksheets = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._sheet_locks = {}
+        # Set by writequeue.SubmissionQueue; its unflushed rows are overlaid on every read
+        self.queue = None
+        # Optional sharedcache.SharedSnapshotStore used to share refreshes across replicas
+        self.shared = shared
+        # Every gspread call goes through the rate limiter and circuit breaker
+        self.guard = guard or SheetsGuard()
+        # Set while reads are failing and the last good snapshot is being served instead
+        self.degraded = None
+        self.snapshots = snapshots
+        self.upserted = set(upserted)
+        # Column index spans [start, end) fetched for sheets with skipped columns
+        self._spans = {}
+        self._expected = {}
+        self._keys = {}
+        for name, (expected, columns, keys) in (skip or {}).items():
+            skipped = sorted(expected.index(col) for col in columns)
+            spans, start = [], 0
+            for index in skipped + [len(expected)]:
+                if index > start:
+                    spans.append((start, index))
+                start = index + 1
+            self._spans[name] = spans
+            self._expected[name] = list(expected)
+            self._keys[name] = [expected.index(col) for col in keys]
+
+    def _lock_for(self, name):
+        with self._lock:
+            return self._sheet_locks.setdefault(name, threading.Lock())
+
+    def worksheet(self, name):
+        if name not in self._worksheets:
+            # One metadata call resolves every tab; handles are reused for the life of the process
+            with self._lock:
+                if name not in self._worksheets:
+                    with self.guard.call(name, "worksheet"):
+                        worksheets = self.sh.worksheets()
+                    self._worksheets.update({ws.title: ws for ws in worksheets})
+        if name not in self._worksheets:
+            raise WorksheetNotFound(name)
+        return self._worksheets[name]
+
+    def _stale(self, name):
+        entry = self._entries.get(name)
+        return entry is None or time.monotonic() >= entry["expires"]
+
+    def _entry(self, name):
+        if self._stale(name):
+            self.prefetch([name])
+        else:
+            METRICS.cache_lookup(name, hit=True)
+        return self._entries[name]
+
+    def _batch_get(self, names, ranges):
+        with self.guard.call(",".join(names), "values_batch_get"):
+            value_ranges = self.sh.values_batch_get(ranges).get("valueRanges", [])
+        return [vr.get("values", []) for vr in value_ranges]
+
+    def prefetch(self, names):
+        """Bring every stale sheet in ``names`` up to date with one values batch-get."""
+        stale = []
+        for name in sorted(set(names)):
+            is_stale = self._stale(name)
+            METRICS.cache_lookup(name, hit=not is_stale)
+            if is_stale:
+                stale.append(name)
+        if not stale:
+            return
+        # Only one session refreshes a sheet; the rest wait and reuse its result.
+        # Locks are always taken in name order so overlapping prefetches can't deadlock.
+        locks = [self._lock_for(name) for name in stale]
+        for lock in locks:
+            lock.acquire()
+        try:
+            stale = [name for name in stale if self._stale(name)]
+            try:
+                if self.shared is None:
+                    self._fetch(stale)
+                else:
+                    self._refresh_shared(stale)
+            except Exception as e:
+                self._serve_stale(stale, e)
+            else:
+                self.degraded = None
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def _fetch(self, stale):
+        for name in stale:
+            if name not in self._entries and self.snapshots is not None:
+                self._warm_start(name)
+        # Tokens of the last in-place overwrite on any replica; a sheet rewritten since our
+        # last full read can't be tailed
+        tokens = {name: self.shared.rewrite_token(name) for name in stale} if self.shared is not None else {}
+        plans = {}
+        ranges = []
+        for name in stale:
+            entry = self._entries.get(name)
+            rewritten = name in tokens and entry is not None and entry.get("rewrite") != tokens[name]
+            plans[name] = plan = self._plan(name, full=rewritten or (entry is not None and entry.get("reconcile")))
+            plan["slice"] = slice(len(ranges), len(ranges) + len(plan["ranges"]))
+            ranges.extend(plan["ranges"])
+        if not ranges:
+            return
+        values = self._batch_get(stale, ranges)
+
+        retry = []
+        for name in stale:
+            plan = plans[name]
+            result = values[plan["slice"]]
+            if plan.get("pruned"):
+                header_now = result[0][0] if result[0] else []
+                if header_now and header_now[:len(self._expected[name])] != self._expected[name]:
+                    # Not the layout the app writes; stop pruning this sheet and read it whole
+                    del self._spans[name]
+                    retry.append(name)
+                    continue
+                result = [result[0], self._assemble(name, len(header_now), result[1:])]
+                if plan["mode"] == "full":
+                    result = [[header_now] + result[1]]
+            if plan["mode"] == "tail" and self._apply_tail(name, *result):
+                continue
+            if plan["mode"] == "full":
+                self._apply_full(name, result[0])
+            else:
+                retry.append(name)
+
+        if retry:
+            # Someone edited a tailed sheet by hand; reload just those in full
+            plans = {name: self._plan(name, full=True) for name in retry}
+            ranges = [r for name in retry for r in plans[name]["ranges"]]
+            values = iter(self._batch_get(retry, ranges))
+            for name in retry:
+                result = [next(values) for _ in plans[name]["ranges"]]
+                if plans[name].get("pruned"):
+                    header_now = result[0][0] if result[0] else []
+                    result = [[header_now] + self._assemble(name, len(header_now), result[1:])]
+                self._apply_full(name, result[0])
+
+        for name in stale:
+            self._entries[name]["expires"] = time.monotonic() + self.ttl.get(name, 0)
+            self._entries[name].pop("reconcile", None)
+            if name in tokens:
+                self._entries[name]["rewrite"] = tokens[name]
+
+    def _serve_stale(self, names, error):
+        """Keep serving the last good rows while Sheets is failing; re-raise if there are none."""
+        if self.shared is not None:
+            for name in names:
+                data = None if name in self._entries else self.shared.load(name)
+                if data is not None:
+                    self._adopt(name, data)
+        if any(name not in self._entries for name in names):
+            raise error
+        retry_at = time.monotonic() + DEGRADED_RETRY
+        for name in names:
+            self._entries[name]["expires"] = retry_at
+        self._mark_degraded(error)
+
+    def _mark_degraded(self, error):
+        since = self.degraded["since"] if self.degraded else time.time()
+        self.degraded = {"since": since, "error": f"{type(error).__name__}: {error}"}
+
+    # --- Cross-replica snapshots ---
+    def _refresh_shared(self, stale):
+        """Take fresh snapshots from the shared store; refresh the rest only if we hold the lease."""
+        stale = self._adopt_shared(stale)
+        if not stale:
+            return
+        if not self.shared.acquire():
+            # Another replica is refreshing; wait for it rather than spend our own quota
+            self.shared.wait_for(stale)
+            stale = self._adopt_shared(stale)
+            if stale:
+                # Still nothing after the wait (holder stuck or gone): fetch without publishing
+                self._fetch(stale)
+            return
+        try:
+            # Someone may have published between our check and taking the lease
+            stale = self._adopt_shared(stale)
+            before = {name: (self._entries[name]["generation"], self._entries[name].get("rewrite")) for name in stale if name in self._entries}
+            self._fetch(stale)
+            for name in stale:
+                entry = self._entries[name]
+                # Read under a newer rewrite token: rows changed in place even if ours already
+                # match them (we made the overwrite), so the other replicas must not just extend
+                unchanged = before.get(name) == (entry["generation"], entry.get("rewrite"))
+                meta = self.shared.publish(
+                    name, entry["header"], entry["rows"],
+                    extends=entry.get("shared_version") if unchanged else None,
+                    ttl=self.ttl.get(name, 0),
+                    rewrite=entry.get("rewrite"),
+                )
+                entry["shared_version"], entry["shared_generation"] = meta["version"], meta["generation"]
+        finally:
+            self.shared.release()
+
+    def _adopt_shared(self, names):
+        stale = []
+        for name in names:
+            meta = self.shared.meta(name)
+            # A snapshot published before the last in-place overwrite doesn't have it
+            fresh = self.shared.fresh(meta) and meta.get("rewrite") == self.shared.rewrite_token(name)
+            METRICS.cache_lookup("shared:" + name, hit=fresh)
+            if not fresh:
+                stale.append(name)
+                continue
+            entry = self._entries.get(name)
+            if entry is None or entry.get("shared_version") != meta["version"]:
+                data = self.shared.load(name)
+                if data is None:
+                    stale.append(name)
+                    continue
+                entry = self._adopt(name, data)
+            entry["expires"] = time.monotonic() + max(0, meta["expires_at"] - time.time())
+        return stale
+
+    def _adopt(self, name, data):
+        entry = self._entries.get(name)
+        extends = (
+            entry is not None
+            and entry.get("shared_generation") == data["generation"]
+            and entry.get("rewrite") == data.get("rewrite")
+            and entry["header"] == data["header"]
+            and len(data["rows"]) >= len(entry["rows"])
+        )
+        if extends:
+            # Same lineage: keep our generation so incremental consumers just read the new rows
+            entry["rows"].extend(data["rows"][len(entry["rows"]):])
+        else:
+            self._apply_full(name, [data["header"]] + data["rows"])
+            entry = self._entries[name]
+        entry["shared_version"], entry["shared_generation"] = data["version"], data["generation"]
+        entry["rewrite"] = data.get("rewrite")
+        return entry
+
+    def _warm_start(self, name):
+        snapshot = self.snapshots.load(name)
+        if snapshot is None:
+            return
+        header, rows, _ = snapshot
+        # Expired from the start: the refresh that follows brings it up to date
+        self._entries[name] = {
+            "header": header,
+            "rows": [pad_row(row, len(header)) for row in rows],
+            "frame": None,
+            "frame_rows": 0,
+            "generation": 0,
+            "expires": 0,
+            # Rows overwritten after the snapshot was saved can't be seen by tailing
+            "reconcile": name in self.upserted,
+        }
+
+    def _plan(self, name, full=False):
+        entry = self._entries.get(name)
+        tail = not full and entry is not None and name in APPEND_ONLY and entry["header"]
+        if name in self._spans:
+            # Header row in full, plus only the kept column spans of the data rows
+            tail = tail and entry["rows"]
+            first_row = len(entry["rows"]) + 1 if tail else 2
+            ranges = [absolute_range_name(name, "1:1")] + [
+                absolute_range_name(name, f"{column_letter(start)}{first_row}:{column_letter(end - 1)}")
+                for start, end in self._spans[name]
+            ]
+            return {"mode": "tail" if tail else "full", "ranges": ranges, "pruned": True}
+        if not tail:
+            return {"mode": "full", "ranges": [absolute_range_name(name)]}
+        # Re-read the header and the last row we already have, plus everything after it
+        last_col = column_letter(len(entry["header"]) - 1)
+        first_row = len(entry["rows"]) + 1
+        return {
+            "mode": "tail",
+            "ranges": [absolute_range_name(name, "1:1"), absolute_range_name(name, f"A{first_row}:{last_col}")],
+        }
+
+    def _assemble(self, name, width, segments):
+        """Stitch the per-span value ranges back into full-width rows, skipped columns blank."""
+        spans = self._spans[name]
+        rows = []
+        for i in range(max((len(values) for values in segments), default=0)):
+            row = [""] * width
+            for (start, end), values in zip(spans, segments):
+                cells = values[i][: end - start] if i < len(values) else []
+                row[start:start + len(cells)] = cells
+            rows.append(row)
+        return rows
+
+    def _fetched(self, name, index):
+        # Whether refreshes download column ``index`` of ``name`` (skipped free text isn't)
+        return name not in self._spans or any(start <= index < end for start, end in self._spans[name])
+
+    def cells(self, name, column, positions):
+        """Values of ``column`` for the given data rows (0 = first row under the header).
+
+        Skipped free-text columns are fetched on first use with one batch-get of just the
+        requested rows, then kept with the cached snapshot until it is reloaded.
+        """
+        entry = self._entry(name)
+        header = entry["header"]
+        if column not in header:
+            return [""] * len(positions)
+        index = header.index(column)
+        if self._fetched(name, index):
+            return [entry["rows"][p][index] for p in positions]
+        with self._lock_for(name):
+            cache = entry.setdefault("cells", {})
+            missing = sorted({p for p in positions if (index, p) not in cache})
+            if missing:
+                # One batch-get, one range per run of consecutive rows
+                runs = []
+                for p in missing:
+                    if runs and runs[-1][1] == p:
+                        runs[-1][1] = p + 1
+                    else:
+                        runs.append([p, p + 1])
+                fetched = self._read_checked(name, entry, index, runs)
+                cache.update(((index, p), value) for p, value in fetched.items() if value is not None)
+            return [cache.get((index, p), "") for p in positions]
+
+    def column(self, name, column):
+        """Every value of ``column`` for the cached rows, read as one range and not kept.
+
+        For a single pass over a skipped column (the feedback report export), which through
+        :meth:`cells` would pin the whole column in the cache for the rest of the snapshot.
+        """
+        entry = self._entry(name)
+        header = entry["header"]
+        if column not in header:
+            return [""] * len(entry["rows"])
+        index = header.index(column)
+        if self._fetched(name, index):
+            return [row[index] for row in entry["rows"]]
+        if not entry["rows"]:
+            return []
+        fetched = self._read_checked(name, entry, index, [(0, len(entry["rows"]))])
+        return [fetched[p] or "" for p in range(len(entry["rows"]))]
+
+    def _read_checked(self, name, entry, index, runs):
+        """``{position: value}`` of column ``index`` over ``runs`` of data rows.
+
+        Each range spans the key columns as well; a position whose keys no longer match our
+        cached row maps to None, and the snapshot is expired so the next read reloads it.
+        """
+        keys = self._keys[name]
+        first, last = min(keys + [index]), max(keys + [index])
+        ranges = [
+            absolute_range_name(name, f"{column_letter(first)}{start + 2}:{column_letter(last)}{end + 1}")
+            for start, end in runs
+        ]
+        try:
+            fetched = self._batch_get([name], ranges)
+        except Exception as e:
+            # Same as a failed refresh: the caller shows what it has, the banner says why
+            self._mark_degraded(e)
+            raise
+        values = {}
+        moved = False
+        for (start, end), block in zip(runs, fetched):
+            for offset in range(end - start):
+                position = start + offset
+                cells = pad_row(block[offset] if offset < len(block) else [], last - first + 1)
+                row = entry["rows"][position] if position < len(entry["rows"]) else None
+                if row is None or any(cells[k - first] != row[k] for k in keys):
+                    values[position] = None
+                    moved = True
+                else:
+                    values[position] = cells[index - first]
+        if moved:
+            # Rows were moved or rewritten behind our back (compact.py, a hand edit)
+            entry["expires"] = 0
+        return values
+
+    def _apply_full(self, name, values):
+        previous = self._entries.get(name)
+        header = values[0] if values else []
+        rows = [pad_row(row, len(header)) for row in values[1:]]
+        if previous and previous["header"] == header and rows[:len(previous["rows"])] == previous["rows"]:
+            # Nothing we had was changed, only rows added: keep the generation (and built frame)
+            previous["rows"].extend(rows[len(previous["rows"]):])
+            return
+        self._entries[name] = {
+            "header": header,
+            "rows": rows,
+            "frame": None,
+            "frame_rows": 0,
+            "generation": previous["generation"] + 1 if previous else 0,
+            "expires": 0,
+        }
+
+    def _apply_tail(self, name, header_now, tail):
+        entry = self._entries[name]
+        header, rows = entry["header"], entry["rows"]
+        if not header_now or header_now[0] != header:
+            return False
+        known = rows[-1] if rows else header
+        if not tail or pad_row(tail[0], len(header)) != known:
+            return False
+        rows.extend(pad_row(row, len(header)) for row in tail[1:])
+        return True
+
+    def overwrite(self, name, rows):
+        """Apply rows just written in place (``{position: row}``) to the cached copy.
+
+        Rows only grow within a generation, so the patched copy starts a new one. Other
+        replicas only tail and would never see the change: with a shared store it is
+        announced there, and every replica (this one included) reloads the sheet in full.
+        """
+        with self._lock_for(name):
+            entry = self._entries.get(name)
+            if entry is not None:
+                header = entry["header"]
+                kept = {i for i in range(len(header)) if self._fetched(name, i)}
+                patched = list(entry["rows"])
+                cells = dict(entry.get("cells", {}))
+                for position, row in rows.items():
+                    if position >= len(patched):
+                        continue
+                    row = pad_row([str(v) for v in row], len(header))
+                    patched[position] = [row[i] if i in kept else "" for i in range(len(header))]
+                    # Free text we already hold for that row is now the text just written
+                    cells.update(((i, position), row[i]) for i in range(len(header)) if i not in kept)
+                self._entries[name] = {
+                    **entry,
+                    "rows": patched,
+                    "frame": None,
+                    "frame_rows": 0,
+                    "generation": entry["generation"] + 1,
+                    "cells": cells,
+                }
+        if self.shared is not None:
+            self.shared.mark_rewritten(name)
+
+    def _pending(self, name, width):
+        if self.queue is None:
+            return []
+        return [pad_row([str(v) for v in row], width) for row in self.queue.pending_rows(name)]
+
+    def invalidate(self, name=None):
+        # Keep what we have so the next read can tail instead of downloading everything
+        for key in [name] if name else list(self._entries):
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["expires"] = 0
+            if self.shared is not None:
+                self.shared.invalidate(key)
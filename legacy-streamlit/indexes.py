@@ -0,0 +1,222 @@
+import threading
+
+
+class RegistrationIndex:
+    """Latest registration per team and the ordered team roster of every track.
+
+    Teams is append-only: "🔄 Update Existing Registration" adds a row instead of replacing
+    the old one, so the newest row for a team name wins. The index is built once from the
+    Teams rows and then fed only the rows appended since, so the Judge Portal and the
+    Leaderboard never scan or copy the whole sheet to answer "who is in this track" or
+    "what did this team submit last".
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = (None, 0)
+        self.generation = 0
+        self._reset()
+
+    def _reset(self):
+        self.header = []
+        self.latest_rows = {}
+        self.track_of = {}
+        self.rosters = {}
+        # Row position of each team's latest registration, for reading its free-text columns
+        self.positions = {}
+        # Rows applied so far in this generation: tells consumers the index moved on
+        self.applied = 0
+
+    @property
+    def has_track_column(self):
+        return 'Team Name' in self.header and 'Track' in self.header
+
+    def sync(self, header, rows, generation):
+        with self._lock:
+            seen_generation, seen = self._state
+            if generation != seen_generation:
+                self._reset()
+                self.generation += 1
+                seen = 0
+            self.header = header
+            if 'Team Name' in header:
+                team_idx = header.index('Team Name')
+                track_idx = header.index('Track') if 'Track' in header else None
+                for position, row in enumerate(rows[seen:], seen):
+                    self.positions[row[team_idx]] = position
+                    self._apply(row, row[team_idx], row[track_idx] if track_idx is not None else None)
+            self._state = (generation, len(rows))
+
+    def _apply(self, row, team, track):
+        self.latest_rows[team] = row
+        self.applied += 1
+        if track is None:
+            return
+        old_track = self.track_of.get(team)
+        if old_track != track:
+            if old_track is not None:
+                self.rosters[old_track].pop(team, None)
+            # Dicts keep insertion order, so a roster lists teams by when they joined the track
+            self.rosters.setdefault(track, {})[team] = None
+            self.track_of[team] = track
+
+    def __len__(self):
+        return len(self.latest_rows)
+
+    def latest(self, team):
+        row = self.latest_rows.get(team)
+        return None if row is None else dict(zip(self.header, row))
+
+    def roster(self, track):
+        return list(self.rosters.get(track, ()))
+
+
+class JudgeProgress:
+    """Teams each judge has already scored, for the Judge Portal's progress and next-team jump.
+
+    Built from Scores once and then fed only the rows appended since, like RegistrationIndex.
+    Scores submitted through this process are recorded straight away as well, so a judge's
+    progress moves on the moment they submit instead of when the write-behind queue flushes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = (None, 0)
+        self._scored = {}
+        self._submitted = {}
+
+    def sync(self, header, rows, generation):
+        with self._lock:
+            seen_generation, seen = self._state
+            if generation != seen_generation:
+                self._scored = {}
+                seen = 0
+            if 'Judge Name' in header and 'Team Name' in header:
+                judge_idx, team_idx = header.index('Judge Name'), header.index('Team Name')
+                for row in rows[seen:]:
+                    self._scored.setdefault(row[judge_idx], set()).add(row[team_idx])
+            self._state = (generation, len(rows))
+
+    def record(self, judge, team):
+        with self._lock:
+            self._submitted.setdefault(judge, set()).add(team)
+
+    def scored(self, judge):
+        with self._lock:
+            return self._scored.get(judge, set()) | self._submitted.get(judge, set())
+
+    def progress(self, judge, roster):
+        """``(scored, remaining)`` teams of ``roster``, each in roster order."""
+        done = self.scored(judge)
+        return [t for t in roster if t in done], [t for t in roster if t not in done]
+
+
+class RowIndex:
+    """Position of the newest row for each key, e.g. (Judge Name, Team Name) in Scores.
+
+    Used to turn a re-submission into an in-place update of the row already in the sheet.
+    Like RegistrationIndex it is fed only appended rows, and rebuilt when the snapshot's
+    generation changes.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._lock = threading.Lock()
+        self._state = (None, 0)
+        self.positions = {}
+
+    def sync(self, header, rows, generation):
+        with self._lock:
+            seen_generation, seen = self._state
+            if generation != seen_generation:
+                self.positions = {}
+                seen = 0
+            if all(col in header for col in self.columns):
+                key_idx = [header.index(col) for col in self.columns]
+                for position in range(seen, len(rows)):
+                    row = rows[position]
+                    self.positions[tuple(str(row[i]) for i in key_idx)] = position
+            self._state = (generation, len(rows))
+
+    def locate(self, key):
+        """0-based data row holding ``key`` (a tuple in ``columns`` order), or None."""
+        return self.positions.get(tuple(str(v) for v in key))
+
+
+class FeedbackIndex:
+    """Scores rows ordered newest first, filtered and paged without sorting the frame.
+
+    Holds the row positions of the Scores frame sorted by Timestamp. Scores arrive mostly
+    in time order, so new rows are normally just put in front of the existing order; a
+    reload (new generation) or an out-of-order timestamp re-sorts once. Filters work on
+    the categorical codes of Judge Name / Team Name, so a query never touches the strings.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = (None, 0)
+        self.frame = None
+        self.newest_first = ()
+
+    def sync(self, frame, generation):
+        import numpy as np
+
+        with self._lock:
+            seen_generation, seen = self._state
+            if generation != seen_generation or len(frame) < seen:
+                seen = 0
+            if 'Timestamp' not in frame.columns:
+                order = np.arange(len(frame) - 1, -1, -1)
+            else:
+                stamps = frame['Timestamp'].to_numpy(dtype=str)
+                new = stamps[seen:]
+                in_order = (
+                    seen
+                    and (not len(new) or new[0] >= stamps[self.newest_first[0]])
+                    and (new[1:] >= new[:-1]).all()
+                )
+                if in_order:
+                    order = np.concatenate([np.arange(len(frame) - 1, seen - 1, -1), self.newest_first])
+                else:
+                    # Stable ascending sort reversed: equal timestamps list the later row first
+                    order = np.argsort(stamps, kind="stable")[::-1]
+            self.frame, self.newest_first = frame, order
+            self._state = (generation, len(frame))
+
+    def _matching(self, frame, column, names):
+        import numpy as np
+
+        values = frame[column]
+        categories = values.cat.categories
+        wanted = [categories.get_loc(name) for name in names if name in categories]
+        return np.isin(values.cat.codes.to_numpy(), wanted)
+
+    def values(self, column):
+        """Distinct values of a categorical column that occur in the frame, sorted."""
+        if self.frame is None or column not in self.frame.columns:
+            return []
+        return sorted(str(v) for v in self.frame[column].unique())
+
+    def query(self, judge=None, team=None, track=None, track_of=None, default_track=None):
+        """``(frame, positions)``: the indexed frame and its matching rows, newest first.
+
+        ``track`` keeps the teams that ``track_of`` maps to it (``default_track`` for teams
+        missing from the mapping).
+        """
+        with self._lock:
+            frame, order = self.frame, self.newest_first
+        if frame is None or not len(order):
+            return frame, order
+        mask = None
+        filters = []
+        if judge is not None and 'Judge Name' in frame.columns:
+            filters.append(('Judge Name', [judge]))
+        if team is not None and 'Team Name' in frame.columns:
+            filters.append(('Team Name', [team]))
+        if track is not None and 'Team Name' in frame.columns:
+            teams = [t for t in frame['Team Name'].cat.categories if (track_of or {}).get(t, default_track) == track]
+            filters.append(('Team Name', teams))
+        for column, names in filters:
+            matching = self._matching(frame, column, names)
+            mask = matching if mask is None else mask & matching
+        return frame, order if mask is None else order[mask[order]]
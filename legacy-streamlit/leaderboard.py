@@ -0,0 +1,135 @@
+import threading
+import time
+
+from indexes import FeedbackIndex
+
+SCORE_COLS = [
+    '1. Problem-Solution Fit', '2. Competitor & Market Analysis',
+    '3. Go-to-Market (GTM) Strategy', '4. Innovation / Differentiation',
+    '5. Prototype / MVP Readiness', '6. Revenue Model / Financials',
+    '7. Storytelling & Pitch Delivery'
+]
+
+UNKNOWN_TRACK = "Unknown Track"
+ALL_TRACKS = None
+
+
+class LeaderboardAggregator:
+    """Leaderboard state shared by every session, recomputed only when the data changes.
+
+    Rankings come from :func:`ranking.rank_teams` over the categorical Scores frame: only
+    the latest score of each judge for a team counts (matching the upsert on submit),
+    totals can be normalized per judge and trimmed, and ties are broken by the rubric
+    criteria in order. All tracks are ranked in one pass whenever Scores or a team's track
+    changed; switching the "View Leaderboard For" selectbox then only filters that table.
+    """
+
+    def __init__(self, normalization="none", trim=0.0):
+        self.normalization = normalization
+        self.trim = trim
+        self._lock = threading.Lock()
+        self._state = None
+        self.track_of = {}
+        self.has_team_column = False
+        self.row_totals = []
+        self._table = None
+        self._rankings = {}
+        # Newest-first order of the same Scores frame, for the paged detailed-feedback table
+        self.feedback = FeedbackIndex()
+
+    def sync(self, db):
+        registrations = db.registrations()
+        header, rows, generation = db.snapshot("Scores")
+        state = (registrations.generation, registrations.applied, generation, len(rows))
+        with self._lock:
+            if state == self._state:
+                return
+            self.track_of = registrations.track_of
+            frame = db.read_scores(pending=False)
+            self._rank(frame)
+            self.feedback.sync(frame, generation)
+            self._state = state
+
+    def _rank(self, frame):
+        import numpy as np
+        import pandas as pd
+
+        from ranking import rank_teams
+
+        criteria = [col for col in SCORE_COLS if col in frame.columns]
+        scores = frame[criteria].to_numpy(dtype="float64", na_value=0.0)
+        # Same rule as pd.to_numeric(errors='coerce').fillna(0) on every criterion
+        scores = np.nan_to_num(scores) if criteria else np.zeros((len(frame), 0))
+        self.row_totals = scores.sum(axis=1)
+        self._rankings = {}
+        self.has_team_column = 'Team Name' in frame.columns
+        if not self.has_team_column:
+            self._table = None
+            return
+
+        teams = pd.Categorical(frame['Team Name'])
+        judges = pd.Categorical(frame['Judge Name']) if 'Judge Name' in frame.columns else None
+        team_names = teams.categories.astype(str)
+        order, average, judges_count = rank_teams(
+            scores,
+            teams.codes,
+            team_names,
+            judges=None if judges is None else judges.codes,
+            n_judges=0 if judges is None else len(judges.categories),
+            normalization=self.normalization if judges is not None else "none",
+            trim=self.trim,
+        )
+        names = team_names[order]
+        self._table = pd.DataFrame({
+            'Team Name': names,
+            'Track': [self.track_of.get(team, UNKNOWN_TRACK) for team in names],
+            'Average_Score': average[order],
+            'Judges_Count': judges_count[order],
+        })
+
+    def ranking(self, track=ALL_TRACKS):
+        """Teams sorted by average total score, optionally limited to one track."""
+        import pandas as pd
+
+        with self._lock:
+            cached = self._rankings.get(track)
+            if cached is None:
+                table = self._table
+                if table is None:
+                    table = pd.DataFrame(columns=['Team Name', 'Track', 'Average_Score', 'Judges_Count'])
+                if track is not ALL_TRACKS:
+                    table = table[table['Track'] == track].reset_index(drop=True)
+                cached = self._rankings[track] = table
+            return cached.copy()
+
+
+class LiveFeed:
+    """Throttled change detection for dashboards left open on the Leaderboard.
+
+    Open dashboards poll every few seconds, but they all share this one feed: the Scores
+    change marker is checked at most once per ``min_interval`` however many are open, and
+    the aggregator is only re-synced (pulling Teams too) when the marker actually moved.
+    """
+
+    def __init__(self, aggregator, min_interval=10):
+        self.aggregator = aggregator
+        self.min_interval = min_interval
+        self.marker = None
+        self.scores = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, db):
+        """Return the Scores frame the current rankings were built from, re-syncing if it changed."""
+        with self._lock:
+            now = time.monotonic()
+            if self.scores is not None and now - self._checked < self.min_interval:
+                return self.scores
+            self._checked = now
+            marker = db.change_marker("Scores")
+            if marker != self.marker or self.scores is None:
+                self.aggregator.sync(db)
+                # Queued submissions are left out until flushed so rankings and raw scores agree
+                self.scores = db.read_scores(pending=False)
+                self.marker = marker
+            return self.scores
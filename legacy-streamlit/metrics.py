@@ -0,0 +1,184 @@
+import functools
+import json
+import logging
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+
+logger = logging.getLogger("verdix.metrics")
+
+# Google Sheets API per-minute quotas for a single service account ("per user per project")
+DEFAULT_QUOTA = {"read": 60, "write": 60}
+WRITE_OPS = {"append_row", "append_rows", "update", "batch_update", "clear", "add_worksheet"}
+
+
+class Metrics:
+    """Process-wide timings and counters for the hot paths of the app.
+
+    Every Sheets call is counted and timed by worksheet and operation, cache lookups are
+    tallied as hits or misses, and each rerun records its wall time along with the Sheets
+    calls and cache lookups made on its own thread. Events are also emitted as one JSON
+    object per log record on the ``verdix.metrics`` logger.
+    """
+
+    def __init__(self, quota=None, window=60, history=1000):
+        self.quota = dict(DEFAULT_QUOTA)
+        self.quota.update(quota or {})
+        self.window = window
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset(history)
+
+    def reset(self, history=1000):
+        with self._lock:
+            self.calls = Counter()
+            self.call_seconds = defaultdict(float)
+            self.errors = Counter()
+            self.cache = defaultdict(Counter)
+            self.reruns = deque(maxlen=history)
+            self._recent = deque()
+
+    def _emit(self, event, **fields):
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({"event": event, "ts": round(time.time(), 3), **fields}))
+
+    @contextmanager
+    def sheets_call(self, sheet, op):
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            kind = "write" if op in WRITE_OPS else "read"
+            with self._lock:
+                self.calls[(sheet, op)] += 1
+                self.call_seconds[(sheet, op)] += seconds
+                if error:
+                    self.errors[(sheet, op)] += 1
+                self._recent.append((time.monotonic(), kind))
+            rerun = getattr(self._local, "rerun", None)
+            if rerun is not None:
+                rerun["sheets_calls"] += 1
+                rerun["sheets_seconds"] += seconds
+            self._emit("sheets_call", sheet=sheet, op=op, kind=kind, ms=round(seconds * 1000, 1), error=error)
+
+    def cache_lookup(self, sheet, hit):
+        with self._lock:
+            self.cache[sheet]["hits" if hit else "misses"] += 1
+        rerun = getattr(self._local, "rerun", None)
+        if rerun is not None:
+            rerun["cache_hits" if hit else "cache_misses"] += 1
+
+    @contextmanager
+    def rerun(self, mode=None):
+        stats = {"sheets_calls": 0, "sheets_seconds": 0.0, "cache_hits": 0, "cache_misses": 0}
+        self._local.rerun = stats
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            self._local.rerun = None
+            stats["seconds"] = time.perf_counter() - start
+            stats["mode"] = stats.get("mode", mode)
+            with self._lock:
+                self.reruns.append(stats)
+            self._emit(
+                "rerun",
+                mode=stats["mode"],
+                ms=round(stats["seconds"] * 1000, 1),
+                sheets_calls=stats["sheets_calls"],
+                sheets_ms=round(stats["sheets_seconds"] * 1000, 1),
+                cache_hits=stats["cache_hits"],
+                cache_misses=stats["cache_misses"],
+            )
+
+    def fragment(self, name):
+        """Decorator timing an ``st.fragment`` function's own reruns like full reruns.
+
+        A fragment rerun only executes the fragment, not the script's ``rerun()`` block;
+        inside a full rerun the fragment is already counted and the decorator does nothing.
+        """
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if getattr(self._local, "rerun", None) is not None:
+                    return func(*args, **kwargs)
+                with self.rerun(mode=f"fragment:{name}"):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def annotate(self, **fields):
+        """Attach fields (e.g. the page being rendered) to the current rerun's log record."""
+        rerun = getattr(self._local, "rerun", None)
+        if rerun is not None:
+            rerun.update(fields)
+
+    def quota_used(self):
+        """Sheets requests of each kind made in the last quota window."""
+        cutoff = time.monotonic() - self.window
+        with self._lock:
+            while self._recent and self._recent[0][0] < cutoff:
+                self._recent.popleft()
+            used = Counter(kind for _, kind in self._recent)
+        return {kind: used.get(kind, 0) for kind in self.quota}
+
+    def snapshot(self):
+        used = self.quota_used()
+        with self._lock:
+            calls = [
+                {
+                    "sheet": sheet,
+                    "op": op,
+                    "calls": n,
+                    "errors": self.errors[(sheet, op)],
+                    "avg_ms": round(self.call_seconds[(sheet, op)] / n * 1000, 1),
+                    "total_s": round(self.call_seconds[(sheet, op)], 2),
+                }
+                for (sheet, op), n in sorted(self.calls.items())
+            ]
+            cache = {
+                sheet: {**counts, "hit_rate": round(counts["hits"] / max(1, counts["hits"] + counts["misses"]), 3)}
+                for sheet, counts in sorted(self.cache.items())
+            }
+            reruns = list(self.reruns)
+
+        seconds = sorted(r["seconds"] for r in reruns)
+
+        def pct(p):
+            return round(seconds[min(len(seconds) - 1, int(p / 100 * len(seconds)))] * 1000, 1) if seconds else None
+
+        return {
+            "calls": calls,
+            "cache": cache,
+            "reruns": {
+                "count": len(reruns),
+                "p50_ms": pct(50),
+                "p95_ms": pct(95),
+                "max_ms": round(seconds[-1] * 1000, 1) if seconds else None,
+                "sheets_calls_per_rerun": round(sum(r["sheets_calls"] for r in reruns) / max(1, len(reruns)), 3),
+            },
+            "quota": {
+                kind: {"used": used[kind], "limit": limit, "headroom": limit - used[kind]}
+                for kind, limit in self.quota.items()
+            },
+        }
+
+
+def configure_logging(path=None):
+    """Write metrics events as JSON lines to ``path`` (or stderr), once per process."""
+    if logger.handlers:
+        return
+    handler = logging.FileHandler(path) if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+METRICS = Metrics()
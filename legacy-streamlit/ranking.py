@@ -0,0 +1,114 @@
+"""Leaderboard ranking over the Scores matrix, in a few NumPy passes.
+
+Rows are identified by integer codes (team, judge) plus an ``(n_rows, n_criteria)`` score
+matrix, which is what the categorical Scores frame already holds. Per team we compute:
+
+* the latest score of each judge (a re-submission replaces the earlier one),
+* optionally, each judge's totals normalized against that judge's own scoring habits
+  ("zscore": mean and spread, "median": offset from the judge's median), mapped back onto
+  the overall scale so the numbers still read as points out of 70,
+* a trimmed mean of those totals (``trim`` of the scores cut from each end), and
+* per-criterion totals, used in rubric order to break ties before falling back to the name.
+
+Every step is a sort or a ``bincount`` over all rows at once, so 50k scores rank in a few
+milliseconds.
+"""
+
+import numpy as np
+
+NORMALIZATIONS = ("none", "zscore", "median")
+
+
+def latest_per_key(judges, teams, n_teams):
+    """Row indexes of the last score of each (judge, team) pair, in row order."""
+    key = judges.astype(np.int64) * max(n_teams, 1) + teams
+    # np.unique keeps the first occurrence; on the reversed keys that is the latest row
+    _, first = np.unique(key[::-1], return_index=True)
+    return np.sort(len(key) - 1 - first)
+
+
+def _sorted_groups(values, groups, n_groups):
+    # Rows ordered by group then value, with each group's row count and start offset
+    order = np.lexsort((values, groups))
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    return order, counts, starts
+
+
+def group_medians(values, groups, n_groups):
+    order, counts, starts = _sorted_groups(values, groups, n_groups)
+    ordered = values[order]
+    present = counts > 0
+    lo = (starts + (counts - 1) // 2)[present]
+    hi = (starts + counts // 2)[present]
+    medians = np.zeros(n_groups)
+    medians[present] = (ordered[lo] + ordered[hi]) / 2
+    return medians
+
+
+def normalize(totals, judges, n_judges, method="none"):
+    """Per-judge normalized totals, rescaled to the mean and spread of all ``totals``."""
+    if method not in NORMALIZATIONS:
+        raise ValueError(f"unknown normalization {method!r}; expected one of {NORMALIZATIONS}")
+    if method == "none" or not len(totals):
+        return totals
+    if method == "median":
+        return totals - group_medians(totals, judges, n_judges)[judges] + np.median(totals)
+    counts = np.maximum(np.bincount(judges, minlength=n_judges), 1)
+    mean = np.bincount(judges, weights=totals, minlength=n_judges) / counts
+    square = np.bincount(judges, weights=totals * totals, minlength=n_judges) / counts
+    std = np.sqrt(np.maximum(square - mean * mean, 0))[judges]
+    # A judge who gave everyone the same total (or scored only once) says nothing about spread
+    z = np.divide(totals - mean[judges], std, out=np.zeros_like(totals), where=std > 1e-9)
+    return totals.mean() + z * totals.std()
+
+
+def trimmed_means(values, groups, n_groups, trim=0.0):
+    """Mean of each group's values after cutting ``floor(count * trim)`` from both ends."""
+    counts = np.bincount(groups, minlength=n_groups)
+    if trim <= 0:
+        sums = np.bincount(groups, weights=values, minlength=n_groups)
+        return sums / np.maximum(counts, 1)
+    order, counts, starts = _sorted_groups(values, groups, n_groups)
+    ordered_groups = groups[order]
+    position = np.arange(len(values)) - starts[ordered_groups]
+    cut = np.floor(counts * min(trim, 0.49)).astype(np.int64)
+    keep = (position >= cut[ordered_groups]) & (position < (counts - cut)[ordered_groups])
+    sums = np.bincount(ordered_groups[keep], weights=values[order][keep], minlength=n_groups)
+    return sums / np.maximum(counts - 2 * cut, 1)
+
+
+def rank_teams(scores, teams, team_names, judges=None, n_judges=0, normalization="none", trim=0.0):
+    """Rank teams by their (normalized, trimmed) average total score.
+
+    ``scores`` is the ``(n_rows, n_criteria)`` score matrix, ``teams`` / ``judges`` the row
+    codes into ``team_names`` / the judge categories (``judges=None`` if Scores has no
+    judge column: every row then counts, and no normalization is possible).
+
+    Returns ``(order, average, judges_count)``: the codes of the scored teams, best first,
+    and per-team arrays indexed by code.
+    """
+    n_teams = len(team_names)
+    scores = np.asarray(scores, dtype=np.float64)
+    teams = np.asarray(teams, dtype=np.int64)
+    if judges is not None and len(teams):
+        judges = np.asarray(judges, dtype=np.int64)
+        latest = latest_per_key(judges, teams, n_teams)
+        scores, teams, judges = scores[latest], teams[latest], judges[latest]
+
+    totals = scores.sum(axis=1)
+    if judges is not None:
+        totals = normalize(totals, judges, n_judges, normalization)
+    average = np.round(trimmed_means(totals, teams, n_teams, trim), 2)
+    # After the dedupe each row is one judge, so the row count is the number of judges
+    judges_count = np.bincount(teams, minlength=n_teams)
+    criteria = np.stack(
+        [np.bincount(teams, weights=scores[:, c], minlength=n_teams) for c in range(scores.shape[1])]
+    ) if scores.shape[1] else np.zeros((0, n_teams))
+
+    scored = np.flatnonzero(judges_count)
+    name_rank = np.argsort(np.argsort(np.asarray(team_names, dtype=object)[scored], kind="stable"), kind="stable")
+    # lexsort's last key is the primary one: average, then criterion 1, 2, ... then the name
+    keys = [name_rank] + [-criteria[c, scored] for c in reversed(range(len(criteria)))] + [-average[scored]]
+    order = scored[np.lexsort(keys)]
+    return order, average, judges_count
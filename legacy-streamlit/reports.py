@@ -0,0 +1,199 @@
+"""Per-team feedback reports for organizers to send out after the event.
+
+Every team gets one file with its standing in its track, the scores each judge gave it on
+the seven rubric criteria (the latest score of each judge, the one the leaderboard counts),
+the per-criterion averages and all of the judges' comments. Reports are produced by a chain
+of generators over the categorical Scores frame: rows are grouped by their Team Name code
+in one sort, and each report is rendered and written into the zip before the next one is
+built. The Feedback / Comments column is read once, as a single range that isn't kept in
+the sheet cache, so a 1,000-team export holds that one list of comments and one rendered
+file at a time, never a DataFrame copy per team.
+"""
+
+import csv
+import html
+import io
+import itertools
+import re
+import zipfile
+
+from leaderboard import SCORE_COLS, UNKNOWN_TRACK
+
+FORMATS = ("csv", "html")
+COMMENTS = "Feedback / Comments"
+
+
+def track_standings(table):
+    """``team -> (rank in track, teams in track, average, judges)`` from a leaderboard table."""
+    standings = {}
+    place = {}
+    sizes = table['Track'].value_counts().to_dict() if len(table) else {}
+    for team, track, average, judges in table[['Team Name', 'Track', 'Average_Score', 'Judges_Count']].itertuples(index=False):
+        place[track] = place.get(track, 0) + 1
+        standings[team] = (place[track], sizes[track], float(average), int(judges))
+    return standings
+
+
+def team_groups(frame):
+    """``(team, positions)`` per team in Scores, keeping only each judge's latest score.
+
+    ``positions`` are row positions in ``frame`` (and so in the Scores snapshot), in row order.
+    """
+    import numpy as np
+
+    from ranking import latest_per_key
+
+    if 'Team Name' not in frame.columns or not len(frame):
+        return
+    teams = frame['Team Name'].cat
+    codes = teams.codes.to_numpy().astype(np.int64)
+    rows = np.arange(len(frame))
+    if 'Judge Name' in frame.columns:
+        judges = frame['Judge Name'].cat.codes.to_numpy().astype(np.int64)
+        rows = latest_per_key(judges, codes, len(teams.categories))
+    rows = rows[codes[rows] >= 0]
+    order = rows[np.argsort(codes[rows], kind="stable")]
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    for start, stop in zip(itertools.chain([0], bounds), itertools.chain(bounds, [len(order)])):
+        yield str(teams.categories[codes[order[start]]]), order[start:stop]
+
+
+def _number(value):
+    value = round(float(value), 2)
+    return int(value) if value.is_integer() else value
+
+
+def team_reports(frame, comments, standings, track_of, chunk=100):
+    """Yield one report dict per scored team.
+
+    ``comments(positions)`` returns the Feedback / Comments of those Scores rows; it is
+    called once per ``chunk`` teams.
+    """
+    import numpy as np
+
+    criteria = [col for col in SCORE_COLS if col in frame.columns]
+    groups = team_groups(frame)
+    while True:
+        batch = list(itertools.islice(groups, chunk))
+        if not batch:
+            return
+        positions = np.concatenate([group for _, group in batch])
+        notes = iter(comments(positions.tolist()))
+        rows = frame.iloc[positions]
+        scores = np.nan_to_num(rows[criteria].to_numpy(dtype="float64", na_value=0.0)) if criteria else np.zeros((len(rows), 0))
+        stamps, names = ([str(v) for v in rows[col]] if col in rows.columns else [""] * len(rows) for col in ('Timestamp', 'Judge Name'))
+        offset = 0
+        for team, group in batch:
+            rank, of, average, judges = standings.get(team, (None, None, None, len(group)))
+            team_scores = scores[offset:offset + len(group)]
+            entries = []
+            for i, values in enumerate(team_scores, offset):
+                entry = {'Timestamp': stamps[i], 'Judge Name': names[i]}
+                entry.update(zip(criteria, map(_number, values)))
+                entry['Total Score'] = _number(values.sum())
+                entry[COMMENTS] = str(next(notes) or "")
+                entries.append(entry)
+            offset += len(group)
+            yield {
+                'team': team,
+                'track': track_of.get(team, UNKNOWN_TRACK),
+                'rank': rank,
+                'of': of,
+                'average': average,
+                'judges': judges,
+                'criteria': criteria,
+                'criteria_average': {col: _number(team_scores[:, i].mean()) for i, col in enumerate(criteria)},
+                'rows': entries,
+            }
+
+
+def _summary(report):
+    rank = f"{report['rank']} of {report['of']}" if report['rank'] else "Not ranked"
+    average = "" if report['average'] is None else report['average']
+    return [
+        ("Team Name", report['team']),
+        ("Track", report['track']),
+        ("Rank in Track", rank),
+        ("Average Score (out of 70)", average),
+        ("Judges", report['judges']),
+    ]
+
+
+def report_csv(report):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerows(_summary(report))
+    writer.writerow([])
+    columns = ['Timestamp', 'Judge Name'] + report['criteria'] + ['Total Score', COMMENTS]
+    writer.writerow(columns)
+    writer.writerows([row[col] for col in columns] for row in report['rows'])
+    writer.writerow(["", "Average"] + [report['criteria_average'][col] for col in report['criteria']])
+    return out.getvalue()
+
+
+def report_html(report):
+    e = lambda value: html.escape(str(value))
+    summary = "".join(f"<tr><th>{e(label)}</th><td>{e(value)}</td></tr>" for label, value in _summary(report))
+    breakdown = "".join(
+        f"<tr><th>{e(col)}</th><td>{e(report['criteria_average'][col])}</td>"
+        + "".join(f"<td>{e(row[col])}</td>" for row in report['rows']) + "</tr>"
+        for col in report['criteria']
+    )
+    judges = "".join(f"<th>{e(row['Judge Name'])}</th>" for row in report['rows'])
+    totals = "".join(f"<td><b>{e(row['Total Score'])}</b></td>" for row in report['rows'])
+    notes = "".join(
+        f"<li><b>{e(row['Judge Name'])}</b>: {e(row[COMMENTS])}</li>" for row in report['rows'] if row[COMMENTS]
+    ) or "<li>No written comments.</li>"
+    return (
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{e(report['team'])} – Verdix Feedback</title>"
+        "<style>body{font-family:sans-serif;max-width:900px;margin:2rem auto;color:#262730}"
+        "h1{color:#BF1A1A}table{border-collapse:collapse;margin-bottom:1.5rem}"
+        "th,td{border:1px solid #ddd;padding:6px 10px;text-align:left}</style></head><body>"
+        f"<h1>{e(report['team'])}</h1><table>{summary}</table>"
+        f"<h2>Score Breakdown</h2><table><tr><th>Criterion</th><th>Average</th>{judges}</tr>{breakdown}"
+        f"<tr><th>Total</th><td></td>{totals}</tr></table>"
+        f"<h2>Judges' Feedback</h2><ul>{notes}</ul></body></html>"
+    )
+
+
+def _filename(name):
+    return re.sub(r"[^\w\- ]+", "_", name).strip() or "_"
+
+
+def write_zip(reports, fmt, fileobj):
+    """Write each report as ``<Track>/<Team>.<fmt>`` into a zip; returns the number written."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown report format {fmt!r}; expected one of {FORMATS}")
+    render = report_csv if fmt == "csv" else report_html
+    used = set()
+    count = 0
+    with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as archive:
+        for report in reports:
+            base = f"{_filename(report['track'])}/{_filename(report['team'])}"
+            path, copy = f"{base}.{fmt}", 1
+            # Two team names can clean up to the same file name
+            while path.casefold() in used:
+                copy += 1
+                path = f"{base} ({copy}).{fmt}"
+            used.add(path.casefold())
+            archive.writestr(path, render(report))
+            count += 1
+    return count
+
+
+def export_reports(db, aggregator, fmt="csv"):
+    """Zip of every scored team's feedback report, as ``(bytes, number of reports)``."""
+    aggregator.sync(db)
+    frame = aggregator.feedback.frame
+    if frame is None:
+        frame = db.read_scores(pending=False)
+    notes = db.column("Scores", COMMENTS)
+    reports = team_reports(
+        frame,
+        lambda positions: [notes[p] if p < len(notes) else "" for p in positions],
+        track_standings(aggregator.ranking()),
+        aggregator.track_of,
+    )
+    out = io.BytesIO()
+    count = write_zip(reports, fmt, out)
+    return out.getvalue(), count
@@ -0,0 +1,131 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from metrics import METRICS, WRITE_OPS
+
+
+class SheetsUnavailable(Exception):
+    """Google Sheets is not being called right now; serve cached data instead."""
+
+
+class CircuitOpen(SheetsUnavailable):
+    pass
+
+
+class RateLimited(SheetsUnavailable):
+    pass
+
+
+class TokenBucket:
+    """Client-side limiter: ``per_minute`` calls on average, bursts of up to ``burst``."""
+
+    def __init__(self, per_minute, burst=None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst or per_minute
+        self.tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """Take one token, waiting for the bucket to refill; False if that takes longer than ``timeout``."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def available(self):
+        with self._lock:
+            self._refill()
+            return int(self.tokens)
+
+
+class CircuitBreaker:
+    """Stops calling Sheets after ``failure_threshold`` failures in a row.
+
+    While open, calls fail fast with :class:`CircuitOpen`. After ``reset_timeout`` seconds one
+    trial call is let through (half-open); its success closes the circuit again.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self._lock = threading.Lock()
+
+    def before(self):
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                return
+            raise CircuitOpen(f"Google Sheets paused after repeated errors ({self.last_error})")
+
+    def abort(self):
+        # The trial call never reached Sheets; let the next caller make it instead
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+    def success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self.last_error = None
+
+    def failure(self, error):
+        with self._lock:
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+class SheetsGuard:
+    """Rate limiting, circuit breaking and metrics wrapped around every gspread call."""
+
+    def __init__(self, reads_per_minute=60, writes_per_minute=60, failure_threshold=3, reset_timeout=30, max_wait=10):
+        self.buckets = {"read": TokenBucket(reads_per_minute), "write": TokenBucket(writes_per_minute)}
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        # Longest a caller will queue for a token before giving up and using cached data
+        self.max_wait = max_wait
+
+    @contextmanager
+    def call(self, sheet, op):
+        self.breaker.before()
+        kind = "write" if op in WRITE_OPS else "read"
+        if not self.buckets[kind].acquire(timeout=self.max_wait):
+            self.breaker.abort()
+            raise RateLimited(f"Sheets {kind} budget exhausted for the next {self.max_wait}s")
+        try:
+            with METRICS.sheets_call(sheet, op):
+                yield
+        except Exception as e:
+            self.breaker.failure(e)
+            raise
+        self.breaker.success()
+
+    def status(self):
+        return {
+            "circuit": self.breaker.state,
+            "last_error": self.breaker.last_error,
+            "read_tokens": self.buckets["read"].available(),
+            "write_tokens": self.buckets["write"].available(),
+        }
@@ -0,0 +1,145 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+
+
+class SharedSnapshotStore:
+    """Worksheet snapshots shared by every Streamlit replica through a common directory.
+
+    ``st.cache_resource`` only lives inside one server process, so with several replicas
+    behind a load balancer each one used to refresh Teams and Scores on its own. With a
+    store configured, a replica first looks here: a snapshot another replica published
+    within the TTL is adopted as-is. When the snapshot is stale, only the replica holding
+    the refresh lease goes to Google Sheets and publishes the result; the others wait for
+    the new version instead of making the same request.
+
+    Per sheet there is a data file (header, rows, version, generation) and a small meta
+    file (version, generation, expires_at), both replaced atomically. ``version`` goes up
+    on every publish; ``generation`` only when the rows are not an extension of the
+    previous snapshot, mirroring the contract of :meth:`Storage.snapshot`. A third small
+    file holds a token that changes whenever a replica overwrote rows in place; snapshots
+    read under an older token are not adopted, and tailing gives way to a full reload.
+    """
+
+    def __init__(self, path, lease_seconds=30, wait_seconds=10, poll_interval=0.1):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_interval = poll_interval
+        self.owner = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        # Threads of this process share the lease; only one of them refreshes at a time
+        self._lease_lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, name, kind):
+        return os.path.join(self.path, f"{name}.{kind}.json")
+
+    def _read(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            # Missing, or a partial file from a crashed writer on a filesystem without atomic rename
+            return None
+
+    def _write(self, path, data):
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+    # --- Snapshots ---
+    def meta(self, name):
+        return self._read(self._file(name, "meta"))
+
+    def load(self, name):
+        return self._read(self._file(name, "data"))
+
+    def fresh(self, meta):
+        return meta is not None and time.time() < meta["expires_at"]
+
+    def publish(self, name, header, rows, extends, ttl, rewrite=None):
+        """Store a refreshed snapshot. ``extends`` is the version these rows append to, if any.
+
+        ``rewrite`` is the :meth:`rewrite_token` the rows were read under.
+        """
+        meta = self.meta(name) or {"version": 0, "generation": 0}
+        generation = meta["generation"] if extends == meta["version"] else meta["generation"] + 1
+        meta = {"version": meta["version"] + 1, "generation": generation, "expires_at": time.time() + ttl, "rewrite": rewrite}
+        # Data first, so a reader that sees the new meta always finds rows at least that new
+        self._write(self._file(name, "data"), {**meta, "header": header, "rows": rows})
+        self._write(self._file(name, "meta"), meta)
+        return meta
+
+    def invalidate(self, name):
+        # Keep the rows (the next refresh can still tail them) but make every replica refetch
+        meta = self.meta(name)
+        if meta is not None:
+            self._write(self._file(name, "meta"), {**meta, "expires_at": 0})
+
+    def rewrite_token(self, name):
+        """Changes whenever a replica overwrote rows of ``name`` in place; None if none ever did."""
+        data = self._read(self._file(name, "rewrite"))
+        return data["token"] if data else None
+
+    def mark_rewritten(self, name):
+        # A fresh token every time, so concurrent rewrites can't cancel each other out
+        self._write(self._file(name, "rewrite"), {"token": uuid.uuid4().hex})
+        self.invalidate(name)
+
+    # --- Refresh lease ---
+    def acquire(self):
+        """Try to become the replica that refreshes from Sheets; never blocks."""
+        if not self._lease_lock.acquire(blocking=False):
+            return False
+        if self._create_lease():
+            return True
+        lease = self._read(self._file("refresh", "lease"))
+        if lease is None or time.time() >= lease["expires_at"]:
+            # The holder died mid-refresh (or left a torn file); break its lease and retry once
+            try:
+                os.remove(self._file("refresh", "lease"))
+            except FileNotFoundError:
+                pass
+            if self._create_lease():
+                return True
+        self._lease_lock.release()
+        return False
+
+    def _create_lease(self):
+        try:
+            fd = os.open(self._file("refresh", "lease"), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as f:
+            json.dump({"owner": self.owner, "expires_at": time.time() + self.lease_seconds}, f)
+        return True
+
+    def release(self):
+        lease = self._read(self._file("refresh", "lease"))
+        if lease is not None and lease.get("owner") == self.owner:
+            try:
+                os.remove(self._file("refresh", "lease"))
+            except FileNotFoundError:
+                pass
+        self._lease_lock.release()
+
+    def wait_for(self, names):
+        """Wait for the lease holder to publish ``names``; returns the ones still stale."""
+        deadline = time.monotonic() + self.wait_seconds
+        pending = list(names)
+        while pending and time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            pending = [name for name in pending if not self.fresh(self.meta(name))]
+        return pending
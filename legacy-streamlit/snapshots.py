@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import pyarrow as pa
+import pyarrow.ipc
+
+logger = logging.getLogger("verdix.snapshots")
+
+
+class ColumnarSnapshots:
+    """Parsed worksheets (and derived tables) saved as Arrow IPC files in a local directory.
+
+    One ``<name>.arrow`` file per sheet, every column stored as strings exactly as the
+    cache holds them, with the original header and save time in the schema metadata. Files
+    are replaced atomically and read back through a memory map, so loading one after a
+    restart costs a disk read instead of a Sheets download.
+
+    The cache never downloads the free-text columns (Value Proposition, Feedback /
+    Comments), so they are left out of the files rather than saved blank; loading puts
+    them back as ``""``. The feedback report export has the judges' comments.
+
+    They are ordinary Feather v2 files, so after the event ``pandas.read_feather(path)``
+    (or ``pyarrow.feather.read_table``) opens Teams, Scores, Config and ``leaderboard.arrow``
+    for offline analysis.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, name):
+        return os.path.join(self.path, f"{name}.arrow")
+
+    def _write(self, name, table):
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix=".tmp-")
+        os.close(fd)
+        try:
+            with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp, self._file(name))
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def save(self, name, header, rows, omit=()):
+        """Save a sheet; the columns at the ``omit`` indexes are not stored."""
+        names = list(header)
+        if len(set(names)) != len(names) or not all(names):
+            # A hand-edited header can repeat or leave out names; number the columns instead
+            names = [f"{i}:{col}" for i, col in enumerate(header)]
+        kept = [i for i in range(len(header)) if i not in omit]
+        columns = {
+            names[i]: pa.array([str(row[i]) if i < len(row) else "" for row in rows], pa.string())
+            for i in kept
+        }
+        metadata = {"verdix": json.dumps({
+            "sheet": name, "header": header, "columns": kept, "rows": len(rows), "saved_at": time.time(),
+        })}
+        self._write(name, pa.table(columns, metadata=metadata))
+
+    def save_frame(self, name, frame):
+        self._write(name, pa.Table.from_pandas(frame, preserve_index=False))
+
+    def load(self, name):
+        """``(header, rows, saved_at)`` from the last snapshot of ``name``, or None."""
+        try:
+            with pa.memory_map(self._file(name)) as source:
+                table = pa.ipc.open_file(source).read_all()
+                meta = json.loads((table.schema.metadata or {}).get(b"verdix", b"{}"))
+                if "header" not in meta:
+                    return None
+                stored = dict(zip(meta.get("columns", range(len(meta["header"]))), table.columns))
+                blank = [""] * table.num_rows
+                columns = [stored[i].to_pylist() if i in stored else blank for i in range(len(meta["header"]))]
+                rows = [list(row) for row in zip(*columns)]
+        except FileNotFoundError:
+            return None
+        except (pa.ArrowInvalid, OSError, ValueError) as e:
+            logger.warning("ignoring unreadable snapshot %s: %s", name, e)
+            return None
+        return meta["header"], rows, meta["saved_at"]
+
+
+class SnapshotWriter:
+    """Daemon thread that snapshots the cached sheets every ``interval`` seconds.
+
+    A sheet is written again only when its rows changed since the last save; the
+    ``derived`` tables (name -> callable returning a DataFrame, e.g. the leaderboard) are
+    refreshed in the same round whenever any sheet was.
+    """
+
+    def __init__(self, snapshots, cache, interval=60, derived=None):
+        self.snapshots = snapshots
+        self.cache = cache
+        self.interval = interval
+        self.derived = dict(derived or {})
+        self.last_error = None
+        self._saved = {}
+        self._worker = threading.Thread(target=self._run, name="verdix-snapshots", daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.save()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.warning("snapshot failed: %s", self.last_error)
+
+    def save(self):
+        changed = False
+        for name in list(self.cache._entries):
+            with self.cache._lock_for(name):
+                entry = self.cache._entries[name]
+                state = (id(entry), entry["generation"], len(entry["rows"]))
+                if self._saved.get(name) == state:
+                    continue
+                header, rows = list(entry["header"]), list(entry["rows"])
+            # Skipped free-text columns are blank in the cache; don't save them as if they were
+            omit = {i for i in range(len(header)) if not self.cache._fetched(name, i)}
+            self.snapshots.save(name, header, rows, omit)
+            self._saved[name] = state
+            changed = True
+        if changed:
+            for name, build in self.derived.items():
+                frame = build()
+                if frame is not None:
+                    self.snapshots.save_frame(name, frame)
+        return changed
@@ -0,0 +1,404 @@
+import sqlite3
+import threading
+
+from datastore import SheetCache, pad_row
+from indexes import JudgeProgress, RegistrationIndex
+from leaderboard import SCORE_COLS
+from writequeue import SubmissionQueue
+
+# Column layout of each worksheet, in the order the app writes rows (Col A onwards)
+HEADERS = {
+    "Config": ["Track Name"],
+    "Teams": [
+        "Timestamp", "Submission Type", "Team Name", "Track", "Team Leaders (Names)",
+        "Student ID / IC No", "University / Institution", "Faculty / School",
+        "Academic Programme", "Industry / Tags", "Stage of Startup", "Value Proposition",
+        "Pitch Video Link", "Pitch Deck / Logo Link",
+    ],
+    "Scores": [
+        "Timestamp", "Judge Name", "Team Name",
+        "1. Problem-Solution Fit", "2. Competitor & Market Analysis",
+        "3. Go-to-Market (GTM) Strategy", "4. Innovation / Differentiation",
+        "5. Prototype / MVP Readiness", "6. Revenue Model / Financials",
+        "7. Storytelling & Pitch Delivery", "Feedback / Comments",
+    ],
+}
+
+# Registration fields that can't be left blank, as (column, label used in error messages)
+REQUIRED_FIELDS = [
+    ("Team Name", "Startup / Team Name"), ("Track", "Track"), ("Team Leaders (Names)", "Team Leaders"),
+    ("Student ID / IC No", "Student ID / IC No"), ("University / Institution", "University / Institution"),
+    ("Faculty / School", "Faculty / School"), ("Academic Programme", "Academic Programme"),
+    ("Industry / Tags", "Industry / Tags"), ("Stage of Startup", "Stage of Startup"),
+    ("Value Proposition", "Value Proposition"), ("Pitch Deck / Logo Link", "Pitch Deck / Logo Link"),
+]
+
+
+def missing_fields(registration):
+    """Labels of the required fields left blank in a Teams ``{column: value}`` record."""
+    return [label for col, label in REQUIRED_FIELDS if not str(registration.get(col, "")).strip()]
+
+
+# Sheets written with upserts: a row whose key columns match an existing row replaces it
+UPSERT_KEYS = {"Scores": ["Judge Name", "Team Name"]}
+
+# Long free-text columns: not downloaded with the rest of the sheet and left out of frames;
+# read them with Storage.text() for just the rows on screen
+FREE_TEXT = {"Teams": ["Value Proposition"], "Scores": ["Feedback / Comments"]}
+
+# Columns that identify a row, checked whenever free text is read for a cached row position
+ROW_KEYS = {"Teams": ["Team Name"], "Scores": UPSERT_KEYS["Scores"]}
+
+# Repeated labels are stored as categoricals in frames
+CATEGORY_COLS = ["Track", "Team Name", "Judge Name"]
+
+
+def _score_column(values):
+    import pandas as pd
+
+    numbers = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+    present = numbers.dropna()
+    if ((present % 1) == 0).all() and present.between(-128, 127).all():
+        # The 1-10 rubric fits in a nullable int8; blank cells stay <NA>
+        return numbers.astype("Int8")
+    return numbers.astype("float32")
+
+
+def typed_frame(header, rows, drop=()):
+    """DataFrame of ``rows`` with categorical labels and compact score columns."""
+    import pandas as pd
+
+    keep = [i for i, col in enumerate(header) if col not in drop]
+    data = {}
+    for i in keep:
+        col = header[i]
+        values = [row[i] for row in rows]
+        if col in CATEGORY_COLS:
+            data[col] = pd.Categorical(values)
+        elif col in SCORE_COLS:
+            data[col] = _score_column(values)
+        else:
+            data[col] = pd.Series(values, dtype=object)
+    return pd.DataFrame(data, columns=[header[i] for i in keep])
+
+
+def concat_frames(frame, new):
+    """``pd.concat`` that keeps categorical columns categorical when their categories differ."""
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+
+    if new.empty:
+        return frame
+    combined = pd.concat([frame, new], ignore_index=True)
+    for col in frame.columns:
+        if isinstance(frame[col].dtype, pd.CategoricalDtype) and isinstance(new[col].dtype, pd.CategoricalDtype):
+            combined[col] = union_categoricals([frame[col], new[col]], ignore_order=True)
+        elif col in SCORE_COLS and frame[col].dtype != new[col].dtype:
+            combined[col] = combined[col].astype("float32")
+    return combined
+
+
+def build_frame(entry, drop=()):
+    """Return the entry's DataFrame, converting only rows added since it was last built."""
+    frame, header, rows = entry["frame"], entry["header"], entry["rows"]
+    if frame is None:
+        frame = typed_frame(header, rows, drop)
+    elif entry["frame_rows"] < len(rows):
+        frame = concat_frames(frame, typed_frame(header, rows[entry["frame_rows"]:], drop))
+    entry["frame"], entry["frame_rows"] = frame, len(rows)
+    return frame
+
+
+class Storage:
+    """The data operations the Verdix app performs, independent of where the data lives.
+
+    Backends expose each worksheet as ``(header, rows, generation)`` through ``_entry()``
+    and implement ``submit()``; the app-level operations below are built on those.
+    """
+
+    # Rate limiter / circuit breaker of the Sheets client, if the backend talks to Sheets
+    guard = None
+
+    def __init__(self):
+        self._registrations = RegistrationIndex()
+        self._judge_progress = JudgeProgress()
+
+    def prefetch(self, names):
+        pass
+
+    def _entry(self, name):
+        raise NotImplementedError
+
+    def _lock_for(self, name):
+        raise NotImplementedError
+
+    def _pending(self, name, width):
+        return []
+
+    def submit(self, name, row, key=None):
+        raise NotImplementedError
+
+    def submit_many(self, name, rows):
+        for row in rows:
+            self.submit(name, row)
+
+    @property
+    def degraded(self):
+        """``{"since", "error"}`` while reads are served from the last good snapshot, else None."""
+        return None
+
+    def snapshot(self, name):
+        """Raw ``(header, rows, generation)`` for consumers that track rows incrementally.
+
+        ``rows`` only ever grows while ``generation`` stays the same; a new generation means
+        the sheet was reloaded from scratch and anything derived from it must be rebuilt.
+        Rows still waiting to be written are not included.
+        """
+        entry = self._entry(name)
+        return entry["header"], entry["rows"], entry["generation"]
+
+    def change_marker(self, name):
+        """Cheap value that changes whenever rows are added to (or reloaded into) ``name``.
+
+        Goes back to the backend no more often than the sheet's cache allows; for Sheets
+        that is a ranged read of the header and the rows from the last one we have on. Only
+        a hand edit, or another replica's in-place overwrite, makes it a full read.
+        """
+        entry = self._entry(name)
+        return entry["generation"], len(entry["rows"])
+
+    def _superseded(self, name, header, rows, extra):
+        """Which ``rows`` a pending upsert in ``extra`` is about to overwrite."""
+        columns = UPSERT_KEYS.get(name)
+        if not extra or not columns or not all(col in header for col in columns):
+            return None
+        # Pending rows are laid out like HEADERS; the sheet's own header may differ
+        key_idx = [header.index(col) for col in columns]
+        pending_idx = [HEADERS[name].index(col) for col in columns]
+        pending_keys = {tuple(str(row[i]) for i in pending_idx) for row in extra}
+        return [tuple(str(row[i]) for i in key_idx) in pending_keys for row in rows]
+
+    def records(self, name):
+        entry = self._entry(name)
+        header = entry["header"]
+        extra = self._pending(name, len(header))
+        superseded = self._superseded(name, header, entry["rows"], extra) or [False] * len(entry["rows"])
+        rows = [row for row, gone in zip(entry["rows"], superseded) if not gone] + extra
+        return [dict(zip(header, row)) for row in rows]
+
+    def frame(self, name, pending=True):
+        """Typed DataFrame of ``name`` without its FREE_TEXT columns."""
+        entry = self._entry(name)
+        drop = FREE_TEXT.get(name, ())
+        with self._lock_for(name):
+            frame = build_frame(entry, drop)
+        header = entry["header"]
+        extra = self._pending(name, len(header)) if pending else []
+        if extra:
+            superseded = self._superseded(name, header, entry["rows"][:len(frame)], extra)
+            if superseded:
+                frame = frame[[not gone for gone in superseded]]
+            frame = concat_frames(frame, typed_frame(header, extra, drop))
+        return frame
+
+    def text(self, name, column, positions):
+        """Values of a (free-text) ``column`` for the rows at ``positions`` of the snapshot."""
+        entry = self._entry(name)
+        header = entry["header"]
+        if column not in header:
+            return [""] * len(positions)
+        index = header.index(column)
+        return [entry["rows"][p][index] for p in positions]
+
+    def column(self, name, column):
+        """Every value of a (free-text) ``column``, in snapshot row order, for one-off passes."""
+        entry = self._entry(name)
+        header = entry["header"]
+        if column not in header:
+            return [""] * len(entry["rows"])
+        index = header.index(column)
+        return [row[index] for row in entry["rows"]]
+
+    # --- App-level operations ---
+    def list_tracks(self):
+        # Uses Track Name to prevent KeyErrors
+        return [str(row["Track Name"]) for row in self.records("Config") if row.get("Track Name")]
+
+    def registrations(self):
+        """The shared RegistrationIndex, brought up to date with any newly appended Teams rows."""
+        self._registrations.sync(*self.snapshot("Teams"))
+        return self._registrations
+
+    def append_registration(self, row):
+        self.submit("Teams", row)
+
+    def team_names(self):
+        """Every registered team name, including registrations still waiting to be written."""
+        header = HEADERS["Teams"]
+        pending = self._pending("Teams", len(self._entry("Teams")["header"]))
+        return set(self.registrations().latest_rows) | {str(row[header.index("Team Name")]) for row in pending}
+
+    def upsert_score(self, row):
+        """Save a judge's score for a team, replacing that judge's earlier score for it."""
+        key = {col: row[HEADERS["Scores"].index(col)] for col in UPSERT_KEYS["Scores"]}
+        self.submit("Scores", row, key=key)
+        self._judge_progress.record(str(key["Judge Name"]), str(key["Team Name"]))
+
+    def judge_progress(self):
+        """The shared JudgeProgress, brought up to date with any newly appended Scores rows."""
+        self._judge_progress.sync(*self.snapshot("Scores"))
+        return self._judge_progress
+
+    def read_scores(self, pending=True):
+        return self.frame("Scores", pending=pending)
+
+
+class SheetsStorage(Storage):
+    """Google Sheets backend: cached, batched reads and write-behind appends."""
+
+    def __init__(self, sh, ttl=None, queue_path="verdix_queue.db", shared=None, guard=None, snapshots=None, snapshot_interval=60):
+        super().__init__()
+        skip = {name: (HEADERS[name], columns, ROW_KEYS[name]) for name, columns in FREE_TEXT.items()}
+        self.cache = SheetCache(sh, ttl, shared, guard, skip=skip, snapshots=snapshots, upserted=UPSERT_KEYS)
+        self.queue = SubmissionQueue(self.cache, queue_path)
+        self.guard = self.cache.guard
+        # Saves the cached sheets for the next warm start (and for analysis after the event)
+        self.snapshot_writer = None
+        if snapshots is not None:
+            from snapshots import SnapshotWriter
+            self.snapshot_writer = SnapshotWriter(snapshots, self.cache, snapshot_interval)
+
+    @property
+    def degraded(self):
+        return self.cache.degraded
+
+    def prefetch(self, names):
+        self.cache.prefetch(names)
+
+    def _entry(self, name):
+        return self.cache._entry(name)
+
+    def _lock_for(self, name):
+        return self.cache._lock_for(name)
+
+    def _pending(self, name, width):
+        return self.cache._pending(name, width)
+
+    def text(self, name, column, positions):
+        return self.cache.cells(name, column, positions)
+
+    def column(self, name, column):
+        return self.cache.column(name, column)
+
+    def submit(self, name, row, key=None):
+        self.queue.submit(name, row, key)
+
+    def submit_many(self, name, rows):
+        self.queue.submit_many(name, rows)
+
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class SQLiteStorage(Storage):
+    """Embedded backend: every read and write is local, so it works offline and under load tests.
+
+    Each worksheet is a table with the same column headers. Reads pick up rows by rowid,
+    so rows written by another process on the same file still show up; an upsert that
+    overwrites a row bumps the sheet's revision, which makes every reader reload it in
+    full under a new generation. With ``mirror`` set
+    to a gspread spreadsheet, every write is also queued for a background append to it, so
+    organizers keep a live copy of the data in Verdix_DB.
+    """
+
+    def __init__(self, path, tracks=(), mirror=None, guard=None):
+        super().__init__()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        self._entries = {}
+        for name, header in HEADERS.items():
+            columns = ", ".join(f"{_quote(col)} TEXT" for col in header)
+            self._db.execute(f"CREATE TABLE IF NOT EXISTS {_quote(name)} ({columns})")
+            self._entries[name] = {
+                "header": list(header), "rows": [], "last_rowid": 0,
+                "frame": None, "frame_rows": 0, "generation": 0, "revision": 0,
+            }
+        self._db.execute("CREATE TABLE IF NOT EXISTS _revisions (sheet TEXT PRIMARY KEY, revision INTEGER NOT NULL)")
+        if tracks and not self._db.execute('SELECT 1 FROM "Config" LIMIT 1').fetchone():
+            self._db.executemany('INSERT INTO "Config" VALUES (?)', [(str(t),) for t in tracks])
+
+        # The mirror reuses the write-behind queue, journaled in the same database file
+        self.queue = None
+        if mirror is not None:
+            self.queue = SubmissionQueue(SheetCache(mirror, guard=guard), path)
+            self.guard = self.queue.cache.guard
+
+    def _lock_for(self, name):
+        return self._lock
+
+    def _entry(self, name):
+        with self._lock:
+            entry = self._entries[name]
+            found = self._db.execute("SELECT revision FROM _revisions WHERE sheet = ?", (name,)).fetchone()
+            revision = found[0] if found else 0
+            if revision != entry["revision"]:
+                # Rows were overwritten in place; start over so consumers rebuild
+                entry.update(rows=[], last_rowid=0, frame=None, frame_rows=0, revision=revision)
+                entry["generation"] += 1
+            new = self._db.execute(
+                f"SELECT rowid, * FROM {_quote(name)} WHERE rowid > ? ORDER BY rowid",
+                (entry["last_rowid"],),
+            ).fetchall()
+            if new:
+                entry["rows"].extend(["" if v is None else v for v in row[1:]] for row in new)
+                entry["last_rowid"] = new[-1][0]
+        return entry
+
+    def submit(self, name, row, key=None):
+        header = self._entries[name]["header"]
+        values = pad_row([str(v) for v in row], len(header))
+        placeholders = ", ".join("?" * len(header))
+        with self._lock:
+            updated = 0
+            if key is not None:
+                assignments = ", ".join(f"{_quote(col)} = ?" for col in header)
+                where = " AND ".join(f"{_quote(col)} = ?" for col in key)
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    updated = self._db.execute(
+                        f"UPDATE {_quote(name)} SET {assignments} WHERE {where}",
+                        values + [str(v) for v in key.values()],
+                    ).rowcount
+                    if updated:
+                        self._db.execute(
+                            "INSERT INTO _revisions VALUES (?, 1)"
+                            " ON CONFLICT(sheet) DO UPDATE SET revision = revision + 1",
+                            (name,),
+                        )
+                    else:
+                        self._db.execute(f"INSERT INTO {_quote(name)} VALUES ({placeholders})", values)
+                    self._db.execute("COMMIT")
+                except BaseException:
+                    self._db.execute("ROLLBACK")
+                    raise
+            else:
+                self._db.execute(f"INSERT INTO {_quote(name)} VALUES ({placeholders})", values)
+        if self.queue is not None:
+            self.queue.submit(name, row, key)
+
+    def submit_many(self, name, rows):
+        header = self._entries[name]["header"]
+        values = [pad_row([str(v) for v in row], len(header)) for row in rows]
+        placeholders = ", ".join("?" * len(header))
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(f"INSERT INTO {_quote(name)} VALUES ({placeholders})", values)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        if self.queue is not None:
+            self.queue.submit_many(name, rows)
@@ -0,0 +1,78 @@
+import csv
+import io
+from datetime import datetime
+
+from bulkimport import NEW_REGISTRATION, parse_tracks, plan_team_import, read_csv
+from storage import HEADERS
+
+HEADER = HEADERS["Teams"]
+NOW = datetime(2026, 3, 20, 9, 30)
+
+
+def _team(name, track="FinTech", **overrides):
+    record = {col: f"{col} of {name}" for col in HEADER}
+    record.update({"Timestamp": "", "Submission Type": "", "Team Name": name, "Track": track, "Pitch Video Link": ""})
+    record.update(overrides)
+    return [record[col] for col in HEADER]
+
+
+def _csv(*rows):
+    out = io.StringIO()
+    csv.writer(out).writerows(rows)
+    return out.getvalue().encode("utf-8-sig")
+
+
+def _plan(*rows, existing=()):
+    return plan_team_import(_csv(*rows), ["FinTech", "HealthTech"], existing, now=NOW)
+
+
+def test_read_csv_strips_cells_and_skips_blank_lines():
+    assert read_csv(_csv(["  a ", "b"], [], ["", " "], ["c"])) == [(1, ["a", "b"]), (4, ["c"])]
+
+
+def test_parse_tracks_skips_header_and_repeats():
+    assert parse_tracks(b"Track Name\nFinTech\nHealthTech\nFinTech\n") == ["FinTech", "HealthTech"]
+
+
+def test_rows_are_filled_in_like_the_registration_form():
+    rows, problems = _plan(_team("A"), _team("B", "HealthTech", Timestamp="2026-03-01 10:00:00"))
+    assert problems == []
+    assert rows[0][:4] == ["2026-03-20 09:30:00", NEW_REGISTRATION, "A", "FinTech"]
+    assert rows[1][0] == "2026-03-01 10:00:00"
+    assert all(len(row) == len(HEADER) for row in rows)
+
+
+def test_header_row_is_optional():
+    with_header, _ = _plan(HEADER, _team("A"))
+    without, _ = _plan(_team("A"))
+    assert with_header == without and len(with_header) == 1
+    # Only a copy of the Teams header counts: anything else is a data row
+    rows, problems = _plan(["Team", "Track"], _team("A"))
+    assert len(rows) == 1 and problems[0]["Line"] == 1
+
+
+def test_team_names_are_deduplicated_ignoring_case():
+    rows, problems = _plan(_team("Alpha"), _team("ALPHA"), _team("beta"), existing=["Beta"])
+    assert [row[2] for row in rows] == ["Alpha"]
+    assert problems == [
+        {"Line": 2, "Team Name": "ALPHA", "Problem": "duplicate team name in this file"},
+        {"Line": 3, "Team Name": "beta", "Problem": "team name already registered"},
+    ]
+
+
+def test_rows_with_extra_columns_are_rejected():
+    rows, problems = _plan(_team("A") + ["surprise"], _team("B") + ["", ""])
+    # Trailing empty cells (a spreadsheet export artifact) are fine
+    assert [row[2] for row in rows] == ["B"]
+    assert problems[0]["Team Name"] == "A"
+    assert problems[0]["Problem"].startswith(f"has {len(HEADER) + 1} columns")
+
+
+def test_unknown_tracks_and_missing_fields_are_rejected():
+    rows, problems = _plan(_team("A", "SpaceTech"), _team("B", **{"Value Proposition": ""}), ["", "", "C"])
+    assert rows == []
+    assert [p["Problem"] for p in problems[:2]] == ["unknown track 'SpaceTech'", "missing Value Proposition"]
+    assert problems[2]["Problem"].startswith("missing Track, Team Leaders")
+    # A rejected row doesn't claim its name: a later valid row with it is accepted
+    rows, problems = _plan(_team("A", "SpaceTech"), _team("A"))
+    assert [row[2] for row in rows] == ["A"] and len(problems) == 1
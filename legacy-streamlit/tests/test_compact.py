@@ -0,0 +1,77 @@
+from benchmark import FakeSpreadsheet
+from compact import ARCHIVE_SHEET, _runs, compact_teams, superseded_rows
+from storage import HEADERS
+
+HEADER = HEADERS["Teams"]
+
+
+def _team(name, version):
+    return ["2026-03-20 09:00:00", "🆕 New Registration", name, "FinTech", f"v{version}"]
+
+
+def _sheet(*rows):
+    sheet = FakeSpreadsheet()
+    sheet._sheets["Teams"].rows.extend(list(row) for row in rows)
+    return sheet
+
+
+def _spy(sheet):
+    bodies = []
+    batch_update = sheet.batch_update
+
+    def spy(body):
+        bodies.append(body)
+        return batch_update(body)
+
+    sheet.batch_update = spy
+    return bodies
+
+
+def test_superseded_rows_keeps_the_latest_row_per_team():
+    rows = [_team("A", 1), _team("B", 1), _team("A", 2), ["t", "x", ""], ["t"], _team("A", 3), _team("B", 2)]
+    assert superseded_rows(HEADER, rows) == [0, 1, 2]
+    assert superseded_rows(["Timestamp"], rows) == []
+
+
+def test_runs_collapse_consecutive_indexes():
+    assert _runs([0, 1, 2, 4, 6, 7]) == [[0, 3], [4, 5], [6, 8]]
+    assert _runs([]) == []
+
+
+def test_compact_archives_and_deletes_bottom_up():
+    rows = [_team("A", 1), _team("B", 1), _team("C", 1), _team("A", 2), _team("D", 1), _team("B", 2), _team("A", 3)]
+    sheet = _sheet(*rows)
+    bodies = _spy(sheet)
+    assert compact_teams(sheet) == (4, 3)
+
+    requests = bodies[0]["requests"]
+    archive = sheet._sheets[ARCHIVE_SHEET]
+    # The archive append and every deletion go out in one batchUpdate, archive first
+    assert len(bodies) == 1
+    assert requests[0]["appendCells"]["sheetId"] == archive.id
+    deletes = [r["deleteDimension"]["range"] for r in requests[1:]]
+    # Data rows 0-1 and 3 are 0-based sheet rows 1-2 and 4, under the header; the lower run goes first
+    assert [(d["startIndex"], d["endIndex"]) for d in deletes] == [(4, 5), (1, 3)]
+    assert all(d["sheetId"] == sheet._sheets["Teams"].id for d in deletes)
+
+    assert sheet._sheets["Teams"].rows == [list(HEADER), _team("C", 1), _team("D", 1), _team("B", 2), _team("A", 3)]
+    assert archive.rows == [list(HEADER), _team("A", 1), _team("B", 1), _team("A", 2)]
+
+
+def test_compact_reuses_an_existing_archive():
+    sheet = _sheet(_team("A", 1), _team("A", 2))
+    compact_teams(sheet)
+    sheet._sheets["Teams"].rows.append(_team("A", 3))
+    assert compact_teams(sheet) == (1, 1)
+    assert sheet._sheets[ARCHIVE_SHEET].rows == [list(HEADER), _team("A", 1), _team("A", 2)]
+    assert sheet._sheets["Teams"].rows == [list(HEADER), _team("A", 3)]
+
+
+def test_dry_run_and_nothing_to_do_change_nothing():
+    sheet = _sheet(_team("A", 1), _team("A", 2), _team("B", 1))
+    bodies = _spy(sheet)
+    assert compact_teams(sheet, dry_run=True) == (2, 1)
+    sheet._sheets["Teams"].rows[1:2] = []
+    assert compact_teams(sheet) == (2, 0)
+    assert bodies == []
+    assert ARCHIVE_SHEET not in sheet._sheets
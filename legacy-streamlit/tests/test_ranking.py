@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ranking import latest_per_key, normalize, rank_teams, trimmed_means
+
+N_CRITERIA = 7
+
+
+def _scores(n_rows, n_teams, n_judges, seed, low=1, high=10):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "judge": rng.integers(0, n_judges, n_rows),
+        "team": rng.integers(0, n_teams, n_rows),
+        **{f"c{c}": rng.integers(low, high + 1, n_rows) for c in range(N_CRITERIA)},
+    })
+
+
+def _reference(frame, team_names, normalization="none", trim=0.0, dedupe=True):
+    """The ranking rules spelled out one pandas step at a time."""
+    criteria = [f"c{c}" for c in range(N_CRITERIA)]
+    if dedupe:
+        frame = frame.groupby(["judge", "team"], sort=False).tail(1)
+    frame = frame.assign(total=frame[criteria].sum(axis=1).astype(float))
+    if normalization == "zscore":
+        by_judge = frame.groupby("judge")["total"]
+        std = by_judge.transform(lambda t: t.std(ddof=0))
+        z = ((frame["total"] - by_judge.transform("mean")) / std).where(std > 1e-9, 0.0)
+        frame = frame.assign(total=frame["total"].mean() + z * frame["total"].std(ddof=0))
+    elif normalization == "median":
+        judge_median = frame.groupby("judge")["total"].transform("median")
+        frame = frame.assign(total=frame["total"] - judge_median + frame["total"].median())
+
+    def trimmed(totals):
+        ordered = np.sort(totals.to_numpy())
+        cut = int(np.floor(len(ordered) * min(trim, 0.49))) if trim > 0 else 0
+        return ordered[cut:len(ordered) - cut].mean()
+
+    per_team = frame.groupby("team").agg(
+        average=("total", trimmed), judges=("total", "size"), **{c: (c, "sum") for c in criteria}
+    )
+    per_team["average"] = per_team["average"].round(2)
+    per_team["name"] = [team_names[t] for t in per_team.index]
+    per_team = per_team.sort_values(
+        ["average"] + criteria + ["name"], ascending=[False] * (1 + N_CRITERIA) + [True], kind="stable"
+    )
+    return per_team
+
+
+def _rank(frame, team_names, n_judges, **kwargs):
+    criteria = [f"c{c}" for c in range(N_CRITERIA)]
+    return rank_teams(
+        frame[criteria].to_numpy(), frame["team"].to_numpy(), team_names,
+        judges=frame["judge"].to_numpy(), n_judges=n_judges, **kwargs,
+    )
+
+
+@pytest.mark.parametrize("normalization", ["none", "zscore", "median"])
+@pytest.mark.parametrize("trim", [0.0, 0.2])
+def test_matches_pandas_reference(normalization, trim):
+    frame = _scores(3000, 40, 12, seed=1)
+    team_names = np.array([f"Team {t:02d}" for t in range(40)])
+    order, average, judges_count = _rank(frame, team_names, 12, normalization=normalization, trim=trim)
+    expected = _reference(frame, team_names, normalization, trim)
+    np.testing.assert_array_equal(team_names[order], expected["name"].to_numpy())
+    np.testing.assert_allclose(average[order], expected["average"].to_numpy(), atol=0.011)
+    np.testing.assert_array_equal(judges_count[order], expected["judges"].to_numpy())
+
+
+def test_ties_break_on_criteria_in_rubric_order_then_name():
+    # Same total for everyone: criterion 1 decides, then criterion 2, then the name
+    rows = [
+        {"judge": 0, "team": 0, **{f"c{c}": v for c, v in enumerate([5, 5, 5, 5, 5, 5, 5])}},
+        {"judge": 0, "team": 1, **{f"c{c}": v for c, v in enumerate([6, 4, 5, 5, 5, 5, 5])}},
+        {"judge": 0, "team": 2, **{f"c{c}": v for c, v in enumerate([6, 5, 4, 5, 5, 5, 5])}},
+        {"judge": 0, "team": 3, **{f"c{c}": v for c, v in enumerate([5, 5, 5, 5, 5, 5, 5])}},
+    ]
+    team_names = np.array(["Delta", "Bravo", "Alpha", "Charlie"])
+    order, average, _ = _rank(pd.DataFrame(rows), team_names, 1)
+    assert list(team_names[order]) == ["Alpha", "Bravo", "Charlie", "Delta"]
+    assert set(average[order]) == {35.0}
+
+
+def test_only_latest_score_of_each_judge_counts():
+    frame = pd.DataFrame([
+        {"judge": 0, "team": 0, **{f"c{c}": 1 for c in range(N_CRITERIA)}},
+        {"judge": 1, "team": 0, **{f"c{c}": 5 for c in range(N_CRITERIA)}},
+        {"judge": 0, "team": 0, **{f"c{c}": 9 for c in range(N_CRITERIA)}},
+    ])
+    order, average, judges_count = _rank(frame, np.array(["Solo"]), 2)
+    assert list(order) == [0]
+    assert average[0] == pytest.approx((63 + 35) / 2)
+    assert judges_count[0] == 2
+
+
+def test_without_judges_every_row_counts():
+    frame = _scores(200, 5, 3, seed=2)
+    team_names = np.array([f"T{t}" for t in range(5)])
+    criteria = [f"c{c}" for c in range(N_CRITERIA)]
+    order, average, judges_count = rank_teams(frame[criteria].to_numpy(), frame["team"].to_numpy(), team_names)
+    expected = _reference(frame, team_names, dedupe=False)
+    np.testing.assert_array_equal(team_names[order], expected["name"].to_numpy())
+    np.testing.assert_array_equal(judges_count[order], expected["judges"].to_numpy())
+
+
+def test_unscored_teams_are_left_out():
+    frame = _scores(50, 3, 2, seed=3)
+    order, _, judges_count = _rank(frame, np.array(["A", "B", "C", "Never Scored"]), 2)
+    assert 3 not in order
+    assert judges_count[3] == 0
+
+
+def test_latest_per_key_keeps_last_occurrence_in_row_order():
+    judges = np.array([0, 1, 0, 1, 0])
+    teams = np.array([0, 0, 0, 1, 1])
+    assert list(latest_per_key(judges, teams, 2)) == [1, 2, 3, 4]
+
+
+def test_trimmed_means_cut_from_both_ends():
+    values = np.array([1.0, 2.0, 3.0, 100.0, 5.0, 5.0])
+    groups = np.array([0, 0, 0, 0, 1, 1])
+    # floor(4 * 0.25) = 1 cut from each end of group 0; group 1 is too small to lose any
+    np.testing.assert_allclose(trimmed_means(values, groups, 2, trim=0.25), [2.5, 5.0])
+    np.testing.assert_allclose(trimmed_means(values, groups, 2), [26.5, 5.0])
+
+
+def test_zscore_ignores_judges_without_spread():
+    totals = np.array([40.0, 40.0, 30.0, 50.0])
+    judges = np.array([0, 0, 1, 1])
+    normalized = normalize(totals, judges, 2, "zscore")
+    # Judge 0 gave everyone the same total, so those land on the overall mean
+    assert normalized[0] == normalized[1] == pytest.approx(totals.mean())
+    assert normalized[2] < normalized[3]
+
+
+def test_unknown_normalization_is_rejected():
+    with pytest.raises(ValueError):
+        normalize(np.array([1.0]), np.array([0]), 1, "minmax")
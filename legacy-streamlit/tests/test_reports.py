@@ -0,0 +1,66 @@
+import io
+import zipfile
+
+from reports import COMMENTS, team_groups, team_reports, write_zip
+from storage import HEADERS, typed_frame
+
+HEADER = HEADERS["Scores"]
+
+
+def _score(judge, team, score):
+    return ["2026-03-20 10:00:00", judge, team] + [str(score)] * 7 + [f"{judge} on {team}: {score}"]
+
+
+def _frame(rows):
+    return typed_frame(HEADER, rows, drop=[COMMENTS])
+
+
+def _comments(rows, calls):
+    def comments(positions):
+        calls.append(list(positions))
+        return [rows[p][-1] for p in positions]
+    return comments
+
+
+def test_team_groups_keep_each_judges_latest_score():
+    rows = [_score("J1", "B", 5), _score("J2", "A", 6), _score("J1", "A", 3), _score("J1", "A", 8), _score("J2", "B", 7)]
+    groups = [(team, list(positions)) for team, positions in team_groups(_frame(rows))]
+    # Teams in name order, each one's rows in sheet order; J1's first score for A is replaced
+    assert groups == [("A", [1, 3]), ("B", [0, 4])]
+    assert list(team_groups(_frame([]))) == []
+
+
+def test_comments_stay_aligned_across_chunks():
+    rows = []
+    for t in range(5):
+        for j in range(t % 3 + 1):
+            rows.append(_score(f"J{j}", f"T{t}", t + j))
+    # Rescores land at the end of the sheet, between other teams' rows
+    rows += [_score("J0", "T1", 9), _score("J0", "T3", 2)]
+    calls = []
+    reports = list(team_reports(_frame(rows), _comments(rows, calls), {}, {"T0": "FinTech"}, chunk=2))
+
+    assert [r["team"] for r in reports] == ["T0", "T1", "T2", "T3", "T4"]
+    # One comments call per chunk of two teams
+    assert len(calls) == 3
+    for report in reports:
+        for entry in report["rows"]:
+            judge, team = entry["Judge Name"], report["team"]
+            assert entry[COMMENTS] == f"{judge} on {team}: {entry['1. Problem-Solution Fit']}"
+    t1 = reports[1]
+    assert [(e["Judge Name"], e["Total Score"]) for e in t1["rows"]] == [("J1", 14), ("J0", 63)]
+    assert t1["criteria_average"]["1. Problem-Solution Fit"] == 5.5
+    assert (reports[0]["track"], reports[0]["rank"], reports[0]["judges"]) == ("FinTech", None, 1)
+
+
+def test_write_zip_names_files_by_track_and_team():
+    reports = [
+        {"team": "A/B", "track": "FinTech", "rank": 1, "of": 2, "average": 50.0, "judges": 1,
+         "criteria": [], "criteria_average": {}, "rows": []},
+        {"team": "A?B", "track": "FinTech", "rank": 2, "of": 2, "average": 40.0, "judges": 1,
+         "criteria": [], "criteria_average": {}, "rows": []},
+    ]
+    out = io.BytesIO()
+    assert write_zip(reports, "csv", out) == 2
+    names = zipfile.ZipFile(out).namelist()
+    assert names == ["FinTech/A_B.csv", "FinTech/A_B (2).csv"]
@@ -0,0 +1,207 @@
+import threading
+import time
+
+from benchmark import FakeSpreadsheet
+from datastore import SheetCache
+from leaderboard import SCORE_COLS
+from sharedcache import SharedSnapshotStore
+from storage import HEADERS, SheetsStorage
+
+
+def _score(judge, team, score, comment=""):
+    return ["2026-03-20 10:00:00", judge, team] + [score] * 7 + [comment]
+
+
+def _flush(db):
+    deadline = time.monotonic() + 5
+    while db.queue.status()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert db.queue.status()["pending"] == 0
+
+
+def _scores(db):
+    return {(row["Judge Name"], row["Team Name"]): row[SCORE_COLS[0]] for row in db.records("Scores")}
+
+
+def _replicas(tmp_path, sheet):
+    store = tmp_path / "shared"
+    return [
+        SheetsStorage(sheet, queue_path=str(tmp_path / f"{name}.db"), shared=SharedSnapshotStore(str(store), wait_seconds=0.5))
+        for name in ("a", "b")
+    ]
+
+
+# --- Two replicas ---
+def test_rescore_on_one_replica_reaches_the_other(tmp_path):
+    sheet = FakeSpreadsheet()
+    sheet._sheets["Scores"].rows.append(_score("J1", "A", "5"))
+    a, b = _replicas(tmp_path, sheet)
+    assert _scores(a)[("J1", "A")] == "5"
+    assert _scores(b)[("J1", "A")] == "5"
+
+    a.upsert_score(_score("J1", "A", 9))
+    _flush(a)
+    assert len(sheet._sheets["Scores"].rows) == 2
+    # A refreshes first and publishes; B's own copy then expires and it adopts A's snapshot
+    assert _scores(a)[("J1", "A")] == "9"
+    b.cache._entries["Scores"]["expires"] = 0
+    assert _scores(b)[("J1", "A")] == "9"
+    assert b.snapshot("Scores")[1][0][3] == "9"
+
+
+# --- Store ---
+def _store(tmp_path, **kwargs):
+    return SharedSnapshotStore(str(tmp_path), **kwargs)
+
+
+def test_publish_bumps_generation_unless_it_extends_the_current_version(tmp_path):
+    store = _store(tmp_path)
+    first = store.publish("Scores", ["h"], [["1"]], extends=None, ttl=60)
+    assert (first["version"], first["generation"]) == (1, 1)
+    second = store.publish("Scores", ["h"], [["1"], ["2"]], extends=1, ttl=60)
+    assert (second["version"], second["generation"]) == (2, 1)
+    # Extending a version that is no longer the latest means the rows may differ
+    third = store.publish("Scores", ["h"], [["3"]], extends=1, ttl=60)
+    assert (third["version"], third["generation"]) == (3, 2)
+    data = store.load("Scores")
+    assert data["rows"] == [["3"]] and data["version"] == 3
+    assert store.fresh(store.meta("Scores"))
+
+
+def test_invalidate_keeps_rows_but_expires_the_snapshot(tmp_path):
+    store = _store(tmp_path)
+    store.publish("Teams", ["h"], [["1"]], extends=None, ttl=60)
+    store.invalidate("Teams")
+    assert not store.fresh(store.meta("Teams"))
+    assert store.load("Teams")["rows"] == [["1"]]
+    # Nothing published yet: nothing to invalidate
+    store.invalidate("Config")
+    assert store.meta("Config") is None
+
+
+def test_rewrite_token_changes_on_every_overwrite(tmp_path):
+    store = _store(tmp_path)
+    assert store.rewrite_token("Scores") is None
+    store.publish("Scores", ["h"], [["1"]], extends=None, ttl=60)
+    store.mark_rewritten("Scores")
+    token = store.rewrite_token("Scores")
+    assert token is not None and not store.fresh(store.meta("Scores"))
+    store.mark_rewritten("Scores")
+    assert store.rewrite_token("Scores") not in (None, token)
+    assert store.publish("Scores", ["h"], [["1"]], extends=None, ttl=60, rewrite=token)["rewrite"] == token
+
+
+def test_lease_is_held_by_one_replica_at_a_time(tmp_path):
+    a, b = _store(tmp_path), _store(tmp_path)
+    assert a.acquire()
+    assert not b.acquire()
+    # Threads of the same process share one lease too
+    assert not a.acquire()
+    a.release()
+    assert b.acquire()
+    b.release()
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    a, b = _store(tmp_path, lease_seconds=-1), _store(tmp_path)
+    assert a.acquire()
+    # A died mid-refresh; its lease has run out
+    assert b.acquire()
+    # A's late release doesn't remove the lease B now holds
+    a.release()
+    assert not _store(tmp_path).acquire()
+    b.release()
+
+
+def test_wait_for_returns_once_the_holder_publishes(tmp_path):
+    store = _store(tmp_path, wait_seconds=5, poll_interval=0.01)
+    other = _store(tmp_path)
+    timer = threading.Timer(0.05, lambda: other.publish("Teams", ["h"], [], extends=None, ttl=60))
+    timer.start()
+    started = time.monotonic()
+    assert store.wait_for(["Teams"]) == []
+    assert time.monotonic() - started < 5
+    timer.join()
+    impatient = _store(tmp_path, wait_seconds=0.05, poll_interval=0.01)
+    assert impatient.wait_for(["Teams", "Scores"]) == ["Scores"]
+
+
+# --- Two caches ---
+def _caches(tmp_path, sheet):
+    return [SheetCache(sheet, shared=_store(tmp_path, wait_seconds=0.2, poll_interval=0.01)) for _ in range(2)]
+
+
+def _reads(sheet):
+    return sheet.calls[("*", "values_batch_get")]
+
+
+def test_second_replica_adopts_the_published_snapshot(tmp_path):
+    sheet = FakeSpreadsheet()
+    sheet._sheets["Teams"].rows.append(["t", "new", "A"])
+    a, b = _caches(tmp_path, sheet)
+    a._entry("Teams")
+    assert _reads(sheet) == 1
+    entry = b._entry("Teams")
+    assert _reads(sheet) == 1
+    assert entry["rows"][0][2] == "A"
+    assert entry["shared_version"] == a._entries["Teams"]["shared_version"]
+
+
+def test_appended_rows_extend_the_adopted_snapshot(tmp_path):
+    sheet = FakeSpreadsheet()
+    rows = sheet._sheets["Teams"].rows
+    rows.append(["t", "new", "A"])
+    a, b = _caches(tmp_path, sheet)
+    a._entry("Teams")
+    first = b._entry("Teams")
+    rows.append(["t", "new", "B"])
+    a.invalidate("Teams")
+    a._entry("Teams")
+    b._entries["Teams"]["expires"] = 0
+    entry = b._entry("Teams")
+    # Same shared generation: B keeps its generation (and built frame) and just grows
+    assert entry is first and entry["generation"] == 0
+    assert [row[2] for row in entry["rows"]] == ["A", "B"]
+
+
+def test_replica_waits_for_the_lease_holder(tmp_path):
+    sheet = FakeSpreadsheet()
+    sheet._sheets["Teams"].rows.append(["t", "new", "A"])
+    a, b = _caches(tmp_path, sheet)
+    assert a.shared.acquire()
+    publish = threading.Timer(0.05, lambda: a.shared.publish("Teams", list(HEADERS["Teams"]), [["t", "new", "A"]], extends=None, ttl=60))
+    publish.start()
+    entry = b._entry("Teams")
+    publish.join()
+    a.shared.release()
+    # B used A's snapshot instead of reading Sheets itself
+    assert _reads(sheet) == 0
+    assert entry["rows"][0][:3] == ["t", "new", "A"]
+
+
+def test_replica_reads_sheets_itself_when_the_holder_never_publishes(tmp_path):
+    sheet = FakeSpreadsheet()
+    sheet._sheets["Teams"].rows.append(["t", "new", "A"])
+    a, b = _caches(tmp_path, sheet)
+    assert a.shared.acquire()
+    entry = b._entry("Teams")
+    a.shared.release()
+    assert _reads(sheet) == 1
+    assert entry["rows"][0][2] == "A"
+    # It didn't hold the lease, so it didn't publish either
+    assert b.shared.meta("Teams") is None
+
+
+def test_snapshot_from_before_an_overwrite_is_not_adopted(tmp_path):
+    sheet = FakeSpreadsheet()
+    scores = sheet._sheets["Scores"].rows
+    scores.append(_score("J1", "A", "5"))
+    a, b = _caches(tmp_path, sheet)
+    a._entry("Scores")
+    # Another replica rewrote the row in place and announced it
+    scores[1] = _score("J1", "A", "9")
+    b.overwrite("Scores", {0: scores[1]})
+    a._entries["Scores"]["expires"] = 0
+    entry = a._entry("Scores")
+    assert entry["rows"][0][3] == "9"
+    assert entry["rewrite"] == a.shared.rewrite_token("Scores")
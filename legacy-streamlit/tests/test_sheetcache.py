@@ -0,0 +1,175 @@
+from benchmark import FakeSpreadsheet
+from datastore import SheetCache
+from storage import FREE_TEXT, HEADERS, ROW_KEYS
+
+HEADER = HEADERS["Teams"]
+PITCH = HEADER.index("Value Proposition")
+
+
+def _team(name, pitch="", deck=""):
+    row = ["2026-03-20 09:00:00", "🆕 New Registration", name, "FinTech"] + [f"{name} field"] * 10
+    row[PITCH], row[-2], row[-1] = pitch, "", deck
+    return row
+
+
+def _cache(sheet):
+    skip = {name: (HEADERS[name], columns, ROW_KEYS[name]) for name, columns in FREE_TEXT.items()}
+    return SheetCache(sheet, skip=skip)
+
+
+def _spy(sheet):
+    ranges = []
+    batch_get = sheet.values_batch_get
+
+    def values_batch_get(requested, *args, **kwargs):
+        ranges.append(list(requested))
+        return batch_get(requested, *args, **kwargs)
+
+    sheet.values_batch_get = values_batch_get
+    return ranges
+
+
+def _sheet(*teams):
+    sheet = FakeSpreadsheet()
+    sheet._sheets["Teams"].rows.extend(teams)
+    return sheet, sheet._sheets["Teams"].rows
+
+
+def _refresh(cache, name="Teams"):
+    cache.invalidate(name)
+    return cache._entry(name)
+
+
+# --- Pruned reads ---
+def test_pruned_read_stitches_spans_and_leaves_free_text_blank():
+    sheet, _ = _sheet(_team("A", "pitch A", "deck A"), _team("B", "pitch B"))
+    ranges = _spy(sheet)
+    cache = _cache(sheet)
+    entry = cache._entry("Teams")
+    assert ranges == [["'Teams'!1:1", "'Teams'!A2:K", "'Teams'!M2:N"]]
+    assert entry["header"] == HEADER
+    expected_a, expected_b = _team("A", "", "deck A"), _team("B")
+    assert entry["rows"] == [expected_a, expected_b]
+    # Short rows (the API drops trailing blanks) still come back full width
+    assert all(len(row) == len(HEADER) for row in entry["rows"])
+
+
+def test_cells_fetches_free_text_once_per_row():
+    sheet, _ = _sheet(_team("A", "pitch A"), _team("B", "pitch B"), _team("C", "pitch C"))
+    cache = _cache(sheet)
+    cache._entry("Teams")
+    ranges = _spy(sheet)
+    assert cache.cells("Teams", "Value Proposition", [2, 0]) == ["pitch C", "pitch A"]
+    # Team Name (column C) comes along to check each row is still the one we cached
+    assert ranges == [["'Teams'!C2:L2", "'Teams'!C4:L4"]]
+    assert cache.cells("Teams", "Value Proposition", [0, 1, 2]) == ["pitch A", "pitch B", "pitch C"]
+    assert ranges[1] == ["'Teams'!C3:L3"]
+    assert cache.cells("Teams", "Team Name", [1]) == ["B"]
+    assert len(ranges) == 2
+
+
+def test_cells_drop_rows_that_moved_and_expire_the_snapshot():
+    sheet, rows = _sheet(_team("A", "pitch A"), _team("B", "pitch B"), _team("C", "pitch C"))
+    cache = _cache(sheet)
+    entry = cache._entry("Teams")
+    # compact.py archived A behind our back: B and C moved up a row
+    del rows[1]
+    assert cache.cells("Teams", "Value Proposition", [0, 1]) == ["", ""]
+    assert entry["expires"] == 0
+    assert "cells" not in entry or not entry["cells"]
+    entry = cache._entry("Teams")
+    assert [row[2] for row in entry["rows"]] == ["B", "C"]
+    assert cache.cells("Teams", "Value Proposition", [0, 1]) == ["pitch B", "pitch C"]
+
+
+def test_header_mismatch_reads_the_sheet_whole():
+    sheet, rows = _sheet()
+    # Someone inserted a column by hand, shifting the free text over
+    rows[0] = HEADER[:3] + ["Notes"] + HEADER[3:]
+    team = _team("A", "pitch A")
+    rows.append(team[:3] + ["x"] + team[3:])
+    ranges = _spy(sheet)
+    cache = _cache(sheet)
+    entry = cache._entry("Teams")
+    # Pruned first, then the whole sheet once the header turned out different
+    assert ranges == [["'Teams'!1:1", "'Teams'!A2:K", "'Teams'!M2:N"], ["'Teams'"]]
+    assert entry["rows"] == [team[:3] + ["x"] + team[3:]]
+    assert cache.cells("Teams", "Value Proposition", [0]) == ["pitch A"]
+    assert len(ranges) == 2
+
+
+# --- Tailing ---
+def test_tail_reads_only_rows_after_the_last_one_we_have():
+    sheet, rows = _sheet(_team("A"), _team("B"))
+    cache = _cache(sheet)
+    first = cache._entry("Teams")
+    rows.append(_team("C"))
+    ranges = _spy(sheet)
+    entry = _refresh(cache)
+    # The last known row (B, sheet row 3) is re-read to check nothing changed under it
+    assert ranges == [["'Teams'!1:1", "'Teams'!A3:K", "'Teams'!M3:N"]]
+    assert entry is first and entry["generation"] == 0
+    assert [row[2] for row in entry["rows"]] == ["A", "B", "C"]
+
+
+def test_tail_without_new_rows_keeps_everything():
+    sheet, _ = _sheet(_team("A"))
+    cache = _cache(sheet)
+    first = cache._entry("Teams")
+    rows_before = list(first["rows"])
+    entry = _refresh(cache)
+    assert entry is first and entry["rows"] == rows_before and entry["generation"] == 0
+
+
+def test_hand_edit_of_the_last_row_falls_back_to_a_full_read():
+    sheet, rows = _sheet(_team("A"), _team("B"))
+    cache = _cache(sheet)
+    cache._entry("Teams")
+    rows[2] = _team("B renamed")
+    rows.append(_team("C"))
+    ranges = _spy(sheet)
+    entry = _refresh(cache)
+    assert ranges[1] == ["'Teams'!1:1", "'Teams'!A2:K", "'Teams'!M2:N"]
+    assert entry["generation"] == 1
+    assert [row[2] for row in entry["rows"]] == ["A", "B renamed", "C"]
+
+
+def test_deleted_rows_fall_back_to_a_full_read():
+    sheet, rows = _sheet(_team("A"), _team("B"), _team("C"))
+    cache = _cache(sheet)
+    cache._entry("Teams")
+    del rows[1]
+    entry = _refresh(cache)
+    assert entry["generation"] == 1
+    assert [row[2] for row in entry["rows"]] == ["B", "C"]
+
+
+def test_full_read_that_only_added_rows_keeps_the_generation():
+    sheet = FakeSpreadsheet()
+    config = sheet._sheets["Config"].rows
+    config.append(["FinTech"])
+    cache = _cache(sheet)
+    first = cache._entry("Config")
+    config.append(["HealthTech"])
+    ranges = _spy(sheet)
+    # Config isn't append-only, so it is read whole, but the rows we had are kept
+    entry = _refresh(cache, "Config")
+    assert ranges == [["'Config'"]]
+    assert entry is first and entry["generation"] == 0
+    assert entry["rows"] == [["FinTech"], ["HealthTech"]]
+    config[1] = ["EdTech"]
+    entry = _refresh(cache, "Config")
+    assert entry["generation"] == 1 and entry["rows"] == [["EdTech"], ["HealthTech"]]
+
+
+def test_unpruned_sheet_tails_whole_rows():
+    sheet = FakeSpreadsheet()
+    scores = sheet._sheets["Scores"].rows
+    scores.append(["t", "J1", "A"] + ["5"] * 7 + ["ok"])
+    cache = SheetCache(sheet)
+    cache._entry("Scores")
+    scores.append(["t", "J2", "A"] + ["6"] * 7 + ["fine"])
+    ranges = _spy(sheet)
+    entry = _refresh(cache, "Scores")
+    assert ranges == [["'Scores'!1:1", "'Scores'!A2:K"]]
+    assert [row[-1] for row in entry["rows"]] == ["ok", "fine"]
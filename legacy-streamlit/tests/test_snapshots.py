@@ -0,0 +1,56 @@
+from benchmark import FakeSpreadsheet
+from leaderboard import SCORE_COLS
+from snapshots import ColumnarSnapshots
+from storage import SheetsStorage
+
+
+def _score(judge, team, score, comment=""):
+    return ["2026-03-20 10:00:00", judge, team] + [str(score)] * 7 + [comment]
+
+
+def _team(name):
+    return ["2026-03-20 09:00:00", "🆕 New Registration", name, "FinTech"] + [""] * 10
+
+
+def _storage(tmp_path, sheet, queue):
+    return SheetsStorage(sheet, queue_path=str(tmp_path / queue), snapshots=ColumnarSnapshots(str(tmp_path / "snapshots")), snapshot_interval=3600)
+
+
+def _spy(sheet):
+    ranges = []
+    batch_get = sheet.values_batch_get
+
+    def values_batch_get(requested, *args, **kwargs):
+        ranges.extend(requested)
+        return batch_get(requested, *args, **kwargs)
+
+    sheet.values_batch_get = values_batch_get
+    return ranges
+
+
+def test_warm_start_rereads_upserted_sheets_and_tails_the_rest(tmp_path):
+    sheet = FakeSpreadsheet()
+    sheet._sheets["Teams"].rows.extend([_team("A"), _team("B")])
+    sheet._sheets["Scores"].rows.extend([_score("J1", "A", 5, "good"), _score("J2", "A", 6)])
+    before = _storage(tmp_path, sheet, "before.db")
+    before.prefetch(["Teams", "Scores"])
+    assert before.snapshot_writer.save()
+
+    # After the last snapshot: a re-score overwritten in place, and a new registration
+    sheet._sheets["Scores"].rows[1] = _score("J1", "A", 9, "better")
+    sheet._sheets["Teams"].rows.append(_team("C"))
+
+    ranges = _spy(sheet)
+    after = _storage(tmp_path, sheet, "after.db")
+    after.prefetch(["Teams", "Scores"])
+    assert [row[SCORE_COLS[0]] for row in after.records("Scores")] == ["9", "6"]
+    assert after.text("Scores", "Feedback / Comments", [0]) == ["better"]
+    assert [row["Team Name"] for row in after.records("Teams")] == ["A", "B", "C"]
+    # Teams was tailed from the last snapshot row on; Scores was read from the first data row
+    assert "'Teams'!A3:K" in ranges and "'Teams'!A2:K" not in ranges
+    assert "'Scores'!A2:J" in ranges
+    # Only the first refresh after the restart is a full one
+    ranges.clear()
+    after.cache.invalidate("Scores")
+    after.prefetch(["Scores"])
+    assert "'Scores'!A3:J" in ranges and "'Scores'!A2:J" not in ranges
@@ -0,0 +1,174 @@
+import time
+from contextlib import nullcontext
+
+import pytest
+
+from datastore import SheetCache
+from indexes import RowIndex
+from resilience import SheetsUnavailable
+from storage import HEADERS, ROW_KEYS
+from writequeue import SubmissionQueue
+
+HEADER = HEADERS["Scores"]
+KEY = ["Judge Name", "Team Name"]
+
+
+def _row(judge, team, score=5, comment=""):
+    return ["2026-03-20 10:00:00", judge, team] + [score] * 7 + [comment]
+
+
+class FakeWorksheet:
+    def __init__(self):
+        self.updates = []
+        self.appends = []
+
+    def batch_update(self, data, **kwargs):
+        self.updates.extend(data)
+
+    def append_rows(self, values, **kwargs):
+        self.appends.extend(values)
+
+
+class FakeGuard:
+    def call(self, sheet, op):
+        return nullcontext()
+
+
+class FakeCache:
+    """The slice of SheetCache the write queue uses, over a fixed Scores snapshot."""
+
+    def __init__(self, rows, generation=0):
+        self.entry = {"header": list(HEADER), "rows": [[str(v) for v in row] for row in rows], "generation": generation}
+        self.guard = FakeGuard()
+        self.ws = FakeWorksheet()
+        self.overwritten = []
+        self.invalidated = []
+        self.degraded = None
+
+    def _entry(self, name):
+        return self.entry
+
+    def worksheet(self, name):
+        return self.ws
+
+    def overwrite(self, name, rows):
+        self.overwritten.append((name, dict(rows)))
+
+    def invalidate(self, name=None):
+        self.invalidated.append(name)
+
+
+def _queue(tmp_path, cache):
+    return SubmissionQueue(cache, str(tmp_path / "queue.db"), base_delay=0.01)
+
+
+def _batch(*rows):
+    return [(i, row, {"Judge Name": row[1], "Team Name": row[2]}) for i, row in enumerate(rows, 1)]
+
+
+# --- RowIndex ---
+def test_row_index_locates_newest_row_per_key():
+    index = RowIndex(KEY)
+    rows = [_row("J1", "A"), _row("J2", "A"), _row("J1", "A")]
+    index.sync(HEADER, rows, 0)
+    assert index.locate(("J1", "A")) == 2
+    assert index.locate(("J2", "A")) == 1
+    assert index.locate(("J3", "A")) is None
+
+
+def test_row_index_reads_only_appended_rows_until_generation_changes():
+    index = RowIndex(KEY)
+    rows = [_row("J1", "A")]
+    index.sync(HEADER, rows, 0)
+    rows.append(_row("J1", "B"))
+    index.sync(HEADER, rows, 0)
+    assert index.locate(("J1", "B")) == 1
+    # A new generation means the rows were reloaded (and may have moved): start over
+    index.sync(HEADER, [_row("J1", "B")], 1)
+    assert index.locate(("J1", "B")) == 0
+    assert index.locate(("J1", "A")) is None
+
+
+def test_row_index_without_key_columns_locates_nothing():
+    index = RowIndex(KEY)
+    index.sync(["Timestamp", "Team Name"], [["t", "A"]], 0)
+    assert index.locate(("J1", "A")) is None
+
+
+# --- SubmissionQueue._plan_writes ---
+def test_plan_writes_overwrites_existing_keys_and_appends_the_rest(tmp_path):
+    cache = FakeCache([_row("J1", "A"), _row("J1", "B"), _row("J2", "A")])
+    queue = _queue(tmp_path, cache)
+    rescore, first_score = _row("J1", "B", 9), _row("J3", "A", 7)
+    plain = ["2026-03-20 10:00:00", "anything"]
+    batch = _batch(rescore, first_score) + [(3, plain, None)]
+    overwrites, appends = queue._plan_writes("Scores", batch)
+    assert overwrites == {1: rescore}
+    assert appends == [first_score, plain]
+
+
+def test_plan_writes_matches_keys_as_text(tmp_path):
+    cache = FakeCache([["t", "1", "2"] + [5] * 7 + [""]])
+    queue = _queue(tmp_path, cache)
+    overwrites, appends = queue._plan_writes("Scores", [(1, _row(1, 2), {"Judge Name": 1, "Team Name": 2})])
+    assert list(overwrites) == [0]
+    assert appends == []
+
+
+def test_plan_writes_follows_rows_appended_since_the_last_batch(tmp_path):
+    cache = FakeCache([_row("J1", "A")])
+    queue = _queue(tmp_path, cache)
+    assert queue._plan_writes("Scores", _batch(_row("J1", "B")))[0] == {}
+    # That append has since been read back into the snapshot
+    cache.entry["rows"].append([str(v) for v in _row("J1", "B")])
+    assert list(queue._plan_writes("Scores", _batch(_row("J1", "B", 8)))[0]) == [1]
+
+
+def test_plan_writes_waits_while_reads_are_failing(tmp_path):
+    cache = FakeCache([_row("J1", "A")])
+    queue = _queue(tmp_path, cache)
+    # J1/B was appended by the last batch, but the refresh that would show it failed
+    cache.degraded = {"since": time.time(), "error": "RateLimited: read quota"}
+    with pytest.raises(SheetsUnavailable):
+        queue._plan_writes("Scores", _batch(_row("J1", "B", 8)))
+    # Plain appends don't need the snapshot
+    assert queue._plan_writes("Scores", [(1, ["t", "x"], None)]) == ({}, [["t", "x"]])
+
+
+def test_flush_writes_in_place_and_patches_the_cache(tmp_path):
+    cache = FakeCache([_row("J1", "A"), _row("J1", "B")])
+    queue = _queue(tmp_path, cache)
+    rescore, new = _row("J1", "B", 9, "better"), _row("J2", "B", 4)
+    queue.submit("Scores", rescore, key={"Judge Name": "J1", "Team Name": "B"})
+    queue.submit("Scores", new, key={"Judge Name": "J2", "Team Name": "B"})
+    deadline = time.monotonic() + 5
+    while queue.status()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert queue.status()["pending"] == 0
+    # Data row 1 is sheet row 3, under the header
+    assert cache.ws.updates == [{"range": "A3:K3", "values": [rescore]}]
+    assert cache.ws.appends == [new]
+    assert cache.overwritten == [("Scores", {1: rescore})]
+    assert "Scores" in cache.invalidated
+
+
+# --- SheetCache.overwrite ---
+def test_overwrite_patches_rows_under_a_new_generation():
+    comments = HEADER.index("Feedback / Comments")
+    cache = SheetCache(None, skip={"Scores": (HEADER, ["Feedback / Comments"], ROW_KEYS["Scores"])})
+    rows = [[str(v) for v in _row("J1", "A")], [str(v) for v in _row("J1", "B")]]
+    for row in rows:
+        row[comments] = ""
+    cache._entries["Scores"] = {"header": list(HEADER), "rows": rows, "frame": object(), "frame_rows": 2, "generation": 3, "expires": 0}
+
+    cache.overwrite("Scores", {1: _row("J1", "B", 9, "better")})
+
+    entry = cache._entries["Scores"]
+    assert entry["generation"] == 4
+    assert entry["frame"] is None
+    assert entry["rows"][1][3] == "9"
+    # Skipped free text stays out of the rows but is served from the cell cache
+    assert entry["rows"][1][comments] == ""
+    assert entry["cells"][(comments, 1)] == "better"
+    # Consumers holding the old rows list still see the old generation intact
+    assert rows[1][3] == "5"
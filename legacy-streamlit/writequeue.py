@@ -0,0 +1,190 @@
+import json
+import random
+import sqlite3
+import threading
+import time
+
+from gspread.utils import rowcol_to_a1
+
+from indexes import RowIndex
+from resilience import SheetsUnavailable
+
+
+class SubmissionQueue:
+    """Durable write-behind journal for rows headed to Google Sheets.
+
+    ``submit()`` only records the row in a local SQLite file and returns, so the judge's
+    button click never waits on (or fails because of) the Sheets API. A daemon thread
+    flushes the journal in ``append_rows`` batches, backing off exponentially when Sheets
+    rejects a batch (429 quota errors, timeouts), and picks up whatever is still pending
+    after a process restart.
+
+    Rows submitted with a ``key`` (e.g. ``{"Judge Name": ..., "Team Name": ...}``) are
+    upserts: a newer submission for the same key replaces one still waiting, and at flush
+    time a key already in the sheet is overwritten in place (one ``batch_update`` for the
+    whole batch) instead of appended.
+    """
+
+    def __init__(self, cache, path, batch_size=50, base_delay=1.0, max_delay=60.0):
+        self.cache = cache
+        self.batch_size = batch_size
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pending ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " sheet TEXT NOT NULL,"
+            " row TEXT NOT NULL,"
+            " queued_at REAL NOT NULL)"
+        )
+        # Journals written before upserts existed have no key column
+        if "key" not in [col[1] for col in self._db.execute("PRAGMA table_info(pending)")]:
+            self._db.execute("ALTER TABLE pending ADD COLUMN key TEXT")
+        # In-memory mirror of the journal so reads can overlay pending rows cheaply
+        self._pending = {
+            row_id: (sheet, json.loads(row), json.loads(key) if key else None)
+            for row_id, sheet, row, key in self._db.execute("SELECT id, sheet, row, key FROM pending ORDER BY id")
+        }
+        # Where each key's row sits in the sheet, per upserted sheet
+        self._indexes = {}
+
+        cache.queue = self
+        self._worker = threading.Thread(target=self._run, name="verdix-submission-queue", daemon=True)
+        self._worker.start()
+        if self._pending:
+            self._wake.set()
+
+    def submit(self, sheet, row, key=None):
+        row = list(row)
+        with self._lock:
+            if key is not None:
+                key = {col: str(value) for col, value in key.items()}
+                superseded = [row_id for row_id, (name, _, k) in self._pending.items() if name == sheet and k == key]
+                self._db.executemany("DELETE FROM pending WHERE id = ?", [(row_id,) for row_id in superseded])
+                for row_id in superseded:
+                    del self._pending[row_id]
+            cur = self._db.execute(
+                "INSERT INTO pending (sheet, row, queued_at, key) VALUES (?, ?, ?, ?)",
+                (sheet, json.dumps(row), time.time(), json.dumps(key) if key is not None else None),
+            )
+            self._pending[cur.lastrowid] = (sheet, row, key)
+        self._wake.set()
+        return cur.lastrowid
+
+    def submit_many(self, sheet, rows):
+        """Queue plain appends in one journal transaction; they flush in ``batch_size`` chunks."""
+        rows = [list(row) for row in rows]
+        if not rows:
+            return
+        now = time.time()
+        with self._lock:
+            added = []
+            self._db.execute("BEGIN")
+            try:
+                for row in rows:
+                    cur = self._db.execute(
+                        "INSERT INTO pending (sheet, row, queued_at, key) VALUES (?, ?, ?, NULL)",
+                        (sheet, json.dumps(row), now),
+                    )
+                    added.append((cur.lastrowid, row))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._pending.update((row_id, (sheet, row, None)) for row_id, row in added)
+        self._wake.set()
+
+    def pending_rows(self, sheet):
+        with self._lock:
+            return [row for name, row, _ in self._pending.values() if name == sheet]
+
+    def status(self):
+        with self._lock:
+            return {"pending": len(self._pending), "last_error": self.last_error}
+
+    def _run(self):
+        failures = 0
+        while True:
+            if failures:
+                delay = min(self.max_delay, self.base_delay * 2 ** (failures - 1))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+            else:
+                self._wake.wait()
+            self._wake.clear()
+            try:
+                while self._flush_batch():
+                    pass
+                failures = 0
+                self.last_error = None
+            except Exception as e:
+                failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    def _flush_batch(self):
+        with self._lock:
+            if not self._pending:
+                return False
+            # Oldest row decides which sheet goes next, so each sheet keeps submission order
+            oldest_sheet = self._pending[min(self._pending)][0]
+            batch = [
+                (row_id, row, key)
+                for row_id, (sheet, row, key) in sorted(self._pending.items())
+                if sheet == oldest_sheet
+            ][: self.batch_size]
+
+        worksheet = self.cache.worksheet(oldest_sheet)
+        overwrites, appends = self._plan_writes(oldest_sheet, batch)
+        if overwrites:
+            # Data row 0 is sheet row 2, under the header
+            updates = [
+                {"range": f"A{position + 2}:{rowcol_to_a1(position + 2, len(row))}", "values": [row]}
+                for position, row in overwrites.items()
+            ]
+            # Re-applying these after a failed append is harmless, so one journal delete covers both
+            with self.cache.guard.call(oldest_sheet, "batch_update"):
+                worksheet.batch_update(updates)
+            # Refreshes only fetch new rows, so patch the rows we just rewrote into the cache
+            self.cache.overwrite(oldest_sheet, overwrites)
+        if appends:
+            with self.cache.guard.call(oldest_sheet, "append_rows"):
+                worksheet.append_rows(appends)
+
+        ids = [row_id for row_id, _, _ in batch]
+        with self._lock:
+            self._db.executemany("DELETE FROM pending WHERE id = ?", [(row_id,) for row_id in ids])
+            for row_id in ids:
+                self._pending.pop(row_id, None)
+        self.cache.invalidate(oldest_sheet)
+        return True
+
+    def _plan_writes(self, sheet, batch):
+        """Split a batch into in-place overwrites ``{position: row}`` for keys already in the sheet, and appends."""
+        keyed = [key for _, _, key in batch if key is not None]
+        index = None
+        if keyed:
+            columns = list(keyed[0])
+            index = self._indexes.get(sheet)
+            if index is None or index.columns != columns:
+                index = self._indexes[sheet] = RowIndex(columns)
+            # Flushed writes invalidate the cache, so this sees every row we appended before
+            entry = self.cache._entry(sheet)
+            if self.cache.degraded is not None:
+                # The refresh failed and this is the last good snapshot: a key appended since
+                # would look new and get a second row. Wait for reads to come back instead.
+                raise SheetsUnavailable(f"{sheet} could not be re-read to place upserts ({self.cache.degraded['error']})")
+            index.sync(entry["header"], entry["rows"], entry["generation"])
+
+        overwrites, appends = {}, []
+        for _, row, key in batch:
+            position = index.locate(key.values()) if key is not None else None
+            if position is None:
+                appends.append(row)
+            else:
+                overwrites[position] = row
+        return overwrites, appends